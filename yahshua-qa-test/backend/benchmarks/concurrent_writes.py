@@ -0,0 +1,114 @@
+"""
+Concurrent write benchmark for the configured database.
+
+Starts several worker processes that each upsert payroll records through
+services.upsert_payroll (the calculate-payroll write path) and reports writes
+per second and how many writes failed with "database is locked".
+
+    python benchmarks/concurrent_writes.py --workers 4 --writes 200
+    python benchmarks/concurrent_writes.py --workers 4 --writes 200 --stock
+
+With SQLite the benchmark creates a fresh database file (--sqlite-path).
+--stock runs the same load on Django's stock SQLite backend with the default
+rollback journal, for a before/after comparison. With DB_ENGINE=postgres it
+writes to the configured database, which must already be migrated.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'payroll_project.settings')
+
+EMPLOYEES = 50
+
+
+def _setup(stock):
+    if stock:
+        os.environ.update(SQLITE_JOURNAL_MODE='DELETE', SQLITE_SYNCHRONOUS='FULL', SQLITE_MMAP_SIZE='0')
+    import django
+    django.setup()
+    from django.conf import settings
+    if stock and settings.DATABASES['default']['ENGINE'] == 'payroll_project.db.sqlite3':
+        settings.DATABASES['default']['ENGINE'] = 'django.db.backends.sqlite3'
+
+
+def _seed():
+    from django.core.management import call_command
+    from payroll_app.models import Employee
+
+    call_command('migrate', verbosity=0)
+    Employee.objects.filter(email__endswith='@bench.invalid').delete()
+    Employee.objects.bulk_create([
+        Employee(
+            first_name='Bench', last_name=f'Worker {i}', email=f'worker{i}@bench.invalid',
+            position='Analyst', department=f'Dept {i % 5}', employment_type='regular',
+            monthly_salary=Decimal(15000 + 1000 * i), date_hired='2024-01-01',
+        )
+        for i in range(EMPLOYEES)
+    ])
+    return list(Employee.objects.filter(email__endswith='@bench.invalid').values_list('pk', flat=True))
+
+
+def _worker(args):
+    worker, employee_ids, writes, stock = args
+    _setup(stock)
+    from django.db import OperationalError, connection
+    from payroll_app.models import Employee
+    from payroll_app.services import upsert_payroll
+
+    employees = list(Employee.objects.filter(pk__in=employee_ids))
+    ok = locked = 0
+    started = time.time()
+    for i in range(writes):
+        employee = employees[(worker + i) % len(employees)]
+        try:
+            upsert_payroll(employee, i % 12 + 1, 2025, employee.monthly_salary + i)
+            ok += 1
+        except OperationalError as exc:
+            if 'locked' not in str(exc):
+                raise
+            locked += 1
+    finished = time.time()
+    connection.close()
+    return ok, locked, started, finished
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--writes', type=int, default=200, help="Writes per worker.")
+    parser.add_argument('--sqlite-path', default='/tmp/payroll-write-bench.sqlite3')
+    parser.add_argument('--stock', action='store_true', help="Untuned SQLite, for comparison.")
+    args = parser.parse_args()
+
+    if os.environ.get('DB_ENGINE', 'sqlite') != 'postgres':
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            Path(args.sqlite_path + suffix).unlink(missing_ok=True)
+        os.environ['SQLITE_PATH'] = args.sqlite_path
+
+    _setup(args.stock)
+    employee_ids = _seed()
+    from django.db import connection
+    connection.close()
+
+    jobs = [(worker, employee_ids, args.writes, args.stock) for worker in range(args.workers)]
+    with multiprocessing.get_context('spawn').Pool(args.workers) as pool:
+        results = pool.map(_worker, jobs)
+    # Wall time of the write phase only, excluding worker start-up.
+    elapsed = max(r[3] for r in results) - min(r[2] for r in results)
+
+    ok = sum(r[0] for r in results)
+    locked = sum(r[1] for r in results)
+    label = 'stock' if args.stock else 'tuned'
+    print(f"{label}: {args.workers} workers, {ok} writes in {elapsed:.2f}s "
+          f"= {ok / elapsed:.1f} writes/s, {locked} failed with 'database is locked'")
+
+
+if __name__ == '__main__':
+    main()
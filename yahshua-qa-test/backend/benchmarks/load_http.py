@@ -0,0 +1,198 @@
+"""
+HTTP load benchmark for the payroll API.
+
+Drives the API against a running server with a fixed number of keep-alive
+client threads and reports requests/sec and latency percentiles. Run it once
+against each serving mode and compare:
+
+    python manage.py runserver 8000 &
+    python benchmarks/load_http.py --label runserver --output results.json
+
+    gunicorn -c gunicorn.conf.py payroll_project.wsgi:application &
+    python benchmarks/load_http.py --label gunicorn --output results.json --compare runserver
+
+The `reads` group (health, employee list, tax brackets, one history record
+and a dashboard mix of them) compares the async views under ASGI with the
+sync views under WSGI at high concurrency:
+
+    gunicorn -c gunicorn.conf.py payroll_project.wsgi:application &
+    python benchmarks/load_http.py --group reads --concurrency 64 --label wsgi --output reads.json
+
+    WEB_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn -c gunicorn.conf.py payroll_project.asgi:application &
+    python benchmarks/load_http.py --group reads --concurrency 64 --label asgi --output reads.json --compare wsgi
+
+Read scenarios send no If-None-Match, so every request does the version
+query and serves the body from the response cache or the database.
+
+Only the standard library is used so it runs from any machine that can reach
+the server. The database needs at least one active employee.
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+
+GROUPS = {
+    'writes': ('calculate-payroll', 'payroll-history'),
+    'reads': ('health', 'employee-list', 'tax-brackets', 'history-detail', 'dashboard'),
+}
+SCENARIOS = tuple(scenario for scenarios in GROUPS.values() for scenario in scenarios)
+
+# What the frontend dashboard fetches on load: a few small reads per page view.
+DASHBOARD = ('employees/', 'tax-brackets/', 'health/', 'payroll-history/{record}/')
+
+
+class Client:
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.prefix = parts.path.rstrip('/')
+        self.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+
+    def request(self, method, path, body=None):
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        payload = json.dumps(body) if body is not None else None
+        try:
+            self.conn.request(method, f'{self.prefix}/{path}', payload, headers)
+            response = self.conn.getresponse()
+        except (ConnectionError, http.client.HTTPException):
+            self.conn.close()  # reconnect on the next request
+            raise
+        data = response.read()
+        return response.status, data
+
+
+def _employee_ids(base_url):
+    status, data = Client(base_url).request('GET', 'employees/')
+    if status != 200:
+        raise SystemExit(f"GET employees/ returned {status}")
+    ids = [employee['id'] for employee in json.loads(data)]
+    if not ids:
+        raise SystemExit("No active employees; load fixtures/sample_data.json first.")
+    return ids
+
+
+def _record_ids(base_url):
+    status, data = Client(base_url).request('GET', 'payroll-history/?page_size=200')
+    if status != 200:
+        raise SystemExit(f"GET payroll-history/ returned {status}")
+    ids = [record['id'] for record in json.loads(data)['results']]
+    if not ids:
+        raise SystemExit("No payroll history; run the calculate-payroll scenario or seed_payroll first.")
+    return ids
+
+
+def _get(path_for):
+    def send(client, i):
+        return client.request('GET', path_for(i))
+    return send
+
+
+def _make_request(scenario, employee_ids, record_ids):
+    if scenario == 'calculate-payroll':
+        def send(client, i):
+            return client.request('POST', 'calculate-payroll/', {
+                'employee_id': employee_ids[i % len(employee_ids)],
+                'period_month': i % 12 + 1,
+                'period_year': 2025,
+            })
+        return send
+
+    def record(i):
+        return record_ids[i % len(record_ids)]
+
+    return _get({
+        'payroll-history': lambda i: 'payroll-history/?page_size=50',
+        'health': lambda i: 'health/',
+        'employee-list': lambda i: 'employees/',
+        'tax-brackets': lambda i: 'tax-brackets/',
+        'history-detail': lambda i: f'payroll-history/{record(i)}/',
+        'dashboard': lambda i: DASHBOARD[i % len(DASHBOARD)].format(record=record(i // len(DASHBOARD))),
+    }[scenario])
+
+
+def run_scenario(base_url, scenario, employee_ids, record_ids, concurrency, duration):
+    send = _make_request(scenario, employee_ids, record_ids)
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    deadline = time.perf_counter() + duration
+
+    def worker(n):
+        client = Client(base_url)
+        i = n
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status, _ = send(client, i)
+            except (OSError, http.client.HTTPException):
+                status = None
+            if status is not None and status < 400:
+                latencies[n].append(time.perf_counter() - started)
+            else:
+                errors[n] += 1
+            i += concurrency
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = sorted(latency for per_thread in latencies for latency in per_thread)
+    result = {'requests': len(samples), 'errors': sum(errors), 'rps': round(len(samples) / elapsed, 1)}
+    if samples:
+        quantiles = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+        result.update({
+            'p50_ms': round(quantiles[49] * 1000, 2),
+            'p95_ms': round(quantiles[94] * 1000, 2),
+            'p99_ms': round(quantiles[98] * 1000, 2),
+        })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--base-url', default='http://localhost:8000/api')
+    parser.add_argument('--scenario', choices=SCENARIOS, action='append',
+                        help="Repeatable; defaults to every scenario of --group.")
+    parser.add_argument('--group', choices=GROUPS, default='writes')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per scenario.")
+    parser.add_argument('--label', default='current', help="Name for this run in --output.")
+    parser.add_argument('--output', type=Path, help="JSON file collecting results by label.")
+    parser.add_argument('--compare', help="Label in --output to compare requests/sec against.")
+    args = parser.parse_args()
+
+    scenarios = args.scenario or GROUPS[args.group]
+    employee_ids = _employee_ids(args.base_url)
+    record_ids = _record_ids(args.base_url) if {'history-detail', 'dashboard'} & set(scenarios) else []
+    results = {}
+    for scenario in scenarios:
+        results[scenario] = run_scenario(
+            args.base_url, scenario, employee_ids, record_ids, args.concurrency, args.duration,
+        )
+        print(f"{args.label:>12} {scenario:<18} {json.dumps(results[scenario])}")
+
+    saved = json.loads(args.output.read_text()) if args.output and args.output.exists() else {}
+    if args.output:
+        saved[args.label] = {'concurrency': args.concurrency, 'duration': args.duration, 'results': results}
+        args.output.write_text(json.dumps(saved, indent=2) + '\n')
+
+    if args.compare:
+        baseline = saved.get(args.compare, {}).get('results', {})
+        for scenario, result in results.items():
+            before = baseline.get(scenario, {}).get('rps')
+            if before:
+                print(f"{scenario:<18} {before:>8} -> {result['rps']:>8} req/s ({result['rps'] / before:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
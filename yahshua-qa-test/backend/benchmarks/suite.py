@@ -0,0 +1,257 @@
+"""
+Benchmark suite for the calculators, API views and bulk payroll paths.
+
+Times every case against a reproducible synthetic dataset (see
+payroll_app.synthetic), writes the results as JSON and compares them with a
+stored baseline, exiting with status 1 when a case got slower than its
+threshold allows:
+
+    python benchmarks/suite.py                          # small profile, compare with baseline.json
+    python benchmarks/suite.py --profile 10k --only calc --only view
+    python benchmarks/suite.py --profile 10k --save-baseline
+
+Profiles fix the dataset size and the number of random salaries, so results
+are only ever compared with a baseline of the same profile. Each profile's
+dataset is built once into its own SQLite file under --data-dir and reused.
+Baselines are machine-specific: record one on the machine you compare on.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'payroll_project.settings')
+
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+PROFILES = {
+    'small': {'employees': 1000, 'years': 1, 'salaries': 100_000},
+    '10k': {'employees': 10_000, 'years': 3, 'salaries': 1_000_000},
+    '100k': {'employees': 100_000, 'years': 3, 'salaries': 1_000_000},
+}
+
+SEED = 2025
+LAST_PERIOD = (2025, 12)
+
+# Allowed slowdown per case group before a run fails (0.25 = 25% slower).
+THRESHOLDS = {'calc': 0.25, 'view': 0.5, 'bulk': 0.5}
+
+
+def _setup(profile, data_dir):
+    if os.environ.get('DB_ENGINE', 'sqlite') != 'postgres':
+        os.environ['SQLITE_PATH'] = str(data_dir / f'payroll-bench-{profile}-{SEED}.sqlite3')
+    # DEBUG keeps every query in memory, and instrumentation adds overhead.
+    os.environ.update(DEBUG='False', PAYROLL_INSTRUMENTATION='False')
+    import django
+    django.setup()
+
+
+def _ensure_dataset(employees, years):
+    from django.core.management import call_command
+    from payroll_app.models import Employee
+    from payroll_app.synthetic import create_dataset, synthetic_employees
+
+    call_command('migrate', verbosity=0)
+    existing = synthetic_employees().count()
+    if existing == employees:
+        return
+    if Employee.objects.exists():
+        raise SystemExit("The benchmark database holds other data; point it at an empty database.")
+    print(f"Building dataset: {employees} employees, {years} year(s) of payroll...", flush=True)
+    started = time.perf_counter()
+    create_dataset(employees, years, seed=SEED, last_period=LAST_PERIOD)
+    print(f"Dataset built in {time.perf_counter() - started:.1f}s", flush=True)
+
+
+def _measure(func, ops, repeat):
+    """Best-of-`repeat` wall time of `func()`, which performs `ops` operations."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {'seconds': round(best, 6), 'ops': ops, 'per_op_us': round(best / ops * 1e6, 3)}
+
+
+# ---------------------------------------------------------------------------
+# Cases: each yields (name, func, ops)
+# ---------------------------------------------------------------------------
+
+def calculator_cases(salaries):
+    from payroll_app.calculations.batch import calculate_deductions_batch, to_centavos
+    from payroll_app.calculations.philhealth_calculator import calculate_pagibig, calculate_philhealth
+    from payroll_app.calculations.rate_tables import BUILTIN_RATE_TABLE as rates
+    from payroll_app.calculations.sss_calculator import calculate_sss
+    from payroll_app.calculations.tax_calculator import calculate_monthly_withholding_tax
+
+    for name, calculator, table in [
+        ('calc.sss', calculate_sss, rates.sss),
+        ('calc.philhealth', calculate_philhealth, rates.philhealth),
+        ('calc.pagibig', calculate_pagibig, rates.pagibig),
+        ('calc.tax', calculate_monthly_withholding_tax, rates.tax),
+    ]:
+        yield name, lambda calculator=calculator, table=table: [calculator(s, table) for s in salaries], len(salaries)
+    yield 'calc.batch', lambda: calculate_deductions_batch(to_centavos(salaries), rates), len(salaries)
+
+
+def view_cases(requests_per_case):
+    from django.core.cache import cache
+    from django.test import Client
+    from payroll_app.models import Employee
+
+    client = Client(HTTP_HOST='localhost')
+    year, month = LAST_PERIOD
+    employee_ids = list(
+        Employee.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True)[:requests_per_case]
+    )
+
+    def view(method, path_for, body_for=None):
+        def run():
+            for i in range(requests_per_case):
+                cache.clear()  # measure the full path, not the response cache
+                if method == 'GET':
+                    response = client.get(path_for(i))
+                else:
+                    response = client.post(path_for(i), body_for(i), content_type='application/json')
+                if response.status_code >= 400:
+                    raise SystemExit(f"{method} {path_for(i)} returned {response.status_code}")
+        return run
+
+    def employee_id(i):
+        return employee_ids[i % len(employee_ids)]
+
+    yield 'view.employee-list', view('GET', lambda i: '/api/employees/'), requests_per_case
+    yield 'view.payroll-history.page', view(
+        'GET', lambda i: '/api/payroll-history/?page_size=50'), requests_per_case
+    yield 'view.payroll-history.employee', view(
+        'GET', lambda i: f'/api/payroll-history/?employee_id={employee_id(i)}'), requests_per_case
+    yield 'view.payroll-summary', view(
+        'GET', lambda i: f'/api/payroll-summary/?year={year}&month={month}'), requests_per_case
+    yield 'view.tax-brackets', view('GET', lambda i: '/api/tax-brackets/'), requests_per_case
+    yield 'view.calculate-payroll', view(
+        'POST', lambda i: '/api/calculate-payroll/',
+        lambda i: {'employee_id': employee_id(i), 'period_month': month, 'period_year': year},
+    ), requests_per_case
+
+
+def bulk_cases():
+    from payroll_app.disbursements import bank_file
+    from payroll_app.employee_io import export_employees_csv
+    from payroll_app.models import Employee
+    from payroll_app.recalc import recalculate_period
+    from payroll_app.services import payroll_run_employees, run_payroll_period
+
+    year, month = LAST_PERIOD
+    active = payroll_run_employees().count()
+    employees = Employee.objects.count()
+
+    def drain(chunks):
+        for _ in chunks:
+            pass
+
+    yield 'bulk.run-period', lambda: run_payroll_period(month, year), active
+    yield 'bulk.recalc-period', lambda: recalculate_period(year, month, dry_run=True), active
+    yield 'bulk.export-csv', lambda: drain(export_employees_csv(Employee.objects.all())), employees
+    yield 'bulk.bank-file', lambda: drain(bank_file(year, month)), active
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare(results, baseline, slack):
+    """Print a comparison with `baseline` and return the names of regressed cases."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            print(f"  {name:<32} {result['per_op_us']:>12.3f} us/op  (no baseline)")
+            continue
+        ratio = result['per_op_us'] / before['per_op_us']
+        threshold = THRESHOLDS[name.split('.')[0]] * slack
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"  {name:<32} {before['per_op_us']:>12.3f} -> {result['per_op_us']:>12.3f} us/op  "
+            f"{ratio:5.2f}x  {'REGRESSION' if regressed else 'ok'} (limit {1 + threshold:.2f}x)"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--profile', choices=PROFILES, default='small')
+    parser.add_argument('--only', action='append', choices=sorted(THRESHOLDS),
+                        help="Case group to run (repeatable); defaults to all.")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per case; the best is kept.")
+    parser.add_argument('--requests', type=int, default=50, help="Requests per view case.")
+    parser.add_argument('--data-dir', type=Path, default=Path('/tmp'))
+    parser.add_argument('--output', type=Path, help="Write this run's results as JSON.")
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Store this run as the profile's baseline instead of comparing.")
+    parser.add_argument('--slack', type=float, default=1.0, help="Multiply every threshold (e.g. 2 on noisy machines).")
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    groups = args.only or list(THRESHOLDS)
+    _setup(args.profile, args.data_dir)
+
+    cases = []
+    if 'calc' in groups:
+        from payroll_app.synthetic import random_salaries
+        cases += calculator_cases(random_salaries(profile['salaries'], SEED))
+    if 'view' in groups or 'bulk' in groups:
+        _ensure_dataset(profile['employees'], profile['years'])
+    if 'view' in groups:
+        cases += view_cases(args.requests)
+    if 'bulk' in groups:
+        cases += bulk_cases()
+
+    results = {}
+    for name, func, ops in cases:
+        results[name] = _measure(func, ops, args.repeat)
+        print(f"{name:<32} {results[name]['per_op_us']:>12.3f} us/op  ({results[name]['seconds']:.3f}s)", flush=True)
+
+    run = {
+        'meta': {
+            'profile': args.profile, **profile, 'seed': SEED, 'repeat': args.repeat,
+            'python': platform.python_version(), 'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'recorded': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(run, indent=2) + '\n')
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.save_baseline:
+        # Keep the baseline of cases that were not run this time.
+        previous = baselines.get(args.profile, {}).get('results', {})
+        baselines[args.profile] = {**run, 'results': {**previous, **results}}
+        args.baseline.write_text(json.dumps(baselines, indent=2) + '\n')
+        print(f"Saved {args.profile} baseline to {args.baseline}")
+        return
+
+    baseline = baselines.get(args.profile)
+    if not baseline:
+        print(f"No {args.profile} baseline in {args.baseline}; record one with --save-baseline.")
+        return
+    print(f"Compared with the {args.profile} baseline recorded {baseline['meta']['recorded']}:")
+    regressions = compare(results, baseline['results'], args.slack)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
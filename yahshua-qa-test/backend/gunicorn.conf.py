@@ -0,0 +1,41 @@
+"""
+Gunicorn settings for the production serving profile.
+
+    gunicorn -c gunicorn.conf.py payroll_project.wsgi:application
+
+Every setting can be overridden from the environment:
+
+- WEB_CONCURRENCY    worker processes (default: 2 x CPUs + 1)
+- WEB_THREADS        threads per worker; > 1 switches to the gthread worker
+- WEB_WORKER_CLASS   e.g. uvicorn.workers.UvicornWorker with payroll_project.asgi:application
+- WEB_TIMEOUT, WEB_KEEPALIVE, WEB_MAX_REQUESTS, PORT
+"""
+
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+bind = f"0.0.0.0:{_env_int('PORT', 8000)}"
+
+workers = _env_int('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1)
+threads = _env_int('WEB_THREADS', 4)
+worker_class = os.environ.get('WEB_WORKER_CLASS') or ('gthread' if threads > 1 else 'sync')
+
+# Import Django once in the master so workers fork with settings, URLconf and
+# the compiled rate tables already loaded.
+preload_app = True
+
+timeout = _env_int('WEB_TIMEOUT', 30)
+graceful_timeout = timeout
+keepalive = _env_int('WEB_KEEPALIVE', 5)
+
+# Recycle workers periodically (jittered so they don't restart together).
+max_requests = _env_int('WEB_MAX_REQUESTS', 5000)
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
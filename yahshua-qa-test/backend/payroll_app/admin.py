@@ -1,5 +1,25 @@
 from django.contrib import admin
-from .models import Employee, PayrollCalculation
+from .models import (
+    Employee, PayrollCalculation, PayrollPeriodRollup, PayrollRun, RateTableVersion, StalePayroll, YearToDateLedger,
+)
+from .search import search_employees
+from .services import delete_payroll
+
+
+class DerivedDataAdmin(admin.ModelAdmin):
+    """
+    View-only admin for tables the payroll write paths maintain with signed
+    deltas; edits here would bypass them. Fix drift with the rebuild commands.
+    """
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Employee)
@@ -8,9 +28,65 @@ class EmployeeAdmin(admin.ModelAdmin):
     list_filter = ['employment_type', 'department', 'is_active']
     search_fields = ['first_name', 'last_name', 'email']
 
+    def get_search_results(self, request, queryset, search_term):
+        # Prefix matches on the indexed search terms instead of icontains'
+        # LIKE '%...%' scan over every employee.
+        if not search_term.strip():
+            return queryset, False
+        return search_employees(queryset, search_term), False
+
 
 @admin.register(PayrollCalculation)
 class PayrollCalculationAdmin(admin.ModelAdmin):
     list_display = ['employee', 'period_month', 'period_year', 'basic_salary', 'net_pay']
     list_filter = ['period_year', 'period_month']
     search_fields = ['employee__first_name', 'employee__last_name']
+
+    # Records are computed by the payroll API; an edited row would disagree
+    # with its rollup and ledger. Deletes go through services.delete_payroll,
+    # which subtracts them.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def delete_model(self, request, obj):
+        delete_payroll(obj)
+
+    def delete_queryset(self, request, queryset):
+        for payroll in queryset.select_related('employee'):
+            delete_payroll(payroll)
+
+
+@admin.register(RateTableVersion)
+class RateTableVersionAdmin(admin.ModelAdmin):
+    list_display = ['effective_from', 'notes', 'published_at']
+
+
+@admin.register(PayrollPeriodRollup)
+class PayrollPeriodRollupAdmin(DerivedDataAdmin):
+    list_display = ['period_year', 'period_month', 'department', 'employment_type', 'record_count', 'net_pay']
+    list_filter = ['period_year', 'period_month', 'department', 'employment_type']
+
+
+@admin.register(YearToDateLedger)
+class YearToDateLedgerAdmin(DerivedDataAdmin):
+    list_display = ['employee', 'year', 'gross', 'contributions', 'tax_withheld']
+    list_filter = ['year']
+    raw_id_fields = ['employee']
+
+
+@admin.register(PayrollRun)
+class PayrollRunAdmin(admin.ModelAdmin):
+    list_display = [
+        'period_month', 'period_year', 'status', 'processed_employees', 'total_employees', 'attempts', 'created_at',
+    ]
+    list_filter = ['status', 'period_year']
+
+
+@admin.register(StalePayroll)
+class StalePayrollAdmin(admin.ModelAdmin):
+    list_display = ['employee', 'period_month', 'period_year', 'queued_at']
+    list_filter = ['period_year', 'period_month']
+    raw_id_fields = ['employee']
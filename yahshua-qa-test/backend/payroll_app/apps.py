@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class PayrollAppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'payroll_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
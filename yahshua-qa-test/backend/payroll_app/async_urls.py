@@ -0,0 +1,22 @@
+"""
+API routes for ASGI: the async read views from payroll_app.async_views in
+place of their sync versions, same paths and names, everything else as in
+payroll_app.urls.
+"""
+
+from django.urls import path
+
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+async_urlpatterns = [
+    path('health/', async_views.health_check, name='health-check'),
+    path('employees/', async_views.employee_list, name='employee-list'),
+    path('payroll-history/', async_views.payroll_history, name='payroll-history'),
+    path('payroll-history/<int:pk>/', async_views.payroll_history_detail, name='payroll-history-detail'),
+    path('tax-brackets/', async_views.tax_brackets, name='tax-brackets'),
+]
+
+_replaced = {pattern.name for pattern in async_urlpatterns}
+
+urlpatterns = async_urlpatterns + [pattern for pattern in sync_urlpatterns if pattern.name not in _replaced]
@@ -0,0 +1,179 @@
+"""
+Native async variants of the read-heavy API views, served under ASGI
+(payroll_project.urls_asgi).
+
+Each view answers GET and HEAD itself with the async ORM (`aget`,
+`aaggregate`, `async for`), so a worker waiting on the database keeps
+serving other requests instead of holding a thread. Every other method
+(employee POST, history DELETE, OPTIONS and 405s) is handed to the sync DRF
+view in payroll_app.views, so writes keep their transactions and behaviour.
+
+Responses are byte-for-byte what the sync views render with JSONRenderer,
+and share their ETags and cached bodies (see http_cache).
+"""
+
+from functools import wraps
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import views
+from .calculations.tax_calculator import get_tax_brackets
+from .http_cache import JSONDataResponse, async_conditional_response, atable_version, make_etag
+from .instrumentation import span
+from .models import Employee, PayrollCalculation
+from .rates import get_rate_table
+from .serializers import EmployeeSerializer, PayrollCalculationSerializer, payroll_rows, serialize_payroll_row
+
+aget_rate_table = sync_to_async(get_rate_table)
+
+
+def reads_async(sync_view):
+    """
+    Serve GET and HEAD with the decorated coroutine and any other method with
+    `sync_view` in a thread.
+    """
+    delegate = sync_to_async(sync_view)
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method in ('GET', 'HEAD'):
+                return await view(request, *args, **kwargs)
+            return await delegate(request, *args, **kwargs)
+        # CsrfViewMiddleware only sees this wrapper; the DRF views it hands
+        # writes to are csrf_exempt too.
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+
+@reads_async(views.health_check)
+async def health_check(request):
+    return JSONDataResponse({"status": "ok", "message": "Payroll API is running."})
+
+
+# ---------------------------------------------------------------------------
+# Employee endpoints
+# ---------------------------------------------------------------------------
+
+async def _employee_list_etag(request):
+    return make_etag(request, await atable_version(Employee.objects.all()))
+
+
+@reads_async(views.employee_list)
+@async_conditional_response(_employee_list_etag)
+async def employee_list(request):
+    employees = [employee async for employee in Employee.objects.filter(is_active=True)]
+    with span('serialize'):
+        data = EmployeeSerializer(employees, many=True).data
+    return JSONDataResponse(data)
+
+
+# ---------------------------------------------------------------------------
+# Payroll history
+# ---------------------------------------------------------------------------
+
+async def _payroll_history_etag(request):
+    if request.GET.get('stream') == 'ndjson':
+        return None
+    return make_etag(
+        request,
+        await atable_version(views._filter_history(PayrollCalculation.objects.all(), request.GET)),
+        await atable_version(Employee.objects.all()),
+    )
+
+
+@reads_async(views.payroll_history)
+@async_conditional_response(_payroll_history_etag)
+async def payroll_history(request):
+    """Async payroll_history: same parameters and output as views.payroll_history."""
+    params = request.GET
+    records = views._history_records(params)
+
+    fast = views._use_fast_serializer(params)
+    if params.get('stream') == 'ndjson':
+        return _stream_ndjson(records, fast)
+
+    if params.get('cursor') is None and params.get('page_size') is None:
+        rows = [row async for row in (payroll_rows(records) if fast else records)]
+        with span('serialize'):
+            if fast:
+                return JSONDataResponse([serialize_payroll_row(values) for values in rows])
+            return JSONDataResponse(PayrollCalculationSerializer(rows, many=True).data)
+
+    try:
+        records, page_size = views._history_page_query(records, params)
+    except ValueError as exc:
+        return JSONDataResponse({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Fetch one extra row to know whether there is a next page.
+    page = [row async for row in (payroll_rows(records) if fast else records)[:page_size + 1]]
+    return JSONDataResponse(views._history_page(page, page_size, fast))
+
+
+async def _aiterate(queryset, chunk_size):
+    """
+    Like `queryset.aiterator(chunk_size)`. On Django 4.2 `aiterator()` runs a
+    `values_list()` query in the event loop, so the iterator is created in a
+    thread here.
+    """
+    rows = await sync_to_async(queryset.iterator)(chunk_size=chunk_size)
+    next_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    while chunk := await next_chunk():
+        for row in chunk:
+            yield row
+
+
+def _stream_ndjson(records, fast):
+    encoder = JSONEncoder(ensure_ascii=False)
+
+    async def lines():
+        if fast:
+            async for values in _aiterate(payroll_rows(records), views.HISTORY_STREAM_CHUNK_SIZE):
+                yield encoder.encode(serialize_payroll_row(values)) + '\n'
+        else:
+            async for record in _aiterate(records, views.HISTORY_STREAM_CHUNK_SIZE):
+                yield encoder.encode(PayrollCalculationSerializer(record).data) + '\n'
+
+    return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+
+
+@reads_async(views.payroll_history_detail)
+async def payroll_history_detail(request, pk):
+    try:
+        record = await PayrollCalculation.objects.select_related('employee').aget(pk=pk)
+    except PayrollCalculation.DoesNotExist:
+        return JSONDataResponse({"error": "Payroll record not found."}, status=status.HTTP_404_NOT_FOUND)
+    return JSONDataResponse(PayrollCalculationSerializer(record).data)
+
+
+# ---------------------------------------------------------------------------
+# Tax brackets
+# ---------------------------------------------------------------------------
+
+async def _tax_brackets_etag(request):
+    try:
+        rates = await aget_rate_table(*views._requested_period(request.GET))
+    except ValueError:
+        return None
+    return make_etag(request, rates.version)
+
+
+@reads_async(views.tax_brackets)
+@async_conditional_response(
+    _tax_brackets_etag, max_age=settings.PAYROLL_RATE_TABLE_CACHE_TIMEOUT, public=True,
+)
+async def tax_brackets(request):
+    """Return the tax brackets in force today, or for ?year=&month= when given."""
+    try:
+        rates = await aget_rate_table(*views._requested_period(request.GET))
+    except ValueError:
+        return JSONDataResponse(
+            {"error": "year and month must be a valid period."}, status=status.HTTP_400_BAD_REQUEST,
+        )
+    return JSONDataResponse({"brackets": get_tax_brackets(rates.tax)})
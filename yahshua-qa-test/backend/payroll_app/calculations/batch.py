@@ -0,0 +1,202 @@
+"""
+Vectorized Payroll Calculator
+
+Batch versions of the SSS, PhilHealth, Pag-IBIG and withholding tax
+calculators. Salaries and results are NumPy int64 arrays of centavos.
+
+- Bracket lookups use `searchsorted` over boundaries compiled, once per
+  rate table version, from the same RateTable the scalar calculators read.
+- Every rate is applied as an exact integer fraction, and each quantize step
+  of the scalar code is reproduced with integer division that rounds half to
+  even (the `Decimal` default context), so results are identical to the
+  scalar functions.
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+from typing import NamedTuple
+
+import numpy as np
+
+from .rate_tables import BUILTIN_RATE_TABLE
+
+
+def _centavos(amount) -> int:
+    """Convert a peso amount to an exact integer number of centavos."""
+    value = Decimal(str(amount)).scaleb(2)
+    if value != value.to_integral_value():
+        raise ValueError(f"{amount} is not a whole number of centavos.")
+    return int(value)
+
+
+def _ratio(rate) -> tuple:
+    """Return an exact (numerator, denominator) pair for a decimal rate."""
+    fraction = Fraction(Decimal(str(rate)))
+    return fraction.numerator, fraction.denominator
+
+
+def _round_half_even_div(numerator, denominator):
+    """Integer division rounded half to even, matching `Decimal.quantize`."""
+    quotient, remainder = np.divmod(numerator, denominator)
+    twice = remainder * 2
+    round_up = (twice > denominator) | ((twice == denominator) & (quotient % 2 == 1))
+    return quotient + round_up
+
+
+class _BatchRates(NamedTuple):
+    sss_upper_bounds: np.ndarray
+    sss_employee: np.ndarray
+    sss_employer: np.ndarray
+    philhealth_rate: tuple
+    philhealth_floor: int
+    philhealth_ceiling: int
+    pagibig_rate: tuple
+    pagibig_max_contribution: int
+    pagibig_salary_threshold: int
+    tax_excess_over: np.ndarray
+    tax_base: np.ndarray
+    tax_rate_num: np.ndarray
+    tax_rate_den: np.ndarray
+
+
+_compiled = {}  # RateTable.version -> _BatchRates
+
+
+def _batch_rates(rates) -> _BatchRates:
+    """Compile a RateTable into centavo arrays, once per table version."""
+    compiled = _compiled.get(rates.version)
+    if compiled is not None:
+        return compiled
+
+    tax_rates = [_ratio(rate) for rate in rates.tax.rates]
+    compiled = _compiled[rates.version] = _BatchRates(
+        sss_upper_bounds=np.array([_centavos(b) for b in rates.sss.upper_bounds], dtype=np.int64),
+        sss_employee=np.array([_centavos(e) for e, _ in rates.sss.contributions], dtype=np.int64),
+        sss_employer=np.array([_centavos(e) for _, e in rates.sss.contributions], dtype=np.int64),
+        philhealth_rate=_ratio(rates.philhealth.rate),
+        philhealth_floor=_centavos(rates.philhealth.floor),
+        philhealth_ceiling=_centavos(rates.philhealth.ceiling),
+        pagibig_rate=_ratio(rates.pagibig.rate),
+        pagibig_max_contribution=_centavos(rates.pagibig.max_contribution),
+        pagibig_salary_threshold=_centavos(rates.pagibig.salary_threshold),
+        tax_excess_over=np.array([_centavos(t) for t in rates.tax.thresholds], dtype=np.int64),
+        tax_base=np.array([_centavos(b) for b in rates.tax.base_tax], dtype=np.int64),
+        tax_rate_num=np.array([num for num, _ in tax_rates], dtype=np.int64),
+        tax_rate_den=np.array([den for _, den in tax_rates], dtype=np.int64),
+    )
+    return compiled
+
+
+def to_centavos(amounts) -> np.ndarray:
+    """Convert an iterable of peso amounts (Decimal, str or int) to centavos."""
+    return np.array([_centavos(amount) for amount in amounts], dtype=np.int64)
+
+
+def from_centavos(centavos) -> list:
+    """Convert an array of centavos to a list of 2-decimal-place Decimals."""
+    return [Decimal(int(value)).scaleb(-2) for value in centavos]
+
+
+def calculate_sss_batch(salaries, rates=BUILTIN_RATE_TABLE) -> dict:
+    """
+    Calculate SSS contributions for an array of monthly salaries in centavos.
+
+    Returns:
+        dict with 'employee' and 'employer' int64 arrays in centavos
+    """
+    compiled = _batch_rates(rates)
+    salaries = np.asarray(salaries, dtype=np.int64)
+    index = np.searchsorted(compiled.sss_upper_bounds, salaries, side='left')
+    positive = salaries > 0
+    return {
+        "employee": np.where(positive, compiled.sss_employee[index], 0),
+        "employer": np.where(positive, compiled.sss_employer[index], 0),
+    }
+
+
+def calculate_philhealth_batch(salaries, rates=BUILTIN_RATE_TABLE) -> dict:
+    """
+    Calculate PhilHealth contributions for an array of salaries in centavos.
+
+    Returns:
+        dict with 'employee' and 'employer' int64 arrays in centavos
+    """
+    compiled = _batch_rates(rates)
+    salaries = np.asarray(salaries, dtype=np.int64)
+    capped = np.clip(salaries, compiled.philhealth_floor, compiled.philhealth_ceiling)
+    numerator, denominator = compiled.philhealth_rate
+    total = _round_half_even_div(capped * numerator, denominator)
+    half = np.where(salaries > 0, _round_half_even_div(total, 2), 0)
+    return {"employee": half, "employer": half.copy()}
+
+
+def calculate_pagibig_batch(salaries, rates=BUILTIN_RATE_TABLE) -> dict:
+    """
+    Calculate Pag-IBIG / HDMF contributions for an array of salaries in centavos.
+
+    Returns:
+        dict with 'employee' and 'employer' int64 arrays in centavos
+    """
+    compiled = _batch_rates(rates)
+    salaries = np.asarray(salaries, dtype=np.int64)
+    numerator, denominator = compiled.pagibig_rate
+    contribution = _round_half_even_div(salaries * numerator, denominator)
+    capped = salaries > compiled.pagibig_salary_threshold
+    contribution = np.where(
+        capped, np.minimum(contribution, compiled.pagibig_max_contribution), contribution
+    )
+    contribution = np.where(salaries > 0, contribution, 0)
+    return {"employee": contribution, "employer": contribution.copy()}
+
+
+def calculate_annual_income_tax_batch(annual_incomes, rates=BUILTIN_RATE_TABLE) -> np.ndarray:
+    """Calculate annual income tax for an array of annual incomes in centavos."""
+    compiled = _batch_rates(rates)
+    annual_incomes = np.asarray(annual_incomes, dtype=np.int64)
+    # Same `>=` lower bound as calculate_annual_income_tax (see BUG #1 there).
+    index = np.searchsorted(compiled.tax_excess_over, annual_incomes, side='right') - 1
+    taxed = index >= 0
+    index = np.where(taxed, index, 0)
+
+    excess = annual_incomes - compiled.tax_excess_over[index]
+    tax = compiled.tax_base[index] + _round_half_even_div(
+        excess * compiled.tax_rate_num[index], compiled.tax_rate_den[index]
+    )
+    return np.where(taxed, tax, 0)
+
+
+def calculate_monthly_withholding_tax_batch(salaries, rates=BUILTIN_RATE_TABLE) -> np.ndarray:
+    """Calculate monthly withholding tax for an array of salaries in centavos."""
+    salaries = np.asarray(salaries, dtype=np.int64)
+    annual_tax = calculate_annual_income_tax_batch(salaries * 12, rates)
+    return _round_half_even_div(annual_tax, 12)
+
+
+def calculate_deductions_batch(salaries, rates=BUILTIN_RATE_TABLE) -> dict:
+    """
+    Calculate every contribution, the withholding tax and net pay in one pass.
+
+    `rates` is the RateTable for the payroll period.
+
+    Returns:
+        dict of int64 centavo arrays keyed like the `PayrollCalculation` fields
+    """
+    salaries = np.asarray(salaries, dtype=np.int64)
+    sss = calculate_sss_batch(salaries, rates)
+    philhealth = calculate_philhealth_batch(salaries, rates)
+    pagibig = calculate_pagibig_batch(salaries, rates)
+    income_tax = calculate_monthly_withholding_tax_batch(salaries, rates)
+
+    total_deductions = sss["employee"] + philhealth["employee"] + pagibig["employee"] + income_tax
+    return {
+        "basic_salary": salaries,
+        "sss_employee": sss["employee"],
+        "sss_employer": sss["employer"],
+        "philhealth_employee": philhealth["employee"],
+        "philhealth_employer": philhealth["employer"],
+        "pagibig_employee": pagibig["employee"],
+        "pagibig_employer": pagibig["employer"],
+        "income_tax": income_tax,
+        "total_deductions": total_deductions,
+        "net_pay": salaries - total_deductions,
+    }
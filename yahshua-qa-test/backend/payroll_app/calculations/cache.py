@@ -0,0 +1,90 @@
+"""
+Deduction Result Cache
+
+Most employees share a few hundred distinct salaries, so deduction results
+are memoized by (exact salary, rate table version). Entries never go stale:
+a change of rates produces a new version and therefore new keys.
+
+- Local entries live in a bounded LRU map inside the process.
+- An optional shared backend (anything with the Django cache `get`/`set`
+  API) lets worker processes reuse each other's warm entries.
+"""
+
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+
+
+class DeductionCache:
+
+    def __init__(self, maxsize=4096, shared=None, timeout=None):
+        self.maxsize = maxsize
+        self.shared = shared
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(salary, version: str) -> tuple:
+        return (Decimal(str(salary)), version)
+
+    @staticmethod
+    def _shared_key(key) -> str:
+        salary, version = key
+        return f"payroll:deductions:{version}:{format(salary.normalize(), 'f')}"
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for `key`, calling `compute()` on a miss.
+
+        Callers must treat the returned value as read-only.
+        """
+        if self.maxsize <= 0:
+            with self._lock:
+                self.misses += 1
+            return compute()
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = None
+        if self.shared is not None:
+            value = self.shared.get(self._shared_key(key))
+        from_shared = value is not None
+        if not from_shared:
+            value = compute()
+            if self.shared is not None:
+                self.shared.set(self._shared_key(key), value, self.timeout)
+
+        with self._lock:
+            if from_shared:
+                self.shared_hits += 1
+            else:
+                self.misses += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drop local entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+        }
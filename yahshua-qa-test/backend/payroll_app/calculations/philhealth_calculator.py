@@ -14,6 +14,7 @@ Pag-IBIG / HDMF:
 """
 
 from decimal import Decimal
+from typing import NamedTuple
 
 
 PHILHEALTH_RATE = Decimal('0.05')
@@ -25,7 +26,24 @@ PAGIBIG_MAX_CONTRIBUTION = Decimal('200')
 PAGIBIG_SALARY_THRESHOLD = Decimal('5000')
 
 
-def calculate_philhealth(monthly_salary: Decimal) -> dict:
+class PhilHealthRates(NamedTuple):
+    rate: Decimal
+    floor: Decimal
+    ceiling: Decimal
+
+
+class PagIbigRates(NamedTuple):
+    rate: Decimal
+    max_contribution: Decimal
+    salary_threshold: Decimal
+
+
+DEFAULT_PHILHEALTH_RATES = PhilHealthRates(PHILHEALTH_RATE, PHILHEALTH_FLOOR, PHILHEALTH_CEILING)
+DEFAULT_PAGIBIG_RATES = PagIbigRates(PAGIBIG_RATE, PAGIBIG_MAX_CONTRIBUTION, PAGIBIG_SALARY_THRESHOLD)
+
+
+def calculate_philhealth(monthly_salary: Decimal,
+                         rates: PhilHealthRates = DEFAULT_PHILHEALTH_RATES) -> dict:
     """
     Calculate PhilHealth contributions.
 
@@ -37,8 +55,8 @@ def calculate_philhealth(monthly_salary: Decimal) -> dict:
         return {"employee": Decimal("0.00"), "employer": Decimal("0.00")}
 
     # Apply floor and ceiling
-    capped_salary = max(PHILHEALTH_FLOOR, min(salary, PHILHEALTH_CEILING))
-    total = (capped_salary * PHILHEALTH_RATE).quantize(Decimal('0.01'))
+    capped_salary = max(rates.floor, min(salary, rates.ceiling))
+    total = (capped_salary * rates.rate).quantize(Decimal('0.01'))
     half = (total / 2).quantize(Decimal('0.01'))
 
     return {
@@ -47,7 +65,8 @@ def calculate_philhealth(monthly_salary: Decimal) -> dict:
     }
 
 
-def calculate_pagibig(monthly_salary: Decimal) -> dict:
+def calculate_pagibig(monthly_salary: Decimal,
+                      rates: PagIbigRates = DEFAULT_PAGIBIG_RATES) -> dict:
     """
     Calculate Pag-IBIG / HDMF contributions.
 
@@ -58,10 +77,10 @@ def calculate_pagibig(monthly_salary: Decimal) -> dict:
     if salary <= 0:
         return {"employee": Decimal("0.00"), "employer": Decimal("0.00")}
 
-    contribution = (salary * PAGIBIG_RATE).quantize(Decimal('0.01'))
+    contribution = (salary * rates.rate).quantize(Decimal('0.01'))
 
-    if salary > PAGIBIG_SALARY_THRESHOLD:
-        contribution = min(contribution, PAGIBIG_MAX_CONTRIBUTION)
+    if salary > rates.salary_threshold:
+        contribution = min(contribution, rates.max_contribution)
 
     return {
         "employee": contribution,
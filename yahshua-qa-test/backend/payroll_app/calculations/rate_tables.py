@@ -0,0 +1,111 @@
+"""
+Effective-Dated Rate Tables
+
+A rate table bundles the SSS, PhilHealth, Pag-IBIG and income tax rates in
+force from an effective date, compiled into the immutable lookup structures
+the calculators take as their `rates` argument.
+
+Rate data is a JSON-compatible dict with four sections:
+
+  sss        : employee_rate, employer_rate, table (SSS_CONTRIBUTION_TABLE rows)
+  philhealth : rate, floor, ceiling
+  pagibig    : rate, max_contribution, salary_threshold
+  tax        : brackets (TAX_BRACKETS rows)
+
+The 2023 module constants are the built-in base version. Later versions only
+need the sections that changed; the rest is inherited from the version before.
+"""
+
+import hashlib
+import json
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple
+
+from .sss_calculator import (
+    SSS_CONTRIBUTION_TABLE, EMPLOYEE_RATE, EMPLOYER_RATE, SSSRates, compile_sss_rates,
+)
+from .philhealth_calculator import (
+    PHILHEALTH_RATE, PHILHEALTH_FLOOR, PHILHEALTH_CEILING,
+    PAGIBIG_RATE, PAGIBIG_MAX_CONTRIBUTION, PAGIBIG_SALARY_THRESHOLD,
+    PhilHealthRates, PagIbigRates,
+)
+from .tax_calculator import TAX_BRACKETS, TaxRates, compile_tax_rates
+
+
+RATE_SECTIONS = ('sss', 'philhealth', 'pagibig', 'tax')
+
+BUILTIN_EFFECTIVE_FROM = date(2023, 1, 1)
+
+BUILTIN_RATE_DATA = {
+    "sss": {
+        "employee_rate": str(EMPLOYEE_RATE),
+        "employer_rate": str(EMPLOYER_RATE),
+        "table": SSS_CONTRIBUTION_TABLE,
+    },
+    "philhealth": {
+        "rate": str(PHILHEALTH_RATE),
+        "floor": str(PHILHEALTH_FLOOR),
+        "ceiling": str(PHILHEALTH_CEILING),
+    },
+    "pagibig": {
+        "rate": str(PAGIBIG_RATE),
+        "max_contribution": str(PAGIBIG_MAX_CONTRIBUTION),
+        "salary_threshold": str(PAGIBIG_SALARY_THRESHOLD),
+    },
+    "tax": {
+        "brackets": TAX_BRACKETS,
+    },
+}
+
+
+class RateTable(NamedTuple):
+    version: str  # effective date plus a digest of the rate data
+    effective_from: date
+    sss: SSSRates
+    philhealth: PhilHealthRates
+    pagibig: PagIbigRates
+    tax: TaxRates
+
+
+def merge_rate_data(base: dict, overrides: dict) -> dict:
+    """Return `base` with the sections present in `overrides` replaced."""
+    unknown = set(overrides) - set(RATE_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown rate table sections: {', '.join(sorted(unknown))}.")
+    return {section: overrides.get(section, base[section]) for section in RATE_SECTIONS}
+
+
+def compile_rate_table(effective_from: date, data: dict) -> RateTable:
+    """
+    Compile complete rate data into a RateTable.
+
+    Raises:
+        ValueError / KeyError when a section is missing or malformed
+    """
+    digest = hashlib.sha1(
+        json.dumps(data, sort_keys=True, default=str).encode()
+    ).hexdigest()[:12]
+
+    sss = data["sss"]
+    philhealth = data["philhealth"]
+    pagibig = data["pagibig"]
+    return RateTable(
+        version=f"{effective_from.isoformat()}:{digest}",
+        effective_from=effective_from,
+        sss=compile_sss_rates(sss["table"], sss["employee_rate"], sss["employer_rate"]),
+        philhealth=PhilHealthRates(
+            Decimal(str(philhealth["rate"])),
+            Decimal(str(philhealth["floor"])),
+            Decimal(str(philhealth["ceiling"])),
+        ),
+        pagibig=PagIbigRates(
+            Decimal(str(pagibig["rate"])),
+            Decimal(str(pagibig["max_contribution"])),
+            Decimal(str(pagibig["salary_threshold"])),
+        ),
+        tax=compile_tax_rates(data["tax"]["brackets"]),
+    )
+
+
+BUILTIN_RATE_TABLE = compile_rate_table(BUILTIN_EFFECTIVE_FROM, BUILTIN_RATE_DATA)
@@ -8,7 +8,9 @@ Based on the SSS contribution table effective 2023:
 - Minimum MSC: ₱3,000
 """
 
+from bisect import bisect_left
 from decimal import Decimal
+from typing import NamedTuple
 
 
 SSS_CONTRIBUTION_TABLE = [
@@ -53,17 +55,52 @@ EMPLOYEE_RATE = Decimal('0.045')
 EMPLOYER_RATE = Decimal('0.095')
 
 
-def _get_msc(monthly_salary: Decimal) -> Decimal:
+class SSSRates(NamedTuple):
+    """Compiled SSS table, looked up with a binary search over upper_bounds."""
+    upper_bounds: tuple   # inclusive upper bound of every bounded bracket, ascending
+    msc: tuple            # monthly salary credit of every bracket
+    contributions: tuple  # (employee, employer) contribution pair of every bracket
+
+
+def compile_sss_rates(table, employee_rate, employer_rate) -> SSSRates:
+    """
+    Compile an SSS contribution table into an immutable lookup structure.
+
+    Every bracket except the last must have a `salary_range_max`; the
+    contribution pair of each bracket is quantized once here.
+    """
+    upper_bounds = tuple(
+        Decimal(str(bracket["salary_range_max"]))
+        for bracket in table
+        if bracket["salary_range_max"] is not None
+    )
+    msc = tuple(Decimal(str(bracket["msc"])) for bracket in table)
+    if len(msc) != len(upper_bounds) + 1 or table[-1]["salary_range_max"] is not None:
+        raise ValueError("Only the last SSS bracket may be open-ended.")
+    if list(upper_bounds) != sorted(upper_bounds):
+        raise ValueError("SSS brackets must be sorted by salary.")
+
+    employee_rate = Decimal(str(employee_rate))
+    employer_rate = Decimal(str(employer_rate))
+    contributions = tuple(
+        (
+            (credit * employee_rate).quantize(Decimal('0.01')),
+            (credit * employer_rate).quantize(Decimal('0.01')),
+        )
+        for credit in msc
+    )
+    return SSSRates(upper_bounds, msc, contributions)
+
+
+DEFAULT_SSS_RATES = compile_sss_rates(SSS_CONTRIBUTION_TABLE, EMPLOYEE_RATE, EMPLOYER_RATE)
+
+
+def _get_msc(monthly_salary: Decimal, rates: SSSRates = DEFAULT_SSS_RATES) -> Decimal:
     """Find the monthly salary credit for a given salary."""
-    salary = float(monthly_salary)
-    for bracket in SSS_CONTRIBUTION_TABLE:
-        max_val = bracket["salary_range_max"]
-        if max_val is None or salary <= max_val:
-            return Decimal(str(bracket["msc"]))
-    return Decimal('20000')
+    return rates.msc[bisect_left(rates.upper_bounds, monthly_salary)]
 
 
-def calculate_sss(monthly_salary: Decimal) -> dict:
+def calculate_sss(monthly_salary: Decimal, rates: SSSRates = DEFAULT_SSS_RATES) -> dict:
     """
     Calculate SSS contributions for employee and employer.
 
@@ -74,9 +111,9 @@ def calculate_sss(monthly_salary: Decimal) -> dict:
     if salary <= 0:
         return {"employee": Decimal("0.00"), "employer": Decimal("0.00")}
 
-    msc = _get_msc(salary)
-    employee_contribution = (msc * EMPLOYEE_RATE).quantize(Decimal('0.01'))
-    employer_contribution = (msc * EMPLOYER_RATE).quantize(Decimal('0.01'))
+    employee_contribution, employer_contribution = (
+        rates.contributions[bisect_left(rates.upper_bounds, salary)]
+    )
 
     return {
         "employee": employee_contribution,
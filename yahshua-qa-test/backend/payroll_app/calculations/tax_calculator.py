@@ -10,7 +10,10 @@ Annual Tax Table:
   Over 8,000,000        : 2,202,500 + 35% of excess over 8,000,000
 """
 
+from bisect import bisect_right
 from decimal import Decimal
+from types import MappingProxyType
+from typing import NamedTuple
 
 
 TAX_BRACKETS = [
@@ -65,49 +68,92 @@ TAX_BRACKETS = [
 ]
 
 
-def calculate_annual_income_tax(annual_taxable_income: Decimal) -> Decimal:
+class TaxRates(NamedTuple):
+    """Compiled tax table, looked up with a binary search over thresholds."""
+    brackets: tuple    # read-only display copies of the bracket dicts
+    thresholds: tuple  # `excess_over` of every bracket, ascending
+    base_tax: tuple
+    rates: tuple       # marginal rate as a fraction, e.g. Decimal('0.15')
+
+
+def compile_tax_rates(brackets) -> TaxRates:
+    """Compile a list of TRAIN-style bracket dicts into an immutable lookup structure."""
+    thresholds = tuple(Decimal(str(bracket["excess_over"])) for bracket in brackets)
+    if not thresholds or list(thresholds) != sorted(thresholds):
+        raise ValueError("Tax brackets must be sorted by income.")
+
+    return TaxRates(
+        brackets=tuple(MappingProxyType(dict(bracket)) for bracket in brackets),
+        thresholds=thresholds,
+        base_tax=tuple(Decimal(str(bracket["base_tax"])) for bracket in brackets),
+        rates=tuple(Decimal(str(bracket["rate"])) / 100 for bracket in brackets),
+    )
+
+
+DEFAULT_TAX_RATES = compile_tax_rates(TAX_BRACKETS)
+
+
+def calculate_annual_income_tax(annual_taxable_income: Decimal,
+                                rates: TaxRates = DEFAULT_TAX_RATES) -> Decimal:
     """
     Calculate annual income tax based on TRAIN Law brackets.
 
-    BUG #1: The boundary check uses >= 250000 instead of > 250000.
+    BUG #1: The boundary check uses >= excess_over instead of > excess_over.
     This causes an annual salary of exactly 250,000 to be taxed at 15%
     when it should be 0% (tax-exempt up to and including 250,000).
     """
     annual_income = Decimal(str(annual_taxable_income))
 
-    # BUG #1: Should be `annual_income > 250000` — using >= incorrectly taxes
-    # the 250,000 boundary at the 15% rate instead of leaving it at 0%.
-    if annual_income >= Decimal('250000'):
-        if annual_income <= Decimal('400000'):
-            excess = annual_income - Decimal('250000')
-            return (excess * Decimal('0.15')).quantize(Decimal('0.01'))
-
-    if annual_income > Decimal('400000') and annual_income <= Decimal('800000'):
-        excess = annual_income - Decimal('400000')
-        return (Decimal('22500') + excess * Decimal('0.20')).quantize(Decimal('0.01'))
+    # BUG #1: Should find the last bracket with `annual_income > excess_over` —
+    # bisect_right treats the boundary as >=, so 250,000 lands in the 15% bracket
+    # instead of staying at 0%.
+    index = bisect_right(rates.thresholds, annual_income) - 1
+    if index < 0:
+        return Decimal('0.00')
 
-    if annual_income > Decimal('800000') and annual_income <= Decimal('2000000'):
-        excess = annual_income - Decimal('800000')
-        return (Decimal('102500') + excess * Decimal('0.25')).quantize(Decimal('0.01'))
+    excess = annual_income - rates.thresholds[index]
+    return (rates.base_tax[index] + excess * rates.rates[index]).quantize(Decimal('0.01'))
 
-    if annual_income > Decimal('2000000') and annual_income <= Decimal('8000000'):
-        excess = annual_income - Decimal('2000000')
-        return (Decimal('402500') + excess * Decimal('0.30')).quantize(Decimal('0.01'))
 
-    if annual_income > Decimal('8000000'):
-        excess = annual_income - Decimal('8000000')
-        return (Decimal('2202500') + excess * Decimal('0.35')).quantize(Decimal('0.01'))
-
-    return Decimal('0.00')
-
-
-def calculate_monthly_withholding_tax(monthly_basic_salary: Decimal) -> Decimal:
+def calculate_monthly_withholding_tax(monthly_basic_salary: Decimal,
+                                      rates: TaxRates = DEFAULT_TAX_RATES) -> Decimal:
     """Calculate monthly withholding tax from monthly basic salary."""
     annual_salary = Decimal(str(monthly_basic_salary)) * Decimal('12')
-    annual_tax = calculate_annual_income_tax(annual_salary)
+    annual_tax = calculate_annual_income_tax(annual_salary, rates)
     return (annual_tax / Decimal('12')).quantize(Decimal('0.01'))
 
 
-def get_tax_brackets():
+def calculate_cumulative_withholding_tax(monthly_basic_salary: Decimal,
+                                        period_month: int,
+                                        prior_gross: Decimal = Decimal('0'),
+                                        prior_tax_withheld: Decimal = Decimal('0'),
+                                        rates: TaxRates = DEFAULT_TAX_RATES) -> Decimal:
+    """
+    Calculate one month's withholding tax under the cumulative method.
+
+    `prior_*` are the employee's totals for the earlier months of the same
+    year (from the year-to-date ledger). The year is projected as what was
+    already paid plus this salary for every remaining month; the tax on that
+    projection, in proportion to income paid so far, less the tax already
+    withheld, is due now.
+
+    In December the projection is the actual year, so the year's
+    withholding adds up to the annual tax (the true-up). Over-withholding is
+    not refunded through payroll: the result is never negative. With the
+    same salary every month the result matches
+    calculate_monthly_withholding_tax up to centavo rounding.
+    """
+    salary = Decimal(str(monthly_basic_salary))
+    paid = Decimal(str(prior_gross)) + salary
+    projected = paid + salary * (12 - period_month)
+    if projected <= 0:
+        return Decimal('0.00')
+
+    annual_tax = calculate_annual_income_tax(projected, rates)
+    due = (annual_tax * paid / projected).quantize(Decimal('0.01'))
+    return max(due - Decimal(str(prior_tax_withheld)), Decimal('0.00'))
+
+
+def get_tax_brackets(rates: TaxRates = DEFAULT_TAX_RATES):
     """Return the tax brackets for display."""
-    return TAX_BRACKETS
+    return [dict(bracket) for bracket in rates.brackets]
@@ -0,0 +1,189 @@
+"""
+Bank disbursement files and payslip archives for a payroll period.
+
+Both outputs are generators of bytes built from one `.iterator()` pass over
+the period's PayrollCalculation rows, so they can feed a
+StreamingHttpResponse or a file without holding the period in memory (the
+ZIP central directory, a few hundred bytes per payslip, aside).
+
+Outputs are reproducible: rows are ordered by employee, nothing depends on
+the time of generation, and ZIP members carry the period's date. Each output
+is self-checking:
+
+- Bank files end with a trailer holding the record count, the total net pay
+  and the SHA-256 of the detail lines, so a regenerated file can be verified
+  by comparing trailers.
+- Payslip archives end with a SHA256SUMS member listing every payslip.
+"""
+
+import calendar
+import csv
+import hashlib
+import io
+import shutil
+import tempfile
+import unicodedata
+import zipfile
+from datetime import datetime
+from decimal import Decimal
+
+from .models import PayrollCalculation
+
+ITERATOR_CHUNK_SIZE = 2000
+
+BANK_FILE_LAYOUTS = ('csv', 'fixed')
+
+DISBURSEMENT_FIELDS = [
+    'employee_id', 'employee__first_name', 'employee__last_name', 'employee__email',
+    'employee__position', 'employee__department',
+    'basic_salary',
+    'sss_employee', 'sss_employer',
+    'philhealth_employee', 'philhealth_employer',
+    'pagibig_employee', 'pagibig_employer',
+    'income_tax', 'total_deductions', 'net_pay',
+]
+
+FIXED_NAME_WIDTH = 40
+
+
+def _period_rows(period_year, period_month):
+    rows = (
+        PayrollCalculation.objects.filter(period_year=period_year, period_month=period_month)
+        .order_by('employee_id')
+        .values_list(*DISBURSEMENT_FIELDS)
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    for values in rows:
+        yield dict(zip(DISBURSEMENT_FIELDS, values))
+
+
+def _centavos(amount) -> int:
+    return int((Decimal(amount) * 100).to_integral_value())
+
+
+def _ascii(text) -> str:
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+
+
+def _csv_line(values) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\r\n').writerow(values)
+    return buffer.getvalue().encode()
+
+
+def bank_file(period_year, period_month, layout='csv'):
+    """
+    Yield the bank disbursement file for a period.
+
+    `csv`: header row, one row per employee, then a TRAILER row.
+    `fixed`: H (period), D (employee id, name, centavos) and T (count,
+    total centavos, SHA-256) records, CRLF-terminated.
+    """
+    if layout not in BANK_FILE_LAYOUTS:
+        raise ValueError(f"Unknown bank file layout {layout!r}.")
+
+    digest = hashlib.sha256()
+    count = 0
+    total = 0
+    if layout == 'csv':
+        yield _csv_line(['employee_id', 'employee_name', 'email', 'net_pay'])
+    else:
+        yield f"H{period_year:04d}{period_month:02d}\r\n".encode()
+
+    for row in _period_rows(period_year, period_month):
+        name = f"{row['employee__first_name']} {row['employee__last_name']}"
+        if layout == 'csv':
+            line = _csv_line([row['employee_id'], name, row['employee__email'], f"{row['net_pay']:.2f}"])
+        else:
+            name = _ascii(name).upper()[:FIXED_NAME_WIDTH].ljust(FIXED_NAME_WIDTH)
+            line = f"D{row['employee_id']:010d}{name}{_centavos(row['net_pay']):015d}\r\n".encode()
+        digest.update(line)
+        count += 1
+        total += _centavos(row['net_pay'])
+        yield line
+
+    if layout == 'csv':
+        yield _csv_line(['TRAILER', count, f"{Decimal(total) / 100:.2f}", digest.hexdigest()])
+    else:
+        yield f"T{count:010d}{total:018d}{digest.hexdigest()}\r\n".encode()
+
+
+def _money(amount) -> str:
+    return f"{amount:,.2f}"
+
+
+def render_payslip(row, period_year, period_month) -> str:
+    """Plain-text payslip for one payroll row."""
+    lines = [
+        f"PAYSLIP - {calendar.month_name[period_month]} {period_year}",
+        f"Employee:   {row['employee__first_name']} {row['employee__last_name']} (#{row['employee_id']})",
+        f"Position:   {row['employee__position']}, {row['employee__department']}",
+        "-" * 44,
+        f"{'Basic salary':<28}{_money(row['basic_salary']):>16}",
+        f"{'SSS':<28}{_money(row['sss_employee']):>16}",
+        f"{'PhilHealth':<28}{_money(row['philhealth_employee']):>16}",
+        f"{'Pag-IBIG':<28}{_money(row['pagibig_employee']):>16}",
+        f"{'Withholding tax':<28}{_money(row['income_tax']):>16}",
+        f"{'Total deductions':<28}{_money(row['total_deductions']):>16}",
+        "-" * 44,
+        f"{'NET PAY':<28}{_money(row['net_pay']):>16}",
+        "",
+        "Employer contributions",
+        f"{'SSS':<28}{_money(row['sss_employer']):>16}",
+        f"{'PhilHealth':<28}{_money(row['philhealth_employer']):>16}",
+        f"{'Pag-IBIG':<28}{_money(row['pagibig_employer']):>16}",
+    ]
+    return "\r\n".join(lines) + "\r\n"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable sink that hands written bytes back in pieces."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def payslip_archive(period_year, period_month):
+    """
+    Yield a ZIP of one payslip per employee for a period, plus SHA256SUMS.
+
+    Members are dated the first day of the period with fixed permissions, so
+    the same data always produces the same archive bytes. Payslips are not
+    kept once written; what remains per member is the ZIP central-directory
+    entry the format requires, while the checksum list spills to a temp file.
+    """
+    timestamp = datetime(period_year, period_month, 1).timetuple()[:6]
+    folder = f"payslips-{period_year:04d}-{period_month:02d}"
+    sink = _ChunkSink()
+    sums = tempfile.SpooledTemporaryFile(max_size=1024 * 1024, mode='w+b')
+
+    def member(name):
+        info = zipfile.ZipInfo(f"{folder}/{name}", date_time=timestamp)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        return info
+
+    # zipfile notices the sink cannot seek and writes data descriptors.
+    with sums, zipfile.ZipFile(sink, 'w') as archive:
+        for row in _period_rows(period_year, period_month):
+            name = f"{row['employee_id']:010d}-{_ascii(row['employee__last_name']).replace('/', '_')}.txt"
+            payslip = render_payslip(row, period_year, period_month).encode()
+            sums.write(f"{hashlib.sha256(payslip).hexdigest()}  {name}\n".encode())
+            archive.writestr(member(name), payslip)
+            yield sink.drain()
+        sums.seek(0)
+        with archive.open(member('SHA256SUMS'), 'w') as manifest:
+            shutil.copyfileobj(sums, manifest)
+    yield sink.drain()
@@ -0,0 +1,213 @@
+"""
+Bulk employee import and export.
+
+Imports read CSV or NDJSON line by line from the request stream (or an
+uploaded file), validate rows with EmployeeImportSerializer, and check
+email uniqueness with one `email__in` query per batch before a single
+`bulk_create`. Invalid rows, and lines that are not UTF-8 or not parseable
+CSV, are reported with their line number and skipped; the rest of the upload
+is still inserted. Only an unreadable header fails the import as a whole,
+before anything is written.
+
+Exports walk the table by primary key and stream each chunk, so memory use
+does not grow with the number of employees.
+"""
+
+import csv
+import io
+import json
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Employee
+from .search import index_employees
+from .serializers import EmployeeImportSerializer
+
+IMPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 2000
+
+EMPLOYEE_IO_FIELDS = [
+    'first_name', 'last_name', 'email', 'position', 'department',
+    'employment_type', 'monthly_salary', 'date_hired', 'is_active',
+]
+EXPORT_FIELDS = ['id', *EMPLOYEE_IO_FIELDS]
+REQUIRED_CSV_COLUMNS = {
+    name for name, field in EmployeeImportSerializer().fields.items()
+    if name in EMPLOYEE_IO_FIELDS and field.required
+}
+
+
+NOT_UTF8 = 'Line is not valid UTF-8.'
+
+
+class ImportFormatError(ValueError):
+    """The upload as a whole is unreadable (as opposed to a bad row)."""
+
+
+def _decode(line):
+    return line.decode('utf-8-sig') if isinstance(line, bytes) else line
+
+
+def iter_csv_rows(stream):
+    """
+    Yield (line number, row dict) from a CSV byte stream with a header row,
+    or (line number, error message) for a line that cannot be read.
+    """
+    undecodable = []
+
+    def lines():
+        for line_number, line in enumerate(stream, start=1):
+            try:
+                yield _decode(line)
+            except UnicodeDecodeError:
+                # A blank line keeps the reader's line numbers; the reader skips it.
+                undecodable.append(line_number)
+                yield '\n'
+
+    reader = csv.DictReader(lines())
+    missing = REQUIRED_CSV_COLUMNS - set(reader.fieldnames or ())
+    if missing:
+        raise ImportFormatError(f"Missing CSV column(s): {', '.join(sorted(missing))}.")
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as exc:
+            row = f"Unreadable CSV line: {exc}."
+        while undecodable:
+            yield undecodable.pop(0), NOT_UTF8
+        # DictReader.line_num is not advanced past skipped blank lines.
+        line_number = reader.reader.line_num
+        if isinstance(row, str):
+            yield line_number, row
+        else:
+            # Blank optional cells mean "use the default", not an empty value.
+            yield line_number, {key: value for key, value in row.items() if key and value not in ('', None)}
+    while undecodable:
+        yield undecodable.pop(0), NOT_UTF8
+
+
+def iter_ndjson_rows(stream):
+    """Yield (line number, row dict or error message) from an NDJSON byte stream."""
+    for line_number, line in enumerate(stream, start=1):
+        try:
+            line = _decode(line)
+        except UnicodeDecodeError:
+            yield line_number, NOT_UTF8
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else 'Invalid JSON object.'
+
+
+class EmployeeImporter:
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.created = 0
+        self.errors = []
+        self._batch = []
+        # One instance validates every row; building a ModelSerializer's
+        # fields per row costs more than the validation itself.
+        self._serializer = EmployeeImportSerializer()
+
+    def feed(self, rows):
+        for line, row in rows:
+            if isinstance(row, str):
+                self.errors.append({'line': line, 'errors': {'non_field_errors': [row]}})
+                continue
+            try:
+                data = self._serializer.run_validation(row)
+            except ValidationError as exc:
+                self.errors.append({'line': line, 'errors': exc.detail})
+                continue
+            self._batch.append((line, data))
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+        self.flush()
+        return self
+
+    def flush(self):
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        emails = [data['email'] for _, data in batch]
+        taken = set(Employee.objects.filter(email__in=emails).values_list('email', flat=True))
+
+        employees = []
+        for line, data in batch:
+            if data['email'] in taken:
+                self.errors.append({'line': line, 'errors': {'email': ['employee with this email already exists.']}})
+                continue
+            taken.add(data['email'])  # duplicates within the upload
+            employees.append((line, Employee(**data)))
+
+        try:
+            with transaction.atomic():
+                Employee.objects.bulk_create([employee for _, employee in employees])
+                # bulk_create sends no post_save, so index the new employees here.
+                index_employees((employee for _, employee in employees), created=True)
+            self.created += len(employees)
+        except IntegrityError:
+            # A concurrent writer took one of the emails; fall back to row by row.
+            for line, employee in employees:
+                try:
+                    with transaction.atomic():
+                        employee.save()
+                    self.created += 1
+                except IntegrityError as exc:
+                    self.errors.append({'line': line, 'errors': {'non_field_errors': [str(exc)]}})
+
+    def result(self) -> dict:
+        errors = sorted(self.errors, key=lambda error: error['line'])
+        return {'created': self.created, 'failed': len(errors), 'errors': errors}
+
+
+def import_employees(stream, file_format, batch_size=IMPORT_BATCH_SIZE) -> dict:
+    """Import employees from a CSV or NDJSON byte stream; see module docstring."""
+    rows = iter_csv_rows(stream) if file_format == 'csv' else iter_ndjson_rows(stream)
+    return EmployeeImporter(batch_size).feed(rows).result()
+
+
+def _iter_employee_chunks(employees):
+    last_pk = 0
+    while True:
+        chunk = list(
+            employees.filter(pk__gt=last_pk).order_by('pk').values_list(*EXPORT_FIELDS)[:EXPORT_CHUNK_SIZE]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def export_employees_csv(employees):
+    """Yield CSV text for `employees`, header first, one piece per chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for chunk in _iter_employee_chunks(employees):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_employees_ndjson(employees):
+    """Yield NDJSON for `employees`, one piece per chunk."""
+    encoder = JSONEncoder(ensure_ascii=False)
+    salary = EXPORT_FIELDS.index('monthly_salary')
+    for chunk in _iter_employee_chunks(employees):
+        yield ''.join(
+            # Keep salaries as exact decimal strings, as the API does.
+            encoder.encode({**dict(zip(EXPORT_FIELDS, values)), 'monthly_salary': str(values[salary])}) + '\n'
+            for values in chunk
+        )
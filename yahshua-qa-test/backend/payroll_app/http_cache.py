@@ -0,0 +1,145 @@
+"""
+HTTP caching for read-mostly endpoints.
+
+`conditional_response` gives a DRF view a strong ETag, a Cache-Control
+header, `304 Not Modified` for a matching If-None-Match, and a server-side
+copy of the response body keyed by the ETag.
+
+ETags are derived from the database (max `updated_at` and row count, or the
+rate table version) rather than from counters kept in a process, so every
+worker agrees on them and any write - through signals, bulk writes or
+another process - changes them. Cached bodies are therefore never served
+stale; superseded entries simply expire.
+
+`async_conditional_response` does the same for the native async views
+(payroll_app.async_views). It shares the cache entries of the sync views,
+so WSGI and ASGI workers can serve each other's cached bodies.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def _version(queryset, stats) -> str:
+    latest = stats['latest'].isoformat() if stats['latest'] else '-'
+    return f"{queryset.model._meta.label}:{stats['rows']}:{latest}"
+
+
+def table_version(queryset) -> str:
+    """Version string for `queryset` from its row count and latest `updated_at`."""
+    return _version(queryset, queryset.order_by().aggregate(latest=Max('updated_at'), rows=Count('pk')))
+
+
+async def atable_version(queryset) -> str:
+    """Async version of `table_version`."""
+    return _version(queryset, await queryset.order_by().aaggregate(latest=Max('updated_at'), rows=Count('pk')))
+
+
+def make_etag(request, *parts) -> str:
+    """Strong ETag over the request path and query string plus `parts`."""
+    digest = hashlib.sha1(request.get_full_path().encode())
+    for part in parts:
+        digest.update(b'\0' + str(part).encode())
+    return quote_etag(digest.hexdigest())
+
+
+def conditional_response(etag_func, max_age=0, public=False):
+    """
+    Decorate a DRF view (below `@api_view`) with ETag-based caching.
+
+    `etag_func(request, *args, **kwargs)` returns the ETag for a GET, or None
+    to skip caching for that request (e.g. streamed responses). `max_age` 0
+    makes clients revalidate every time, which costs one cheap version query
+    and a 304 when nothing changed.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs) if request.method in ('GET', 'HEAD') else None
+            if etag is None:
+                return view(request, *args, **kwargs)
+
+            if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                key = _cache_key(view, etag)
+                data = cache.get(key)
+                if data is not None:
+                    response = Response(data)
+                else:
+                    response = view(request, *args, **kwargs)
+                    if response.status_code != status.HTTP_200_OK:
+                        return response
+                    cache.set(key, response.data, settings.PAYROLL_RESPONSE_CACHE_TIMEOUT)
+
+            return _with_validators(response, etag, max_age, public)
+        return wrapper
+    return decorator
+
+
+def _cache_key(view, etag) -> str:
+    return f'http-response:{view.__name__}:{etag}'
+
+
+def _with_validators(response, etag, max_age, public):
+    response['ETag'] = etag
+    patch_cache_control(response, max_age=max_age, **({'public': True} if public else {'private': True}))
+    if not max_age:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+class JSONDataResponse(JsonResponse):
+    """
+    JsonResponse encoded like DRF's JSONRenderer (compact, UTF-8) that keeps
+    the encoded data on `.data`, as a DRF Response does, for caching.
+    """
+
+    def __init__(self, data, **kwargs):
+        super().__init__(
+            data, encoder=JSONEncoder, safe=False,
+            json_dumps_params={'separators': (',', ':'), 'ensure_ascii': False}, **kwargs,
+        )
+        self.data = data
+
+
+def async_conditional_response(etag_func, max_age=0, public=False):
+    """
+    `conditional_response` for an async view returning JSONDataResponse.
+
+    `etag_func` is a coroutine function. Bodies are cached under the same
+    keys as the sync view of the same name.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            etag = await etag_func(request, *args, **kwargs) if request.method in ('GET', 'HEAD') else None
+            if etag is None:
+                return await view(request, *args, **kwargs)
+
+            if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+                response = HttpResponseNotModified()
+            else:
+                key = _cache_key(view, etag)
+                data = await cache.aget(key)
+                if data is not None:
+                    response = JSONDataResponse(data)
+                else:
+                    response = await view(request, *args, **kwargs)
+                    if response.status_code != status.HTTP_200_OK:
+                        return response
+                    await cache.aset(key, response.data, settings.PAYROLL_RESPONSE_CACHE_TIMEOUT)
+
+            return _with_validators(response, etag, max_age, public)
+        return wrapper
+    return decorator
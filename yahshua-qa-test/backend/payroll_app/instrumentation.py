@@ -0,0 +1,262 @@
+"""
+Request instrumentation: wall time, database queries, serializer and
+calculator spans.
+
+With PAYROLL_INSTRUMENTATION on, InstrumentationMiddleware gives every request
+a RequestMetrics (held in a context variable, so it follows the request
+through threads and async code), counts and times its SQL through
+`connection.execute_wrapper`, and reports everything twice:
+
+- a `Server-Timing` response header (`total`, `db` with the query count, and
+  one entry per span), readable in the browser's network panel;
+- process-wide Prometheus histograms, served by `/api/metrics/`.
+
+Code marks interesting sections with `span(name)` (or `@timed(name)`). Outside
+an instrumented request a span is a no-op costing one context-variable read.
+
+Metrics are kept per process. Under several gunicorn workers each scrape sees
+the worker that answered it, so compare rates and quantiles rather than raw
+counts, or scrape a single-worker instance.
+
+Streaming responses are measured up to the point the response is returned;
+work done while the body is streamed is not included.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SPAN_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_current = ContextVar('payroll_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Timings collected for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration = None
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.spans = {}  # name -> [seconds, calls]
+
+    def add_span(self, name, seconds):
+        entry = self.spans.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def __call__(self, execute, sql, params, many, context):
+        """`connection.execute_wrapper` hook counting and timing every query."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.db_queries += 1
+
+    def server_timing(self) -> str:
+        """The `Server-Timing` header value, durations in milliseconds."""
+        entries = [
+            f'total;dur={self.duration * 1000:.2f}',
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.db_queries} queries"',
+        ]
+        for name, (seconds, calls) in self.spans.items():
+            entry = f'{name};dur={seconds * 1000:.2f}'
+            if calls > 1:
+                entry += f';desc="{calls} calls"'
+            entries.append(entry)
+        return ', '.join(entries)
+
+
+def current_metrics():
+    """The RequestMetrics of the request being instrumented, or None."""
+    return _current.get()
+
+
+class span:
+    """
+    Context manager timing a named section of the current request.
+
+    Repeated spans with the same name are summed (and their calls counted).
+    """
+
+    __slots__ = ('name', 'metrics', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.metrics = _current.get()
+        if self.metrics is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.metrics is not None:
+            self.metrics.add_span(self.name, time.perf_counter() - self.started)
+
+
+def timed(name):
+    """Decorator form of `span`."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Prometheus metrics
+# ---------------------------------------------------------------------------
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield f'{self.name}{_labels(self.labelnames, labels)} {_number(value)}'
+
+
+class Histogram:
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self):
+        bounds = [*(_number(bound) for bound in self.buckets), '+Inf']
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                yield f'{self.name}_bucket{_labels(self.labelnames, labels, [("le", bound)])} {cumulative}'
+            yield f'{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}'
+            yield f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}'
+
+
+class MetricsRegistry:
+    """The process-wide request metrics, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = Counter(
+                'payroll_http_requests_total', 'HTTP requests by view, method and status.',
+                ['view', 'method', 'status'],
+            )
+            self.latency = Histogram(
+                'payroll_http_request_duration_seconds', 'Wall time to produce a response.',
+                ['view', 'method'], LATENCY_BUCKETS,
+            )
+            self.db_queries = Histogram(
+                'payroll_http_request_db_queries', 'SQL queries per request.',
+                ['view', 'method'], QUERY_COUNT_BUCKETS,
+            )
+            self.db_time = Histogram(
+                'payroll_http_request_db_duration_seconds', 'Time spent in SQL per request.',
+                ['view', 'method'], LATENCY_BUCKETS,
+            )
+            self.spans = Histogram(
+                'payroll_span_duration_seconds', 'Time per request spent in each span.',
+                ['view', 'span'], SPAN_BUCKETS,
+            )
+
+    def record(self, view, method, status_code, metrics):
+        with self._lock:
+            self.requests.inc((view, method, str(status_code)))
+            self.latency.observe((view, method), metrics.duration)
+            self.db_queries.observe((view, method), metrics.db_queries)
+            self.db_time.observe((view, method), metrics.db_time)
+            for name, (seconds, _) in metrics.spans.items():
+                self.spans.observe((view, name), seconds)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for metric in (self.requests, self.latency, self.db_queries, self.db_time, self.spans):
+                lines.append(f'# HELP {metric.name} {metric.help_text}')
+                lines.append(f'# TYPE {metric.name} {metric.kind}')
+                lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class InstrumentationMiddleware:
+    """Measure each request; see the module docstring. Off unless PAYROLL_INSTRUMENTATION."""
+
+    def __init__(self, get_response):
+        if not settings.PAYROLL_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        metrics.duration = time.perf_counter() - metrics.started
+
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        registry.record(view, request.method, response.status_code, metrics)
+        response['Server-Timing'] = metrics.server_timing()
+        return response
@@ -0,0 +1,199 @@
+"""
+Background payroll runs.
+
+The API queues a PayrollRun and returns immediately; `manage.py
+payroll_worker` claims queued runs and executes them. A run's employees are
+split into contiguous primary-key ranges (shards), one per worker process,
+and each shard is processed in chunks with services.upsert_payroll_chunk.
+After every chunk the shard adds its progress to the run row with F()
+updates and checks whether cancellation was requested, so a cancelled run
+stops within one chunk. Chunks are committed as they finish; a cancelled or
+failed run leaves the chunks it completed in place.
+
+The same per-chunk update renews the run's heartbeat. A worker that is
+killed mid-run stops renewing it, and once the heartbeat is older than
+PAYROLL_RUN_LEASE_TIMEOUT the next claim requeues the run (computing
+payroll is idempotent, so it simply starts over) or, after
+PAYROLL_RUN_MAX_ATTEMPTS claims, fails it. Shards stop as soon as their
+run has been claimed again, so a worker that was only slow cannot keep
+writing alongside the new one.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import PayrollRun
+from .rates import get_rate_table
+from .services import (
+    RUN_CHUNK_SIZE,
+    iter_employee_chunks,
+    payroll_run_employees,
+    upsert_payroll_chunk,
+)
+from .summaries import invalidate_payroll_summary
+
+
+def submit_payroll_run(period_month, period_year, department='', employment_type='') -> PayrollRun:
+    """Queue a payroll run for the worker."""
+    return PayrollRun.objects.create(
+        period_month=period_month,
+        period_year=period_year,
+        department=department,
+        employment_type=employment_type,
+        total_employees=payroll_run_employees(department, employment_type).count(),
+    )
+
+
+def cancel_payroll_run(run: PayrollRun) -> PayrollRun:
+    """
+    Request cancellation. A queued run is cancelled at once; a running one
+    stops after the chunk each shard is working on.
+    """
+    PayrollRun.objects.filter(pk=run.pk, status=PayrollRun.STATUS_QUEUED).update(
+        status=PayrollRun.STATUS_CANCELLED, cancel_requested=True, finished_at=timezone.now(),
+    )
+    PayrollRun.objects.filter(pk=run.pk, status=PayrollRun.STATUS_RUNNING).update(cancel_requested=True)
+    run.refresh_from_db()
+    return run
+
+
+def release_expired_runs() -> int:
+    """
+    Requeue running runs whose heartbeat has expired, failing those already
+    claimed PAYROLL_RUN_MAX_ATTEMPTS times and cancelling those whose
+    cancellation was requested.
+
+    Returns:
+        the number of runs released
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.PAYROLL_RUN_LEASE_TIMEOUT)
+    expired = PayrollRun.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        status=PayrollRun.STATUS_RUNNING,
+    )
+    released = expired.filter(cancel_requested=True).update(status=PayrollRun.STATUS_CANCELLED, finished_at=now)
+    released += expired.filter(attempts__gte=settings.PAYROLL_RUN_MAX_ATTEMPTS).update(
+        status=PayrollRun.STATUS_FAILED, error='The worker stopped responding.', finished_at=now,
+    )
+    # The next attempt recomputes every employee; records it creates add to created_records.
+    released += expired.update(status=PayrollRun.STATUS_QUEUED, processed_employees=0)
+    return released
+
+
+def claim_next_run():
+    """
+    Mark the oldest queued run as running and return it, or None if the queue
+    is empty. Runs left running by a dead worker are released first.
+    """
+    release_expired_runs()
+    while True:
+        run = PayrollRun.objects.filter(status=PayrollRun.STATUS_QUEUED).order_by('created_at', 'pk').first()
+        if run is None:
+            return None
+        now = timezone.now()
+        claimed = PayrollRun.objects.filter(pk=run.pk, status=PayrollRun.STATUS_QUEUED).update(
+            status=PayrollRun.STATUS_RUNNING, started_at=now, heartbeat_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            run.refresh_from_db()
+            return run
+        # Another worker claimed it first; try the next one.
+
+
+def shard_ranges(employees, shards) -> list:
+    """
+    Split `employees` into at most `shards` contiguous, inclusive primary-key
+    ranges of roughly equal size.
+    """
+    pks = employees.order_by('pk').values_list('pk', flat=True)
+    total = pks.count()
+    if not total:
+        return []
+    shards = max(1, min(shards, total))
+    starts = [pks[total * i // shards] for i in range(shards)]
+    ends = [start - 1 for start in starts[1:]] + [pks[total - 1]]
+    return list(zip(starts, ends))
+
+
+def run_payroll_shard(run_id, first_pk, last_pk, chunk_size=RUN_CHUNK_SIZE, attempt=None) -> bool:
+    """
+    Process the employees of run `run_id` with primary keys in
+    [first_pk, last_pk], as claim number `attempt` of the run (default: the
+    current one).
+
+    Returns:
+        False if the shard stopped early because the run was cancelled or
+        its lease expired
+    """
+    run = PayrollRun.objects.get(pk=run_id)
+    rates = get_rate_table(run.period_year, run.period_month)
+    employees = payroll_run_employees(run.department, run.employment_type).filter(
+        pk__gte=first_pk, pk__lte=last_pk,
+    )
+    runs = PayrollRun.objects.filter(
+        pk=run_id, status=PayrollRun.STATUS_RUNNING, attempts=run.attempts if attempt is None else attempt,
+    )
+    for chunk in iter_employee_chunks(employees, chunk_size):
+        if not runs.filter(cancel_requested=False).exists():
+            return False
+        with transaction.atomic():
+            created, _ = upsert_payroll_chunk(chunk, run.period_month, run.period_year, rates)
+            runs.update(
+                processed_employees=F('processed_employees') + len(chunk),
+                created_records=F('created_records') + created,
+                heartbeat_at=timezone.now(),
+            )
+    return True
+
+
+def map_in_processes(func, arg_tuples, workers) -> list:
+    """
+    Return [func(*args) for args in arg_tuples], spread over up to `workers`
+    processes. `func` must be a module-level function; with one worker (or
+    one task) everything runs in the calling process.
+    """
+    if workers <= 1 or len(arg_tuples) <= 1:
+        return [func(*args) for args in arg_tuples]
+    # Workers open their own connections; forked children must not inherit
+    # ours. django.setup covers platforms that spawn.
+    connections.close_all()
+    with ProcessPoolExecutor(min(workers, len(arg_tuples)), initializer=django.setup) as pool:
+        return list(pool.map(func, *zip(*arg_tuples)))
+
+
+def execute_payroll_run(run: PayrollRun, workers=1, chunk_size=RUN_CHUNK_SIZE) -> PayrollRun:
+    """
+    Execute a claimed run across `workers` processes and record its outcome.
+
+    `workers=1` processes the single shard in the calling process. The
+    outcome is not recorded if the run's lease expired and it was released
+    or claimed again meanwhile.
+    """
+    claimed = PayrollRun.objects.filter(pk=run.pk, status=PayrollRun.STATUS_RUNNING, attempts=run.attempts)
+    try:
+        shards = shard_ranges(payroll_run_employees(run.department, run.employment_type), workers)
+        completed = map_in_processes(
+            run_payroll_shard, [(run.pk, first, last, chunk_size, run.attempts) for first, last in shards], workers,
+        )
+    except Exception as exc:
+        claimed.update(
+            status=PayrollRun.STATUS_FAILED, error=f'{type(exc).__name__}: {exc}', finished_at=timezone.now(),
+        )
+    else:
+        claimed.update(
+            status=PayrollRun.STATUS_SUCCEEDED if all(completed) else PayrollRun.STATUS_CANCELLED,
+            finished_at=timezone.now(),
+        )
+    finally:
+        # bulk_create does not send post_save, so drop cached summaries here.
+        invalidate_payroll_summary(run.period_year, run.period_month)
+
+    run.refresh_from_db()
+    return run
@@ -0,0 +1,39 @@
+import hashlib
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payroll_app.disbursements import BANK_FILE_LAYOUTS, bank_file, payslip_archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the bank disbursement file and payslip ZIP for a period to a directory "
+        "and print their SHA-256 checksums (sha256sum format)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('period', help="Period as YYYY-MM.")
+        parser.add_argument('--output-dir', default='.', type=Path)
+        parser.add_argument('--layout', choices=BANK_FILE_LAYOUTS, default='csv')
+
+    def handle(self, *args, period, output_dir, layout, **options):
+        try:
+            year, month = (int(part) for part in period.split('-'))
+            if not 1 <= month <= 12:
+                raise ValueError(month)
+        except ValueError:
+            raise CommandError(f"Invalid period {period!r}; expected YYYY-MM.")
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        outputs = [
+            (f"bank-{year:04d}-{month:02d}.{'csv' if layout == 'csv' else 'txt'}", bank_file(year, month, layout)),
+            (f"payslips-{year:04d}-{month:02d}.zip", payslip_archive(year, month)),
+        ]
+        for name, chunks in outputs:
+            digest = hashlib.sha256()
+            with open(output_dir / name, 'wb') as output:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    output.write(chunk)
+            self.stdout.write(f"{digest.hexdigest()}  {name}")
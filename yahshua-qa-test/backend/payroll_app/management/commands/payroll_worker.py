@@ -0,0 +1,40 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from payroll_app.jobs import claim_next_run, execute_payroll_run
+from payroll_app.services import RUN_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = "Execute queued background payroll runs, sharding each run across worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Processes per run (default: number of CPUs).",
+        )
+        parser.add_argument('--chunk-size', type=int, default=RUN_CHUNK_SIZE)
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help="Seconds to wait between checks of an empty queue.",
+        )
+        parser.add_argument('--once', action='store_true', help="Drain the queue and exit.")
+
+    def handle(self, *args, workers, chunk_size, poll_interval, once, **options):
+        while True:
+            run = claim_next_run()
+            if run is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            self.stdout.write(f"Running {run} for {run.total_employees} employee(s) on {workers} worker(s)")
+            run = execute_payroll_run(run, workers=workers, chunk_size=chunk_size)
+            message = f"{run}: {run.processed_employees}/{run.total_employees} processed"
+            if run.status == run.STATUS_FAILED:
+                self.stderr.write(f"{message}. {run.error}")
+            else:
+                self.stdout.write(self.style.SUCCESS(message))
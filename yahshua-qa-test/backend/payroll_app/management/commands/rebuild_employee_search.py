@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from payroll_app.models import EmployeeSearchTerm
+from payroll_app.search import SEARCH_INDEX_BATCH_SIZE, live_search_terms
+from payroll_app.synthetic import batches
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employee search terms from Employee and verify them against the employees."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Only compare the search terms with the employees; exit non-zero on mismatch.",
+        )
+
+    def handle(self, *args, check=False, **options):
+        if not check:
+            with transaction.atomic():
+                EmployeeSearchTerm.objects.all().delete()
+                # bulk_create would list a generator in full; insert slice by slice.
+                for batch in batches(live_search_terms(), SEARCH_INDEX_BATCH_SIZE):
+                    EmployeeSearchTerm.objects.bulk_create(
+                        [EmployeeSearchTerm(employee_id=pk, term=term) for pk, term in batch]
+                    )
+
+        stored = set(EmployeeSearchTerm.objects.values_list('employee_id', 'term').iterator(chunk_size=2000))
+        live = set(live_search_terms())
+        mismatched = sorted(stored ^ live)
+        if mismatched:
+            for employee_id, term in mismatched[:20]:
+                self.stderr.write(f"Mismatch in {{'employee_id': {employee_id}, 'term': {term!r}}}")
+            raise CommandError(f"{len(mismatched)} search term(s) do not match the employees.")
+
+        self.stdout.write(self.style.SUCCESS(f"{len(live)} search term(s) match the employees."))
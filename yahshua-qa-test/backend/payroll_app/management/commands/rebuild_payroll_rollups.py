@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from payroll_app.models import PAYROLL_VALUE_FIELDS, PayrollPeriodRollup
+from payroll_app.rollups import ROLLUP_KEY_FIELDS, live_rollup_rows
+from payroll_app.summaries import invalidate_payroll_summary
+
+
+def _rollup_snapshot(rows):
+    """Map rollup key -> (record_count, *values) for every non-empty group."""
+    snapshot = {}
+    for row in rows:
+        if not row['record_count']:
+            continue
+        key = tuple(row[field] for field in ROLLUP_KEY_FIELDS)
+        snapshot[key] = (
+            row['record_count'],
+            *((row[field] or Decimal('0')).quantize(Decimal('0.01')) for field in PAYROLL_VALUE_FIELDS),
+        )
+    return snapshot
+
+
+class Command(BaseCommand):
+    help = "Rebuild PayrollPeriodRollup from PayrollCalculation and verify it against live aggregates."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Only compare the rollup with live aggregates; exit non-zero on mismatch.",
+        )
+
+    def handle(self, *args, check=False, **options):
+        if not check:
+            with transaction.atomic():
+                PayrollPeriodRollup.objects.all().delete()
+                PayrollPeriodRollup.objects.bulk_create(
+                    [PayrollPeriodRollup(**row) for row in live_rollup_rows()],
+                    batch_size=500,
+                )
+            periods = PayrollPeriodRollup.objects.values_list('period_year', 'period_month').distinct()
+            for period_year, period_month in periods:
+                invalidate_payroll_summary(period_year, period_month)
+
+        stored = _rollup_snapshot(PayrollPeriodRollup.objects.values(*ROLLUP_KEY_FIELDS, 'record_count', *PAYROLL_VALUE_FIELDS))
+        live = _rollup_snapshot(live_rollup_rows())
+        mismatched = sorted(key for key in stored.keys() | live.keys() if stored.get(key) != live.get(key))
+        if mismatched:
+            for key in mismatched:
+                self.stderr.write(f"Mismatch in {dict(zip(ROLLUP_KEY_FIELDS, key))}")
+            raise CommandError(f"{len(mismatched)} rollup group(s) do not match live aggregates.")
+
+        self.stdout.write(self.style.SUCCESS(f"{len(live)} rollup group(s) match live aggregates."))
@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from payroll_app.models import YearToDateLedger
+from payroll_app.synthetic import batches
+from payroll_app.ytd import YTD_FIELDS, live_ytd_rows
+
+LEDGER_KEY_FIELDS = ['employee_id', 'year']
+
+
+def _ledger_snapshot(rows):
+    """Map (employee_id, year) -> ledger values for every ledger with payroll months."""
+    snapshot = {}
+    for row in rows:
+        if not row['month_mask']:
+            continue
+        key = tuple(row[field] for field in LEDGER_KEY_FIELDS)
+        snapshot[key] = tuple(
+            (row[field] or Decimal('0')).quantize(Decimal('0.01')) if field != 'month_mask' else row[field]
+            for field in YTD_FIELDS
+        )
+    return snapshot
+
+
+class Command(BaseCommand):
+    help = "Rebuild the year-to-date ledger from PayrollCalculation and verify it against history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Only compare the ledger with payroll history; exit non-zero on mismatch.",
+        )
+
+    def handle(self, *args, check=False, **options):
+        if not check:
+            with transaction.atomic():
+                YearToDateLedger.objects.all().delete()
+                # bulk_create would list a generator in full; insert slice by slice.
+                for batch in batches(live_ytd_rows().iterator(chunk_size=2000), 500):
+                    YearToDateLedger.objects.bulk_create([YearToDateLedger(**row) for row in batch])
+
+        stored = _ledger_snapshot(YearToDateLedger.objects.values(*LEDGER_KEY_FIELDS, *YTD_FIELDS))
+        live = _ledger_snapshot(live_ytd_rows())
+        mismatched = sorted(key for key in stored.keys() | live.keys() if stored.get(key) != live.get(key))
+        if mismatched:
+            for key in mismatched[:20]:
+                self.stderr.write(f"Mismatch in {dict(zip(LEDGER_KEY_FIELDS, key))}")
+            raise CommandError(f"{len(mismatched)} ledger row(s) do not match payroll history.")
+
+        self.stdout.write(self.style.SUCCESS(f"{len(live)} ledger row(s) match payroll history."))
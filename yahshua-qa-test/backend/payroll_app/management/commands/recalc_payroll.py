@@ -0,0 +1,70 @@
+import os
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payroll_app.jobs import map_in_processes
+from payroll_app.recalc import RECALCULATED_FIELDS, recalculate_period, stored_periods
+from payroll_app.ytd import uses_cumulative_withholding
+
+
+def _period(value):
+    try:
+        year, month = (int(part) for part in value.split('-'))
+    except ValueError:
+        raise CommandError(f"Invalid period {value!r}; expected YYYY-MM.")
+    if not 1 <= month <= 12:
+        raise CommandError(f"Invalid month in {value!r}.")
+    return (year, month)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute stored payroll records for a range of periods with the current rate "
+        "tables, writing back only rows whose values changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', required=True, help="First period, YYYY-MM.")
+        parser.add_argument('--to', dest='end', required=True, help="Last period, YYYY-MM.")
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Processes to spread periods across (default: number of CPUs).",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Report changes without writing them.")
+
+    def handle(self, *args, start, end, workers, dry_run, **options):
+        start, end = _period(start), _period(end)
+        if start > end:
+            raise CommandError("--from must not be after --to.")
+
+        periods = stored_periods(start, end)
+        if uses_cumulative_withholding() and workers > 1:
+            self.stderr.write("Cumulative withholding: recalculating periods in order on one worker.")
+            workers = 1
+        started = time.perf_counter()
+        results = map_in_processes(
+            recalculate_period, [(year, month, dry_run) for year, month in periods], workers,
+        )
+        elapsed = time.perf_counter() - started
+
+        field_changes = dict.fromkeys(RECALCULATED_FIELDS, 0)
+        field_deltas = dict.fromkeys(RECALCULATED_FIELDS, Decimal('0.00'))
+        for result in results:
+            year, month = result['period']
+            self.stdout.write(f"{year}-{month:02d}: {result['changed']}/{result['examined']} changed")
+            for field in RECALCULATED_FIELDS:
+                field_changes[field] += result['field_changes'][field]
+                field_deltas[field] += result['field_deltas'][field]
+
+        examined = sum(result['examined'] for result in results)
+        changed = sum(result['changed'] for result in results)
+        verb = "would change" if dry_run else "changed"
+        self.stdout.write(
+            f"{len(periods)} period(s), {examined} record(s) examined, {changed} {verb} "
+            f"in {elapsed:.1f}s on {min(workers, max(len(periods), 1))} worker(s)"
+        )
+        for field in RECALCULATED_FIELDS:
+            if field_changes[field]:
+                self.stdout.write(f"  {field:<20} {field_changes[field]:>8} row(s)  net {field_deltas[field]:+}")
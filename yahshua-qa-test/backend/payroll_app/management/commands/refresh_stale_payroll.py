@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payroll_app.stale import STALE_BATCH_SIZE, refresh_stale_payroll
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute payroll queued as stale by employee salary or employment type changes, "
+        "leaving periods up to PAYROLL_CLOSED_THROUGH untouched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=STALE_BATCH_SIZE,
+                            help="(employee, period) pairs per transaction.")
+        parser.add_argument(
+            '--poll-interval', type=float, default=5.0,
+            help="Seconds to wait between checks of an empty queue.",
+        )
+        parser.add_argument('--once', action='store_true', help="Drain the queue and exit.")
+
+    def handle(self, *args, batch_size, poll_interval, once, **options):
+        while True:
+            stats = refresh_stale_payroll(batch_size)
+            if not stats['claimed']:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+            self.stdout.write(
+                f"{stats['claimed']} queued: {stats['recalculated']} recalculated, "
+                f"{stats['changed']} changed, {stats['closed']} skipped as closed, "
+                f"{stats['skipped']} skipped as rewritten since queued"
+            )
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from payroll_app.synthetic import create_dataset, synthetic_employees
+
+
+def _period(value):
+    try:
+        year, month = (int(part) for part in value.split('-'))
+    except ValueError:
+        raise CommandError(f"Invalid period {value!r}; expected YYYY-MM.")
+    if not 1 <= month <= 12:
+        raise CommandError(f"Invalid month in {value!r}.")
+    return (year, month)
+
+
+def _previous_month():
+    today = timezone.localdate()
+    return (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load reproducible synthetic employees and their payroll history, computed with "
+        "the real calculators, for local load testing and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--years', type=int, default=1, help="Years of monthly payroll history.")
+        parser.add_argument('--until', help="Last payroll period, YYYY-MM (default: last month).")
+        parser.add_argument('--seed', type=int, default=0, help="Same seed, same data.")
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--clear', action='store_true',
+            help="Delete previously seeded employees and their payroll first.",
+        )
+
+    def handle(self, *args, employees, years, until, seed, batch_size, clear, **options):
+        if employees < 1 or years < 1:
+            raise CommandError("--employees and --years must be positive.")
+        last_period = _period(until) if until else _previous_month()
+
+        if synthetic_employees().exists():
+            if not clear:
+                raise CommandError("Synthetic employees already exist; pass --clear to replace them.")
+            deleted, _ = synthetic_employees().delete()
+            call_command('rebuild_payroll_rollups', stdout=self.stdout, stderr=self.stderr)
+            self.stdout.write(f"Deleted {deleted} seeded row(s).")
+
+        started = time.perf_counter()
+        progress = self.stdout.write if options['verbosity'] > 1 else None
+        result = create_dataset(employees, years, seed, last_period, batch_size, progress)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {result['employees']} employee(s) and {result['payroll_records']} payroll record(s) "
+            f"up to {last_period[0]}-{last_period[1]:02d} in {elapsed:.1f}s "
+            f"({result['payroll_records'] / elapsed:,.0f} records/s)."
+        ))
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateTableVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('effective_from', models.DateField(unique=True)),
+                ('data', models.JSONField()),
+                ('notes', models.CharField(blank=True, max_length=200)),
+                ('published_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-effective_from'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll_app', '0002_ratetableversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['last_name', 'first_name'], name='employee_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payrollcalculation',
+            index=models.Index(fields=['employee', 'period_year', 'period_month', 'created_at', 'id'], name='payroll_employee_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payrollcalculation',
+            index=models.Index(fields=['period_year', 'period_month', 'created_at', 'id'], name='payroll_period_idx'),
+        ),
+    ]
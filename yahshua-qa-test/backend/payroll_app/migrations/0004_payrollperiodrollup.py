@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll_app', '0003_history_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollPeriodRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_year', models.IntegerField()),
+                ('period_month', models.IntegerField()),
+                ('department', models.CharField(max_length=100)),
+                ('employment_type', models.CharField(max_length=20)),
+                ('record_count', models.IntegerField(default=0)),
+                ('basic_salary', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('sss_employee', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('sss_employer', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('philhealth_employee', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('philhealth_employer', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('pagibig_employee', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('pagibig_employer', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('income_tax', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('total_deductions', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('net_pay', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+            ],
+            options={
+                'ordering': ['-period_year', '-period_month', 'department', 'employment_type'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='payrollperiodrollup',
+            constraint=models.UniqueConstraint(fields=('period_year', 'period_month', 'department', 'employment_type'), name='unique_rollup_period_group'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll_app', '0006_payrollcalculation_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YearToDateLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('gross', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('contributions', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('tax_withheld', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('month_mask', models.IntegerField(default=0)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ytd_ledger', to='payroll_app.employee')),
+            ],
+            options={
+                'ordering': ['employee', '-year'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='yeartodateledger',
+            constraint=models.UniqueConstraint(fields=('employee', 'year'), name='unique_ytd_employee_year'),
+        ),
+    ]
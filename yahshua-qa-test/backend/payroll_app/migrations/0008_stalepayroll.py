@@ -0,0 +1,30 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll_app', '0007_yeartodateledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StalePayroll',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_year', models.IntegerField()),
+                ('period_month', models.IntegerField()),
+                ('queued_at', models.DateTimeField()),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stale_payroll', to='payroll_app.employee')),
+            ],
+            options={
+                'ordering': ['period_year', 'period_month', 'pk'],
+                'indexes': [models.Index(fields=['period_year', 'period_month'], name='stale_payroll_period_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stalepayroll',
+            constraint=models.UniqueConstraint(fields=('employee', 'period_year', 'period_month'), name='unique_stale_payroll'),
+        ),
+    ]
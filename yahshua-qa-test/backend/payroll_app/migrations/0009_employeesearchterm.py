@@ -0,0 +1,28 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll_app', '0008_stalepayroll'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('employee', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='payroll_app.employee')),
+            ],
+            options={
+                'ordering': ['term', 'employee'],
+                'indexes': [models.Index(fields=['employee', 'term'], name='search_term_employee_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='employeesearchterm',
+            constraint=models.UniqueConstraint(fields=('term', 'employee'), name='unique_employee_search_term'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll_app', '0009_employeesearchterm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stalepayroll',
+            name='queued_salary',
+            field=models.DecimalField(decimal_places=2, max_digits=12, null=True),
+        ),
+    ]
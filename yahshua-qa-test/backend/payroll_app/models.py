@@ -1,5 +1,8 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from .calculations.rate_tables import BUILTIN_RATE_DATA, compile_rate_table, merge_rate_data
+
 
 class Employee(models.Model):
     EMPLOYMENT_TYPE_CHOICES = [
@@ -26,15 +29,78 @@ class Employee(models.Model):
 
     class Meta:
         ordering = ['last_name', 'first_name']
+        indexes = [
+            # employee_list: active employees ordered by name.
+            models.Index(
+                fields=['last_name', 'first_name'],
+                condition=models.Q(is_active=True),
+                name='employee_active_name_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded values so save() listeners can tell what changed.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields}
+
+    def loaded_value(self, field_name):
+        """Return `field_name` as it was last loaded or saved (None for new instances)."""
+        return getattr(self, '_loaded_values', {}).get(field_name)
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
 
+class EmployeeSearchTerm(models.Model):
+    """
+    One normalized word of an employee's name or email address.
+
+    Maintained by payroll_app.search on every employee write; rebuild and
+    verify with `manage.py rebuild_employee_search`.
+    """
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name='search_terms',
+        db_index=False,  # search_term_employee_idx starts with it
+    )
+    term = models.CharField(max_length=100)
+
+    class Meta:
+        ordering = ['term', 'employee']
+        constraints = [
+            # Also the index behind prefix searches: a range scan on term that
+            # yields employee ids without touching the table.
+            models.UniqueConstraint(fields=['term', 'employee'], name='unique_employee_search_term'),
+        ]
+        indexes = [
+            # Whether one employee has a term in a range, for common words.
+            models.Index(fields=['employee', 'term'], name='search_term_employee_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} - {self.employee_id}"
+
+
+# Columns computed from the basic salary (see services.compute_payroll_values).
+PAYROLL_VALUE_FIELDS = [
+    'basic_salary',
+    'sss_employee', 'sss_employer',
+    'philhealth_employee', 'philhealth_employer',
+    'pagibig_employee', 'pagibig_employer',
+    'income_tax',
+    'total_deductions', 'net_pay',
+]
+
+
 class PayrollCalculation(models.Model):
     employee = models.ForeignKey(
         Employee,
@@ -59,10 +125,218 @@ class PayrollCalculation(models.Model):
     net_pay = models.DecimalField(max_digits=12, decimal_places=2)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bulk writers must include this in update_fields / set it themselves;
+    # HTTP ETags for payroll history are derived from it.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-period_year', '-period_month', '-created_at']
-        unique_together = ['employee', 'period_month', 'period_year']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['employee', 'period_month', 'period_year'],
+                name='unique_employee_period',
+            ),
+        ]
+        indexes = [
+            # payroll_history ordering, scanned backwards, with and without an
+            # employee filter.
+            models.Index(
+                fields=['employee', 'period_year', 'period_month', 'created_at', 'id'],
+                name='payroll_employee_period_idx',
+            ),
+            models.Index(
+                fields=['period_year', 'period_month', 'created_at', 'id'],
+                name='payroll_period_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.period_month}/{self.period_year}"
+
+
+class PayrollPeriodRollup(models.Model):
+    """
+    Running payroll totals for one period, department and employment type.
+
+    Maintained incrementally by payroll_app.rollups; rebuild and verify with
+    `manage.py rebuild_payroll_rollups`.
+    """
+    period_year = models.IntegerField()
+    period_month = models.IntegerField()
+    department = models.CharField(max_length=100)
+    employment_type = models.CharField(max_length=20)
+
+    record_count = models.IntegerField(default=0)
+    basic_salary = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    sss_employee = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    sss_employer = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    philhealth_employee = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    philhealth_employer = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    pagibig_employee = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    pagibig_employer = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    income_tax = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    total_deductions = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    net_pay = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ['-period_year', '-period_month', 'department', 'employment_type']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['period_year', 'period_month', 'department', 'employment_type'],
+                name='unique_rollup_period_group',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.department} / {self.employment_type} - {self.period_month}/{self.period_year}"
+
+
+class YearToDateLedger(models.Model):
+    """
+    One employee's payroll totals for one calendar year.
+
+    Maintained incrementally by payroll_app.ytd whenever a period is
+    computed, replaced or deleted, so cumulative withholding can read the
+    year so far without summing history. Rebuild and verify with
+    `manage.py rebuild_ytd_ledger`.
+    """
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='ytd_ledger')
+    year = models.IntegerField()
+    gross = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    # Employee shares of SSS, PhilHealth and Pag-IBIG.
+    contributions = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    tax_withheld = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    # Months with a payroll record, as the sum of 2 ** (month - 1). Each
+    # month occurs at most once, so the mask is maintained by addition.
+    month_mask = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['employee', '-year']
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'year'], name='unique_ytd_employee_year'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee} - {self.year}"
+
+
+class PayrollRun(models.Model):
+    """
+    A background payroll run for one period, executed by `manage.py payroll_worker`.
+
+    Progress counters are updated by the worker after every chunk, so
+    clients poll this row instead of holding a request open. Each update also
+    renews `heartbeat_at`; a running run whose heartbeat is older than
+    PAYROLL_RUN_LEASE_TIMEOUT belonged to a worker that died and is claimed
+    again (`attempts` counts the claims).
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_CANCELLED, 'Cancelled'),
+    ]
+    FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED, STATUS_CANCELLED)
+
+    period_month = models.IntegerField()
+    period_year = models.IntegerField()
+    department = models.CharField(max_length=100, blank=True)
+    employment_type = models.CharField(max_length=20, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    cancel_requested = models.BooleanField(default=False)
+    total_employees = models.IntegerField(default=0)
+    processed_employees = models.IntegerField(default=0)
+    created_records = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    attempts = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # payroll_worker claims the oldest queued run.
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(status='queued'),
+                name='payroll_run_queued_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Payroll run {self.period_month}/{self.period_year} ({self.status})"
+
+
+class StalePayroll(models.Model):
+    """
+    An (employee, period) whose stored PayrollCalculation no longer matches
+    the employee's pay inputs.
+
+    Queued by payroll_app.stale when an employee's salary or employment type
+    changes, for every open period whose payroll was computed from the
+    employee's previous salary, and cleared
+    by `manage.py refresh_stale_payroll`. One row per pair, so repeated edits
+    before the worker runs coalesce into one recalculation.
+    """
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='stale_payroll')
+    period_year = models.IntegerField()
+    period_month = models.IntegerField()
+    # The row's basic salary when queued; a row rewritten since (e.g. with an
+    # override salary) is left alone. Null for pairs queued before it was
+    # recorded, which are recomputed regardless.
+    queued_salary = models.DecimalField(max_digits=12, decimal_places=2, null=True)
+    # Bumped when the pair is queued again, so a worker that claimed the
+    # earlier change does not drop the later one.
+    queued_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['period_year', 'period_month', 'pk']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['employee', 'period_year', 'period_month'], name='unique_stale_payroll',
+            ),
+        ]
+        indexes = [
+            # The worker claims the oldest periods first.
+            models.Index(fields=['period_year', 'period_month'], name='stale_payroll_period_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.period_month}/{self.period_year}"
+
+
+class RateTableVersion(models.Model):
+    """
+    SSS / PhilHealth / Pag-IBIG / tax rates in force from `effective_from`.
+
+    `data` uses the section layout documented in calculations/rate_tables.py;
+    sections left out are inherited from the previous version.
+    """
+    effective_from = models.DateField(unique=True)
+    data = models.JSONField()
+    notes = models.CharField(max_length=200, blank=True)
+    published_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-effective_from']
+
+    def __str__(self):
+        return f"Rates effective {self.effective_from}"
+
+    def clean(self):
+        if not isinstance(self.data, dict):
+            raise ValidationError({'data': 'Rate data must be an object keyed by section.'})
+        try:
+            compile_rate_table(self.effective_from, merge_rate_data(BUILTIN_RATE_DATA, self.data))
+        except (KeyError, TypeError, ValueError, ArithmeticError) as exc:
+            raise ValidationError({'data': f'Invalid rate data: {exc}'})
@@ -0,0 +1,79 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is the url-safe base64 JSON of the ordering values of the last row
+on a page. The next page is everything strictly after that row in the
+queryset's ordering, so each page costs one indexed range scan no matter how
+deep the client has paged.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+PAYROLL_HISTORY_KEYSET = ('period_year', 'period_month', 'created_at', 'id')
+EMPLOYEE_SEARCH_KEYSET = ('last_name', 'first_name', 'id')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values) -> str:
+    payload = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_payroll_history_cursor(cursor: str) -> list:
+    """Decode a payroll history cursor into [year, month, created_at, id]."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        year, month, created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = parse_datetime(created_at)
+        if created_at is None or not all(isinstance(v, int) for v in (year, month, pk)):
+            raise InvalidCursor(cursor)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+    return [year, month, created_at, pk]
+
+
+def decode_employee_search_cursor(cursor: str) -> list:
+    """Decode an employee search cursor into [last_name, first_name, id]."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        last_name, first_name, pk = json.loads(base64.urlsafe_b64decode(padded))
+        if not (isinstance(last_name, str) and isinstance(first_name, str) and isinstance(pk, int)):
+            raise InvalidCursor(cursor)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+    return [last_name, first_name, pk]
+
+
+def _keyset_after(fields, values, lookup) -> Q:
+    condition = Q()
+    for i, field in enumerate(fields):
+        step = Q(**{f'{field}__{lookup}': values[i]})
+        for prefix_field, prefix_value in zip(fields[:i], values[:i]):
+            step &= Q(**{prefix_field: prefix_value})
+        condition |= step
+    return condition
+
+
+def keyset_after_descending(fields, values) -> Q:
+    """
+    Filter for rows that sort strictly after `values` when ordered by
+    `fields`, all descending.
+    """
+    return _keyset_after(fields, values, 'lt')
+
+
+def keyset_after_ascending(fields, values) -> Q:
+    """
+    Filter for rows that sort strictly after `values` when ordered by
+    `fields`, all ascending.
+    """
+    return _keyset_after(fields, values, 'gt')
@@ -0,0 +1,73 @@
+"""
+Rate table registry.
+
+Keeps every published rate table version compiled in process, sorted by
+effective date, so picking the rates for a payroll period is a binary search
+with no database access. The registry is rebuilt on first use, whenever a
+`RateTableVersion` is saved or deleted in this process (see signals.py), and
+at most every PAYROLL_RATE_TABLE_CACHE_TIMEOUT seconds so other worker
+processes pick up newly published versions.
+"""
+
+import time
+from bisect import bisect_right
+from datetime import date
+
+from django.conf import settings
+
+from .models import RateTableVersion
+from .calculations.rate_tables import (
+    BUILTIN_EFFECTIVE_FROM,
+    BUILTIN_RATE_DATA,
+    BUILTIN_RATE_TABLE,
+    compile_rate_table,
+    merge_rate_data,
+)
+
+
+_registry = None  # (loaded_at, effective_dates, tables)
+
+
+def _build_registry():
+    versions = sorted(
+        [(BUILTIN_EFFECTIVE_FROM, None)]
+        + [(v.effective_from, v.data) for v in RateTableVersion.objects.all()],
+        key=lambda entry: (entry[0], entry[1] is not None),
+    )
+
+    data = BUILTIN_RATE_DATA
+    tables = []
+    for effective_from, overrides in versions:
+        if overrides is None:
+            tables.append(BUILTIN_RATE_TABLE)
+            continue
+        data = merge_rate_data(data, overrides)
+        tables.append(compile_rate_table(effective_from, data))
+
+    return (time.monotonic(), [t.effective_from for t in tables], tables)
+
+
+def _get_registry():
+    global _registry
+    timeout = getattr(settings, 'PAYROLL_RATE_TABLE_CACHE_TIMEOUT', 300)
+    registry = _registry
+    if registry is None or (timeout is not None and time.monotonic() - registry[0] > timeout):
+        registry = _registry = _build_registry()
+    return registry
+
+
+def invalidate_rate_tables():
+    """Drop the compiled registry; the next lookup reloads it."""
+    global _registry
+    _registry = None
+
+
+def get_rate_table(period_year: int, period_month: int):
+    """
+    Return the RateTable in force for a payroll period.
+
+    Periods before the earliest known version use the earliest version.
+    """
+    _, effective_dates, tables = _get_registry()
+    index = bisect_right(effective_dates, date(period_year, period_month, 1)) - 1
+    return tables[max(index, 0)]
@@ -0,0 +1,130 @@
+"""
+Recalculation of stored payroll records after a rate correction.
+
+Each period is recomputed independently from the stored basic salaries with
+the period's rate table and the vectorized calculators, so periods can be
+spread across processes (see `manage.py recalc_payroll`). Only rows whose
+values changed are written, in batched `bulk_update`s, and the period rollup
+and year-to-date ledger are adjusted by the difference.
+
+Under cumulative withholding a month's tax depends on the months before it,
+so periods must then be recalculated in order, one at a time.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from .calculations.batch import calculate_deductions_batch, from_centavos, to_centavos
+from .models import PAYROLL_VALUE_FIELDS, PayrollCalculation
+from .rates import get_rate_table
+from .rollups import RollupDelta
+from .summaries import invalidate_payroll_summary
+from .ytd import YearToDateDelta, prior_months, uses_cumulative_withholding, with_cumulative_withholding
+
+RECALC_CHUNK_SIZE = 2000
+
+# Everything except basic_salary, which is an input rather than a result.
+RECALCULATED_FIELDS = PAYROLL_VALUE_FIELDS[1:]
+
+
+def stored_periods(start, end) -> list:
+    """(year, month) pairs between `start` and `end` (inclusive) that have payroll records."""
+    periods = (
+        PayrollCalculation.objects.order_by('period_year', 'period_month')
+        .values_list('period_year', 'period_month')
+        .distinct()
+    )
+    return [period for period in periods if start <= period <= end]
+
+
+def recalculate_period(period_year, period_month, dry_run=False, chunk_size=RECALC_CHUNK_SIZE) -> dict:
+    """
+    Recompute every record of one period and write back the changed ones.
+
+    Each chunk is committed on its own, together with its rollup and ledger
+    deltas, so the database write lock is held per chunk rather than for the
+    whole period; an interrupted period can simply be recalculated again.
+
+    Returns:
+        dict with the period, rows examined and changed, how many rows
+        changed per field, and the net change of each field
+    """
+    rates = get_rate_table(period_year, period_month)
+    cumulative = uses_cumulative_withholding()
+    records = PayrollCalculation.objects.filter(period_year=period_year, period_month=period_month)
+    stats = {
+        'period': (period_year, period_month),
+        'examined': 0,
+        'changed': 0,
+        'field_changes': dict.fromkeys(RECALCULATED_FIELDS, 0),
+        'field_deltas': dict.fromkeys(RECALCULATED_FIELDS, Decimal('0.00')),
+    }
+
+    last_pk = 0
+    try:
+        while last_pk is not None:
+            with transaction.atomic():
+                last_pk = _recalculate_chunk(records, last_pk, chunk_size, rates, cumulative, stats, dry_run)
+    finally:
+        if stats['changed'] and not dry_run:
+            # bulk_update does not send post_save, so drop cached summaries here.
+            invalidate_payroll_summary(period_year, period_month)
+    return stats
+
+
+def _recalculate_chunk(records, last_pk, chunk_size, rates, cumulative, stats, dry_run):
+    """
+    Recompute the next `chunk_size` records after `last_pk`, adding to
+    `stats`. Returns the last primary key read, or None when none are left.
+    """
+    period_year, period_month = stats['period']
+    rows = list(
+        records.filter(pk__gt=last_pk).order_by('pk').values_list(
+            'pk', 'employee_id', 'employee__department', 'employee__employment_type',
+            *PAYROLL_VALUE_FIELDS,
+        )[:chunk_size]
+    )
+    if not rows:
+        return None
+    stats['examined'] += len(rows)
+
+    deductions = calculate_deductions_batch(to_centavos(row[4] for row in rows), rates)
+    columns = {field: from_centavos(values) for field, values in deductions.items()}
+    if cumulative:
+        prior = prior_months(
+            [row[1] for row in rows], period_year, period_month,
+            {row[1]: dict(zip(PAYROLL_VALUE_FIELDS, row[4:])) for row in rows},
+        )
+
+    now = timezone.now()
+    changed = []
+    delta = RollupDelta()
+    ytd = YearToDateDelta()
+    for i, (pk, employee_id, department, employment_type, *stored) in enumerate(rows):
+        old = dict(zip(PAYROLL_VALUE_FIELDS, stored))
+        new = {'basic_salary': old['basic_salary'], **{f: columns[f][i] for f in RECALCULATED_FIELDS}}
+        if cumulative:
+            new = with_cumulative_withholding(new, period_month, prior[employee_id], rates)
+        fields = [field for field in RECALCULATED_FIELDS if new[field] != old[field]]
+        if not fields:
+            continue
+        for field in fields:
+            stats['field_changes'][field] += 1
+            stats['field_deltas'][field] += new[field] - old[field]
+        key = (period_year, period_month, department, employment_type)
+        delta.remove(key, old)
+        delta.add(key, new)
+        ytd.remove(employee_id, period_year, period_month, old)
+        ytd.add(employee_id, period_year, period_month, new)
+        changed.append(PayrollCalculation(pk=pk, updated_at=now, **new))
+
+    stats['changed'] += len(changed)
+    if changed and not dry_run:
+        PayrollCalculation.objects.bulk_update(
+            changed, [*RECALCULATED_FIELDS, 'updated_at'], batch_size=500,
+        )
+        delta.apply()
+        ytd.apply()
+    return rows[-1][0]
@@ -0,0 +1,103 @@
+"""
+Incremental maintenance of PayrollPeriodRollup.
+
+Every write path that changes PayrollCalculation rows collects the change in
+a RollupDelta (subtract the old row, add the new one) and applies it with one
+F() update per touched (period, department, employment type) group, so the
+rollup never has to rescan the payroll table.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, F, Sum
+
+from .models import PAYROLL_VALUE_FIELDS, PayrollCalculation, PayrollPeriodRollup
+
+
+ROLLUP_KEY_FIELDS = ['period_year', 'period_month', 'department', 'employment_type']
+
+
+class RollupDelta:
+    """Signed per-group changes to PayrollPeriodRollup, accumulated in memory."""
+
+    def __init__(self):
+        self._deltas = defaultdict(lambda: defaultdict(Decimal))
+
+    def add(self, key, values, records=1, sign=1):
+        """Add `values` (the sums of `records` payroll rows) to group `key`."""
+        delta = self._deltas[tuple(key)]
+        delta['record_count'] += sign * records
+        for field in PAYROLL_VALUE_FIELDS:
+            delta[field] += sign * Decimal(str(values[field]))
+
+    def remove(self, key, values, records=1):
+        self.add(key, values, records, sign=-1)
+
+    def apply(self):
+        """Write the accumulated deltas and reset."""
+        changed = {
+            key: {
+                field: int(amount) if field == 'record_count' else amount
+                for field, amount in delta.items() if amount
+            }
+            for key, delta in self._deltas.items()
+        }
+        # Rows are written in key order so that concurrent writers (parallel
+        # run shards) lock them in the same order and cannot deadlock.
+        changed = sorted(((key, delta) for key, delta in changed.items() if delta), key=lambda item: item[0])
+        self._deltas.clear()
+        if not changed:
+            return
+
+        PayrollPeriodRollup.objects.bulk_create(
+            [PayrollPeriodRollup(**dict(zip(ROLLUP_KEY_FIELDS, key))) for key, _ in changed],
+            ignore_conflicts=True,
+        )
+        for key, delta in changed:
+            PayrollPeriodRollup.objects.filter(**dict(zip(ROLLUP_KEY_FIELDS, key))).update(
+                **{field: F(field) + amount for field, amount in delta.items()}
+            )
+
+
+def move_employee_rollups(employee_id, old_group, new_group):
+    """
+    Move an employee's payroll totals between (department, employment_type)
+    groups after the employee changes department or employment type.
+
+    Returns:
+        list of (period_year, period_month) pairs that were touched
+    """
+    aggregates = {field: Sum(field) for field in PAYROLL_VALUE_FIELDS}
+    aggregates['record_count'] = Count('id')
+    periods = (
+        PayrollCalculation.objects.filter(employee_id=employee_id)
+        .order_by()
+        .values('period_year', 'period_month')
+        .annotate(**aggregates)
+    )
+
+    delta = RollupDelta()
+    touched = []
+    for row in periods:
+        period = (row['period_year'], row['period_month'])
+        delta.remove((*period, *old_group), row, records=row['record_count'])
+        delta.add((*period, *new_group), row, records=row['record_count'])
+        touched.append(period)
+    delta.apply()
+    return touched
+
+
+def live_rollup_rows():
+    """Aggregate PayrollCalculation into rollup-shaped dicts straight from the table."""
+    aggregates = {field: Sum(field) for field in PAYROLL_VALUE_FIELDS}
+    aggregates['record_count'] = Count('id')
+    return (
+        PayrollCalculation.objects.order_by()
+        .values(
+            'period_year', 'period_month',
+            department=F('employee__department'),
+            employment_type=F('employee__employment_type'),
+        )
+        .annotate(**aggregates)
+    )
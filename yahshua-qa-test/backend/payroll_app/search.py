@@ -0,0 +1,115 @@
+"""
+Employee search.
+
+Every word of an employee's first name, last name and email address is kept
+as an EmployeeSearchTerm: case-folded, accents stripped, and reduced to the
+ASCII letters and digits. A search word matches the employees having a term
+that starts with it. Because terms use only [0-9a-z], "starts with" is the
+range  word <= term < successor(word)  ("ana" -> "anb", "az" -> "b"), which
+orders the same way under SQLite's binary collation and PostgreSQL's locale
+collations, so the (term, employee) unique index answers it with a range
+scan on either backend, where `icontains` (the admin's default search)
+would scan the whole table with LIKE '%...%'.
+
+Search results are ordered by name, so how a word is applied depends on how
+common it is. A rare word's matching employee ids are collected from the
+term index and the few rows sorted. A common one ("a", "s") would make that
+sort most of the table, so employees are walked in name order instead, each
+probed for a matching term, and the page fills within the first few hundred
+rows.
+
+Terms are maintained on save (see signals) and by the bulk writers, which
+call `index_employees` after `bulk_create`.
+"""
+
+import re
+import unicodedata
+
+from django.db.models import Exists, OuterRef
+
+from .models import Employee, EmployeeSearchTerm
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'email')
+TERM_MAX_LENGTH = EmployeeSearchTerm._meta.get_field('term').max_length
+MAX_QUERY_WORDS = 5
+# Beyond this many matching terms a word is probed per employee in name order
+# rather than collected; about where the two cost the same on SQLite.
+DENSE_WORD_TERMS = 10_000
+SEARCH_INDEX_BATCH_SIZE = 500  # employees per DELETE; below SQLite's parameter limit
+
+_WORD = re.compile(r'[0-9a-z]+')
+_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def normalize_words(text) -> list:
+    """Split `text` into search words: 'José Dela-Cruz' -> ['jose', 'dela', 'cruz']."""
+    folded = unicodedata.normalize('NFKD', text.casefold())
+    return [word[:TERM_MAX_LENGTH] for word in _WORD.findall(folded.encode('ascii', 'ignore').decode())]
+
+
+def employee_terms(first_name, last_name, email) -> set:
+    return {word for text in (first_name, last_name, email) for word in normalize_words(text)}
+
+
+def search_fields_changed(employee) -> bool:
+    """Whether a saved employee's searchable fields differ from the values it was loaded with."""
+    return any(employee.loaded_value(field) != getattr(employee, field) for field in SEARCH_FIELDS)
+
+
+def index_employees(employees, created=False) -> int:
+    """
+    Replace the search terms of saved `employees`; `created` skips deleting
+    the old terms of employees that were just inserted.
+
+    Returns:
+        the number of terms written
+    """
+    employees = list(employees)
+    if not created:
+        for start in range(0, len(employees), SEARCH_INDEX_BATCH_SIZE):
+            batch = [employee.pk for employee in employees[start:start + SEARCH_INDEX_BATCH_SIZE]]
+            EmployeeSearchTerm.objects.filter(employee_id__in=batch).delete()
+    terms = [
+        EmployeeSearchTerm(employee_id=employee.pk, term=term)
+        for employee in employees
+        for term in employee_terms(employee.first_name, employee.last_name, employee.email)
+    ]
+    EmployeeSearchTerm.objects.bulk_create(terms, batch_size=SEARCH_INDEX_BATCH_SIZE)
+    return len(terms)
+
+
+def live_search_terms():
+    """Yield the (employee_id, term) pairs the current employee rows call for."""
+    rows = Employee.objects.order_by('pk').values_list('pk', *SEARCH_FIELDS).iterator(chunk_size=2000)
+    for pk, *fields in rows:
+        for term in employee_terms(*fields):
+            yield pk, term
+
+
+def _successor(prefix):
+    """The first string after every string starting with `prefix`, or None when there is none."""
+    stem = prefix.rstrip('z')
+    if not stem:
+        return None
+    return stem[:-1] + _ALPHABET[_ALPHABET.index(stem[-1]) + 1]
+
+
+def search_employees(queryset, query):
+    """
+    Narrow an Employee `queryset` to those matching every word of `query`
+    (up to MAX_QUERY_WORDS) as a prefix of one of their search terms.
+
+    Costs one short index read per word to tell common words from rare ones
+    (see module docstring).
+    """
+    words = list(dict.fromkeys(normalize_words(query)))[:MAX_QUERY_WORDS]
+    for word in words:
+        terms = EmployeeSearchTerm.objects.filter(term__gte=word)
+        upper = _successor(word)
+        if upper is not None:
+            terms = terms.filter(term__lt=upper)
+        if terms.order_by()[DENSE_WORD_TERMS:].exists():
+            queryset = queryset.filter(Exists(terms.filter(employee=OuterRef('pk'))))
+        else:
+            queryset = queryset.filter(pk__in=terms.values('employee_id'))
+    return queryset
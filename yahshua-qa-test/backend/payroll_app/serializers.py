@@ -1,5 +1,12 @@
+from decimal import Decimal
+
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Employee, PayrollCalculation
+from .disbursements import BANK_FILE_LAYOUTS
+from .models import PAYROLL_VALUE_FIELDS, Employee, PayrollCalculation, PayrollRun
+from .simulation import SIMULATION_MAX_ENTRIES
 
 
 class EmployeeSerializer(serializers.ModelSerializer):
@@ -16,6 +23,12 @@ class EmployeeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class EmployeeImportSerializer(EmployeeSerializer):
+    # Email uniqueness is checked once per import batch (employee_io), not
+    # with a query per row.
+    email = serializers.EmailField(max_length=254)
+
+
 class PayrollCalculationSerializer(serializers.ModelSerializer):
     employee_name = serializers.SerializerMethodField()
     employee_id = serializers.IntegerField(source='employee.id', read_only=True)
@@ -39,6 +52,71 @@ class PayrollCalculationSerializer(serializers.ModelSerializer):
         return obj.employee.full_name
 
 
+class EmployeeSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200, required=False, allow_blank=True, trim_whitespace=False)
+    department = serializers.CharField(max_length=100, required=False)
+    employment_type = serializers.ChoiceField(choices=Employee.EMPLOYMENT_TYPE_CHOICES, required=False)
+    salary_min = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0'), required=False)
+    salary_max = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0'), required=False)
+    page_size = serializers.IntegerField(min_value=1, required=False)
+    cursor = serializers.CharField(required=False)
+
+    def validate(self, data):
+        low, high = data.get('salary_min'), data.get('salary_max')
+        if low is not None and high is not None and low > high:
+            raise serializers.ValidationError({'salary_max': 'Must not be less than salary_min.'})
+        return data
+
+
+class PayrollSummaryQuerySerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=2000, max_value=2100)
+    month = serializers.IntegerField(min_value=1, max_value=12, required=False)
+    group_by = serializers.ChoiceField(choices=['department', 'employment_type'], required=False)
+
+
+# ---------------------------------------------------------------------------
+# Fast read path
+# ---------------------------------------------------------------------------
+#
+# Produces the same dicts as PayrollCalculationSerializer(many=True).data from
+# `.values_list()` rows, skipping DRF's per-field machinery and model instances.
+
+PAYROLL_FIELDS = PayrollCalculationSerializer.Meta.fields
+
+
+def payroll_rows(queryset):
+    """Select the columns PayrollCalculationSerializer outputs, in its field order."""
+    return queryset.annotate(
+        employee_name=Concat(
+            'employee__first_name', Value(' '), 'employee__last_name',
+            output_field=CharField(),
+        ),
+    ).values_list(*PAYROLL_FIELDS)
+
+
+def _datetime_representation(value):
+    # Same output as DRF's DateTimeField with the ISO 8601 default format.
+    if value is None:
+        return None
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def serialize_payroll_row(values) -> dict:
+    """Convert one `payroll_rows` tuple to its API representation."""
+    row = dict(zip(PAYROLL_FIELDS, values))
+    for field in PAYROLL_VALUE_FIELDS:
+        row[field] = '{:f}'.format(row[field])
+    row['created_at'] = _datetime_representation(row['created_at'])
+    return row
+
+
+def serialize_payroll_rows(queryset) -> list:
+    return [serialize_payroll_row(values) for values in payroll_rows(queryset)]
+
+
 class PayrollCalculateRequestSerializer(serializers.Serializer):
     employee_id = serializers.IntegerField()
     period_month = serializers.IntegerField(min_value=1, max_value=12)
@@ -46,3 +124,47 @@ class PayrollCalculateRequestSerializer(serializers.Serializer):
     override_salary = serializers.DecimalField(
         max_digits=12, decimal_places=2, required=False, allow_null=True
     )
+
+
+class SimulationRequestSerializer(serializers.Serializer):
+    period_month = serializers.IntegerField(min_value=1, max_value=12)
+    period_year = serializers.IntegerField(min_value=2000, max_value=2100)
+    # Entries are validated in payroll_app.simulation, far faster than a
+    # nested serializer per entry.
+    entries = serializers.ListField(allow_empty=False, max_length=SIMULATION_MAX_ENTRIES)
+
+
+class DisbursementQuerySerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=2000, max_value=2100)
+    month = serializers.IntegerField(min_value=1, max_value=12)
+    layout = serializers.ChoiceField(choices=BANK_FILE_LAYOUTS, default='csv')
+
+
+class PayrollRunRequestSerializer(serializers.Serializer):
+    period_month = serializers.IntegerField(min_value=1, max_value=12)
+    period_year = serializers.IntegerField(min_value=2000, max_value=2100)
+    department = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    employment_type = serializers.ChoiceField(
+        choices=Employee.EMPLOYMENT_TYPE_CHOICES, required=False, allow_blank=True
+    )
+    background = serializers.BooleanField(default=False)
+
+
+class PayrollRunSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PayrollRun
+        fields = [
+            'id', 'period_month', 'period_year', 'department', 'employment_type',
+            'status', 'cancel_requested', 'total_employees', 'processed_employees',
+            'created_records', 'progress', 'error', 'attempts', 'created_at', 'started_at', 'heartbeat_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        """Fraction of employees processed, 0.0 - 1.0."""
+        if not obj.total_employees:
+            return 1.0 if obj.status == PayrollRun.STATUS_SUCCEEDED else 0.0
+        return round(min(obj.processed_employees / obj.total_employees, 1.0), 4)
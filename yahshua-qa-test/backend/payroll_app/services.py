@@ -0,0 +1,303 @@
+"""
+Payroll computation services shared by the API views.
+
+`compute_payroll_values` turns a basic salary into the deduction and net pay
+columns of a `PayrollCalculation`. `run_payroll_period` applies it to every
+active employee for one period without a request per employee.
+"""
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+
+from .instrumentation import span
+from .models import PAYROLL_VALUE_FIELDS, Employee, PayrollCalculation
+from .rates import get_rate_table
+from .rollups import RollupDelta
+from .summaries import invalidate_payroll_summary
+from .ytd import YearToDateDelta, prior_months, uses_cumulative_withholding, with_cumulative_withholding
+from .calculations.tax_calculator import calculate_monthly_withholding_tax
+from .calculations.sss_calculator import calculate_sss
+from .calculations.philhealth_calculator import calculate_philhealth, calculate_pagibig
+from .calculations.batch import calculate_deductions_batch, from_centavos, to_centavos
+from .calculations.rate_tables import BUILTIN_RATE_TABLE
+from .calculations.cache import DeductionCache
+
+
+RUN_CHUNK_SIZE = 1000
+
+# Columns totalled in a run summary.
+RUN_TOTAL_FIELDS = ['basic_salary', 'total_deductions', 'net_pay']
+
+deduction_cache = DeductionCache(
+    maxsize=settings.PAYROLL_DEDUCTION_CACHE_SIZE,
+    shared=(
+        caches[settings.PAYROLL_DEDUCTION_CACHE_BACKEND]
+        if settings.PAYROLL_DEDUCTION_CACHE_BACKEND else None
+    ),
+)
+
+
+def compute_payroll_values(basic_salary: Decimal, rates=BUILTIN_RATE_TABLE) -> dict:
+    """
+    Compute the deduction and net pay columns for a monthly basic salary.
+
+    `rates` is the RateTable for the payroll period (see rates.get_rate_table).
+    Results are memoized per (salary, rate table version) in deduction_cache.
+
+    Returns:
+        dict keyed by the `PayrollCalculation` field names in PAYROLL_VALUE_FIELDS
+    """
+    values = deduction_cache.get_or_compute(
+        DeductionCache.make_key(basic_salary, rates.version),
+        lambda: _compute_deductions(basic_salary, rates),
+    )
+    return {'basic_salary': basic_salary, **values}
+
+
+def _compute_deductions(basic_salary, rates) -> dict:
+    with span('calc.sss'):
+        sss = calculate_sss(basic_salary, rates.sss)
+    with span('calc.philhealth'):
+        philhealth = calculate_philhealth(basic_salary, rates.philhealth)
+    with span('calc.pagibig'):
+        pagibig = calculate_pagibig(basic_salary, rates.pagibig)
+    with span('calc.tax'):
+        income_tax = calculate_monthly_withholding_tax(basic_salary, rates.tax)
+
+    total_deductions = (
+        sss['employee']
+        + philhealth['employee']
+        + pagibig['employee']
+        + income_tax
+    )
+    net_pay = Decimal(str(basic_salary)) - total_deductions
+
+    return {
+        'sss_employee': sss['employee'],
+        'sss_employer': sss['employer'],
+        'philhealth_employee': philhealth['employee'],
+        'philhealth_employer': philhealth['employer'],
+        'pagibig_employee': pagibig['employee'],
+        'pagibig_employer': pagibig['employer'],
+        'income_tax': income_tax,
+        'total_deductions': total_deductions,
+        'net_pay': net_pay,
+    }
+
+
+def _rollup_key(record, employee):
+    return (record.period_year, record.period_month, employee.department, employee.employment_type)
+
+
+def _locked_payroll(employee, period_month, period_year):
+    """The employee's PayrollCalculation for the period, locked, or None."""
+    try:
+        return PayrollCalculation.objects.select_for_update().get(
+            employee=employee, period_month=period_month, period_year=period_year,
+        )
+    except PayrollCalculation.DoesNotExist:
+        return None
+
+
+@transaction.atomic
+def upsert_payroll(employee, period_month, period_year, basic_salary):
+    """
+    Compute and save one employee's payroll for a period, keeping the period
+    rollup and the year-to-date ledger in step.
+
+    Returns:
+        (PayrollCalculation, created) like `update_or_create`
+    """
+    try:
+        with transaction.atomic():
+            return _upsert_payroll(employee, period_month, period_year, basic_salary)
+    except IntegrityError:
+        # A concurrent first calculation of the same period inserted the row
+        # after our lookup found none. It is committed now, so this run
+        # locks it and replaces it.
+        return _upsert_payroll(employee, period_month, period_year, basic_salary)
+
+
+def _upsert_payroll(employee, period_month, period_year, basic_salary):
+    rates = get_rate_table(period_year, period_month)
+    values = compute_payroll_values(basic_salary, rates)
+    delta = RollupDelta()
+    ytd = YearToDateDelta()
+    payroll = _locked_payroll(employee, period_month, period_year)
+
+    if uses_cumulative_withholding():
+        # The ledger lock serializes concurrent periods of the same employee and year.
+        replaced = {employee.pk: vars(payroll)} if payroll is not None else {}
+        prior = prior_months([employee.pk], period_year, period_month, replaced)[employee.pk]
+        values = with_cumulative_withholding(values, period_month, prior, rates)
+
+    if payroll is None:
+        payroll = PayrollCalculation(
+            employee=employee, period_month=period_month, period_year=period_year, **values
+        )
+        created = True
+    else:
+        delta.remove(_rollup_key(payroll, employee), vars(payroll))
+        ytd.remove(employee.pk, period_year, period_month, vars(payroll))
+        for field, value in values.items():
+            setattr(payroll, field, value)
+        created = False
+
+    payroll.save()
+    delta.add(_rollup_key(payroll, employee), values)
+    delta.apply()
+    ytd.add(employee.pk, period_year, period_month, values)
+    ytd.apply()
+    return payroll, created
+
+
+@transaction.atomic
+def delete_payroll(payroll):
+    """Delete a PayrollCalculation and subtract it from its period rollup and YTD ledger."""
+    delta = RollupDelta()
+    delta.remove(_rollup_key(payroll, payroll.employee), vars(payroll))
+    ytd = YearToDateDelta()
+    ytd.remove(payroll.employee_id, payroll.period_year, payroll.period_month, vars(payroll))
+    payroll.delete()
+    delta.apply()
+    ytd.apply()
+
+
+def iter_employee_chunks(queryset, chunk_size):
+    """Yield lists of (pk, monthly_salary, department, employment_type) tuples by primary key."""
+    last_pk = 0
+    while True:
+        chunk = list(
+            queryset.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', 'monthly_salary', 'department', 'employment_type')[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def payroll_run_employees(department=None, employment_type=None):
+    """Active employees covered by a payroll run, optionally narrowed."""
+    employees = Employee.objects.filter(is_active=True)
+    if department:
+        employees = employees.filter(department=department)
+    if employment_type:
+        employees = employees.filter(employment_type=employment_type)
+    return employees
+
+
+def upsert_payroll_chunk(chunk, period_month, period_year, rates) -> tuple:
+    """
+    Compute and upsert payroll for one chunk from iter_employee_chunks.
+
+    The chunk is written with one upserting `bulk_create` on the (employee,
+    period_month, period_year) unique key, and the period rollup and the
+    year-to-date ledger are adjusted by the difference between the old and
+    new rows. Under cumulative withholding the tax is then recomputed per
+    employee from the ledger rows of the chunk.
+
+    Returns:
+        (number of records created, dict of chunk totals for RUN_TOTAL_FIELDS)
+    """
+    chunk_ids = [row[0] for row in chunk]
+    existing = {
+        row['employee_id']: row
+        for row in PayrollCalculation.objects.filter(
+            employee_id__in=chunk_ids,
+            period_month=period_month,
+            period_year=period_year,
+        ).values('employee_id', *PAYROLL_VALUE_FIELDS)
+    }
+
+    with span('calc.batch'):
+        deductions = calculate_deductions_batch(
+            to_centavos(row[1] for row in chunk), rates
+        )
+    columns = {field: from_centavos(values) for field, values in deductions.items()}
+    rows = [{field: columns[field][i] for field in PAYROLL_VALUE_FIELDS} for i in range(len(chunk))]
+
+    if uses_cumulative_withholding():
+        prior = prior_months(chunk_ids, period_year, period_month, existing)
+        rows = [
+            with_cumulative_withholding(values, period_month, prior[pk], rates)
+            for pk, values in zip(chunk_ids, rows)
+        ]
+
+    records = [
+        PayrollCalculation(
+            employee_id=pk,
+            period_month=period_month,
+            period_year=period_year,
+            **values
+        )
+        for pk, values in zip(chunk_ids, rows)
+    ]
+
+    delta = RollupDelta()
+    ytd = YearToDateDelta()
+    for values, (pk, _, employee_department, employee_type) in zip(rows, chunk):
+        key = (period_year, period_month, employee_department, employee_type)
+        if pk in existing:
+            delta.remove(key, existing[pk])
+            ytd.remove(pk, period_year, period_month, existing[pk])
+        delta.add(key, values)
+        ytd.add(pk, period_year, period_month, values)
+
+    PayrollCalculation.objects.bulk_create(
+        records,
+        update_conflicts=True,
+        unique_fields=['employee', 'period_month', 'period_year'],
+        update_fields=[*PAYROLL_VALUE_FIELDS, 'updated_at'],
+    )
+    delta.apply()
+    ytd.apply()
+
+    totals = {field: sum((values[field] for values in rows), Decimal('0.00')) for field in RUN_TOTAL_FIELDS}
+    return len(chunk) - len(existing), totals
+
+
+@transaction.atomic
+def run_payroll_period(period_month, period_year, department=None,
+                       employment_type=None, chunk_size=RUN_CHUNK_SIZE) -> dict:
+    """
+    Compute and upsert payroll for every active employee in one period.
+
+    Employees are loaded `chunk_size` at a time; deductions for the whole
+    chunk are computed by the vectorized calculators and written by
+    upsert_payroll_chunk.
+
+    Returns:
+        dict summarizing the run (counts and period totals)
+    """
+    rates = get_rate_table(period_year, period_month)
+    employees = payroll_run_employees(department, employment_type)
+
+    employee_count = 0
+    created = 0
+    totals = {field: Decimal('0.00') for field in RUN_TOTAL_FIELDS}
+
+    for chunk in iter_employee_chunks(employees, chunk_size):
+        chunk_created, chunk_totals = upsert_payroll_chunk(chunk, period_month, period_year, rates)
+        employee_count += len(chunk)
+        created += chunk_created
+        for field in totals:
+            totals[field] += chunk_totals[field]
+
+    # bulk_create does not send post_save, so drop cached summaries here.
+    invalidate_payroll_summary(period_year, period_month)
+
+    return {
+        'period_month': period_month,
+        'period_year': period_year,
+        'department': department,
+        'employment_type': employment_type,
+        'employee_count': employee_count,
+        'created': created,
+        'updated': employee_count - created,
+        'totals': {field: str(amount) for field, amount in totals.items()},
+    }
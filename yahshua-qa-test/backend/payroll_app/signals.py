@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Employee, PayrollCalculation, RateTableVersion
+from .rates import invalidate_rate_tables
+from .rollups import move_employee_rollups
+from .search import index_employees, search_fields_changed
+from .stale import mark_stale, pay_inputs_changed
+from .summaries import invalidate_payroll_summary
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+@receiver(post_save, sender=RateTableVersion)
+@receiver(post_delete, sender=RateTableVersion)
+def rate_table_version_changed(sender, **kwargs):
+    invalidate_rate_tables()
+
+
+@receiver(post_save, sender=PayrollCalculation)
+@receiver(post_delete, sender=PayrollCalculation)
+def payroll_calculation_changed(sender, instance, **kwargs):
+    invalidate_payroll_summary(instance.period_year, instance.period_month)
+
+
+@receiver(post_save, sender=Employee)
+def employee_group_changed(sender, instance, created, raw=False, **kwargs):
+    """Move an employee's rollup totals when their department or employment type changes."""
+    if created or raw:
+        return
+    old_group = (instance.loaded_value('department'), instance.loaded_value('employment_type'))
+    new_group = (instance.department, instance.employment_type)
+    if None in old_group or old_group == new_group:
+        return
+    for period_year, period_month in move_employee_rollups(instance.pk, old_group, new_group):
+        invalidate_payroll_summary(period_year, period_month)
+
+
+@receiver(post_save, sender=Employee)
+def employee_pay_changed(sender, instance, created, raw=False, **kwargs):
+    """Queue the employee's open payroll periods for recalculation when their pay inputs change."""
+    if created or raw or not pay_inputs_changed(instance):
+        return
+    previous_salary = instance.loaded_value('monthly_salary')
+    mark_stale(instance.pk, instance.monthly_salary if previous_salary is None else previous_salary)
+
+
+@receiver(post_save, sender=Employee)
+def employee_search_changed(sender, instance, created, **kwargs):
+    """Re-index an employee's search terms when their name or email changes."""
+    # Also for fixtures (raw saves): they hold employees, and terms are derived from them.
+    if created or search_fields_changed(instance):
+        index_employees([instance], created=created)
@@ -0,0 +1,177 @@
+"""
+What-if payroll for raise planning.
+
+`simulate_payroll` takes entries of a salary, or an employee whose current
+salary is used, plus an optional raise, and computes every contribution,
+the withholding tax, net pay and employer cost for the whole batch with one
+call to the vectorized calculators. Nothing is written: the only query looks
+up the salaries of the entries that name an employee.
+
+Tax is the annualized monthly withholding of `calculate_deductions_batch`
+whatever PAYROLL_WITHHOLDING_METHOD says, since a what-if salary has no
+year to date.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+
+from .calculations.batch import calculate_deductions_batch
+from .instrumentation import span
+from .models import PAYROLL_VALUE_FIELDS, Employee
+from .rates import get_rate_table
+
+SIMULATION_MAX_ENTRIES = 50_000
+EMPLOYEE_LOOKUP_BATCH_SIZE = 900  # below SQLite's default limit on query parameters
+
+EMPLOYER_FIELDS = ['sss_employer', 'philhealth_employer', 'pagibig_employer']
+MAX_SALARY = Decimal('10000000000')  # Employee.monthly_salary has 12 digits
+CENT = Decimal('0.01')
+ZERO = Decimal('0')
+
+
+class SimulationError(ValueError):
+    """Some entries are invalid; `errors` lists them by index."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid simulation entries.")
+        self.errors = errors
+
+
+def _decimal(value, field, errors, places=None):
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        errors[field] = ['A valid number is required.']
+        return None
+    try:
+        number = Decimal(str(value).strip())
+    except InvalidOperation:
+        errors[field] = ['A valid number is required.']
+        return None
+    if not number.is_finite():
+        errors[field] = ['A valid number is required.']
+        return None
+    if places is not None and number.as_tuple().exponent < -places:
+        errors[field] = [f'Ensure that there are no more than {places} decimal places.']
+        return None
+    return number
+
+
+def _parse_entry(entry):
+    """Return (employee_id, salary, raise_percent, raise_amount) and a dict of field errors."""
+    errors = {}
+    if not isinstance(entry, dict):
+        return None, {'non_field_errors': ['Each entry must be an object.']}
+
+    employee_id = salary = None
+    if ('salary' in entry) == ('employee_id' in entry):
+        errors['non_field_errors'] = ['Give exactly one of salary or employee_id.']
+    elif 'salary' in entry:
+        salary = _decimal(entry['salary'], 'salary', errors, places=2)
+        if salary is not None and not 0 <= salary < MAX_SALARY:
+            errors['salary'] = [f'Ensure this value is between 0 and {MAX_SALARY}.']
+    else:
+        employee_id = entry['employee_id']
+        if isinstance(employee_id, str) and employee_id.strip().isdigit():
+            employee_id = int(employee_id)
+        if isinstance(employee_id, bool) or not isinstance(employee_id, int):
+            errors['employee_id'] = ['A valid integer is required.']
+
+    raise_percent = raise_amount = ZERO
+    # Bounded so the adjusted salary stays well within Decimal's 28 digits.
+    if 'raise_percent' in entry:
+        raise_percent = _decimal(entry['raise_percent'], 'raise_percent', errors)
+        if raise_percent is not None and not -100 < raise_percent < MAX_SALARY:
+            errors['raise_percent'] = [f'Ensure this value is greater than -100 and less than {MAX_SALARY}.']
+    if 'raise_amount' in entry:
+        raise_amount = _decimal(entry['raise_amount'], 'raise_amount', errors, places=2)
+        if raise_amount is not None and not -MAX_SALARY < raise_amount < MAX_SALARY:
+            errors['raise_amount'] = [f'Ensure this value is between -{MAX_SALARY} and {MAX_SALARY}.']
+    return (employee_id, salary, raise_percent, raise_amount), errors
+
+
+def _current_salaries(employee_ids) -> dict:
+    """Map each active employee among `employee_ids` to their monthly salary."""
+    employee_ids = list(employee_ids)
+    salaries = {}
+    for start in range(0, len(employee_ids), EMPLOYEE_LOOKUP_BATCH_SIZE):
+        salaries.update(
+            Employee.objects.filter(pk__in=employee_ids[start:start + EMPLOYEE_LOOKUP_BATCH_SIZE], is_active=True)
+            .values_list('pk', 'monthly_salary')
+        )
+    return salaries
+
+
+def _pesos(centavos) -> list:
+    """Format an array of centavos as 2-decimal-place strings, as the API renders amounts."""
+    centavos = np.asarray(centavos, dtype=np.int64)
+    if centavos.min(initial=0) < 0:
+        return [
+            f"{'-' if value < 0 else ''}{abs(value) // 100}.{abs(value) % 100:02d}"
+            for value in centavos.tolist()
+        ]
+    pesos, cents = np.divmod(centavos, 100)
+    return ['%d.%02d' % amount for amount in zip(pesos.tolist(), cents.tolist())]
+
+
+def simulate_payroll(entries, period_year, period_month) -> dict:
+    """
+    Compute payroll for `entries` in a period without storing anything.
+
+    Each entry is a dict with `salary` or `employee_id`, and optional
+    `raise_percent` and `raise_amount`; the simulated salary is
+    salary x (1 + raise_percent / 100) + raise_amount, to the centavo.
+
+    Returns:
+        dict with per-entry `results` (in entry order) and the batch `totals`
+
+    Raises:
+        SimulationError: listing every invalid entry; nothing is computed
+    """
+    parsed, errors = [], []
+    for index, entry in enumerate(entries):
+        values, entry_errors = _parse_entry(entry)
+        if entry_errors:
+            errors.append({'index': index, 'errors': entry_errors})
+            values = None
+        parsed.append(values)
+
+    current = _current_salaries({values[0] for values in parsed if values and values[0] is not None})
+    base_salaries, salaries = [], []
+    for index, values in enumerate(parsed):
+        if values is None:
+            continue
+        employee_id, salary, raise_percent, raise_amount = values
+        if employee_id is not None:
+            salary = current.get(employee_id)
+            if salary is None:
+                errors.append({'index': index, 'errors': {'employee_id': ['Active employee not found.']}})
+                continue
+        adjusted = (salary * (100 + raise_percent) / 100 + raise_amount).quantize(CENT)
+        if not 0 <= adjusted < MAX_SALARY:
+            errors.append({'index': index, 'errors': {
+                'non_field_errors': [f'The adjusted salary must be between 0 and {MAX_SALARY}.'],
+            }})
+        # Both have at most two decimal places, so these are exact centavos.
+        base_salaries.append(int(salary.scaleb(2)))
+        salaries.append(int(adjusted.scaleb(2)))
+    if errors:
+        raise SimulationError(sorted(errors, key=lambda error: error['index']))
+
+    with span('calc.batch'):
+        deductions = calculate_deductions_batch(np.array(salaries, dtype=np.int64), get_rate_table(period_year, period_month))
+    employer_cost = deductions['basic_salary'] + sum(deductions[field] for field in EMPLOYER_FIELDS)
+    columns = {field: deductions[field] for field in PAYROLL_VALUE_FIELDS}
+    columns['employer_cost'] = employer_cost
+
+    formatted = [_pesos(column) for column in columns.values()]
+    results = [
+        {'employee_id': values[0], 'base_salary': base, **dict(zip(columns, row))}
+        for values, base, row in zip(parsed, _pesos(base_salaries), zip(*formatted))
+    ]
+    totals = dict(zip(columns, _pesos([int(column.sum()) for column in columns.values()])))
+    return {
+        'period_month': period_month,
+        'period_year': period_year,
+        'results': results,
+        'totals': {'entries': len(results), **totals},
+    }
@@ -0,0 +1,215 @@
+"""
+Dirty tracking for stored payroll.
+
+When an employee's salary or employment type changes (see signals), every
+open period whose stored payroll was computed from the employee's previous
+salary is queued as a StalePayroll row. Rows with any other basic salary,
+such as an `override_salary` calculation, are not derived from the employee
+record and are left alone. `refresh_stale_payroll` claims the oldest queued
+pairs in batches and recomputes them period by period from the employee's
+current salary with the vectorized calculators, skipping rows whose basic
+salary has changed since they were queued. Only rows whose values changed
+are written, and the period rollup and year-to-date ledger are adjusted by
+the difference, so the work follows what changed rather than the size of
+the payroll table.
+
+Periods up to PAYROLL_CLOSED_THROUGH are closed: nothing is queued for them,
+and queued pairs whose period has since been closed are dropped unprocessed.
+By default every month before the current one is closed.
+"""
+
+from collections import defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .calculations.batch import calculate_deductions_batch, from_centavos, to_centavos
+from .models import PAYROLL_VALUE_FIELDS, PayrollCalculation, StalePayroll
+from .rates import get_rate_table
+from .rollups import RollupDelta
+from .summaries import invalidate_payroll_summary
+from .ytd import YearToDateDelta, prior_months, uses_cumulative_withholding, with_cumulative_withholding
+
+# Employee fields a payroll record is computed from.
+PAY_INPUT_FIELDS = ('monthly_salary', 'employment_type')
+
+STALE_BATCH_SIZE = 500
+
+# PAYROLL_CLOSED_THROUGH value that closes every month before the current one.
+CLOSED_THROUGH_PREVIOUS_MONTH = 'previous-month'
+
+
+def closed_through():
+    """The last closed (year, month) from PAYROLL_CLOSED_THROUGH, or None when every period is open."""
+    value = settings.PAYROLL_CLOSED_THROUGH
+    if not value:
+        return None
+    if value == CLOSED_THROUGH_PREVIOUS_MONTH:
+        today = timezone.localdate()
+        return (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+    try:
+        year, month = (int(part) for part in value.split('-'))
+        date(year, month, 1)
+    except ValueError:
+        raise ImproperlyConfigured(
+            f"PAYROLL_CLOSED_THROUGH must be a YYYY-MM period or {CLOSED_THROUGH_PREVIOUS_MONTH!r}, not {value!r}."
+        )
+    return year, month
+
+
+def open_periods():
+    """Q matching the PayrollCalculation periods after closed_through()."""
+    closed = closed_through()
+    if closed is None:
+        return Q()
+    year, month = closed
+    return Q(period_year__gt=year) | Q(period_year=year, period_month__gt=month)
+
+
+def pay_inputs_changed(employee) -> bool:
+    """Whether a saved employee's pay inputs differ from the values it was loaded with."""
+    return any(
+        employee.loaded_value(field) is not None and employee.loaded_value(field) != getattr(employee, field)
+        for field in PAY_INPUT_FIELDS
+    )
+
+
+def mark_stale(employee_id, previous_salary) -> int:
+    """
+    Queue every open period in which `employee_id`'s payroll was computed
+    from `previous_salary`, their monthly salary before the change.
+
+    Returns:
+        the number of pairs queued
+    """
+    now = timezone.now()
+    queued = [
+        StalePayroll(
+            employee_id=employee_id, period_year=year, period_month=month,
+            queued_salary=previous_salary, queued_at=now,
+        )
+        for year, month in PayrollCalculation.objects.filter(
+            open_periods(), employee_id=employee_id, basic_salary=previous_salary,
+        ).values_list('period_year', 'period_month')
+    ]
+    StalePayroll.objects.bulk_create(
+        queued,
+        update_conflicts=True,
+        unique_fields=['employee', 'period_year', 'period_month'],
+        update_fields=['queued_salary', 'queued_at'],
+    )
+    return len(queued)
+
+
+def _recalculate_period(queued_salaries, period_year, period_month, cumulative, now) -> tuple:
+    """
+    Recompute the stored payroll of the employees in `queued_salaries` (a
+    map of employee id to the basic salary their row had when queued) in one
+    period from their current salaries, and write back the rows that changed.
+
+    Returns:
+        (rows recalculated, rows changed, rows skipped as changed since queued)
+    """
+    rates = get_rate_table(period_year, period_month)
+    rows, skipped = [], 0
+    for row in PayrollCalculation.objects.filter(
+        employee_id__in=list(queued_salaries), period_year=period_year, period_month=period_month,
+    ).order_by('employee_id').values_list(
+        'pk', 'employee_id', 'employee__monthly_salary', 'employee__department', 'employee__employment_type',
+        *PAYROLL_VALUE_FIELDS,
+    ):
+        employee_id, basic_salary = row[1], row[5]  # PAYROLL_VALUE_FIELDS starts with basic_salary
+        queued_salary = queued_salaries[employee_id]
+        if queued_salary is not None and basic_salary != queued_salary:
+            # Rewritten since it was queued, e.g. by an override_salary calculation.
+            skipped += 1
+            continue
+        rows.append(row)
+    if not rows:
+        return 0, 0, skipped
+
+    deductions = calculate_deductions_batch(to_centavos(row[2] for row in rows), rates)
+    columns = {field: from_centavos(values) for field, values in deductions.items()}
+    stored = {row[1]: dict(zip(PAYROLL_VALUE_FIELDS, row[5:])) for row in rows}
+    if cumulative:
+        prior = prior_months(list(stored), period_year, period_month, stored)
+
+    changed = []
+    delta = RollupDelta()
+    ytd = YearToDateDelta()
+    for i, (pk, employee_id, _, department, employment_type, *_) in enumerate(rows):
+        old = stored[employee_id]
+        new = {field: columns[field][i] for field in PAYROLL_VALUE_FIELDS}
+        if cumulative:
+            new = with_cumulative_withholding(new, period_month, prior[employee_id], rates)
+        if all(new[field] == old[field] for field in PAYROLL_VALUE_FIELDS):
+            continue
+        key = (period_year, period_month, department, employment_type)
+        delta.remove(key, old)
+        delta.add(key, new)
+        ytd.remove(employee_id, period_year, period_month, old)
+        ytd.add(employee_id, period_year, period_month, new)
+        changed.append(PayrollCalculation(pk=pk, updated_at=now, **new))
+
+    if changed:
+        PayrollCalculation.objects.bulk_update(changed, [*PAYROLL_VALUE_FIELDS, 'updated_at'], batch_size=500)
+        delta.apply()
+        ytd.apply()
+    return len(rows), len(changed), skipped
+
+
+def refresh_stale_payroll(batch_size=STALE_BATCH_SIZE) -> dict:
+    """
+    Recompute up to `batch_size` queued (employee, period) pairs, oldest
+    period first, and dequeue them in the same transaction.
+
+    Periods are processed in order, so under cumulative withholding each
+    month sees the recomputed months before it. A pair queued again while
+    the batch ran stays queued for the next one.
+
+    Returns:
+        dict with the pairs claimed, skipped as closed, recalculated, changed
+        and skipped because their row was rewritten since it was queued
+    """
+    stats = {'claimed': 0, 'closed': 0, 'recalculated': 0, 'changed': 0, 'skipped': 0}
+    changed_periods = []
+    with transaction.atomic():
+        claimed_at = timezone.now()
+        claimed = list(
+            StalePayroll.objects.select_for_update(skip_locked=True)
+            .order_by('period_year', 'period_month', 'pk')
+            .values_list('pk', 'employee_id', 'period_year', 'period_month', 'queued_salary')[:batch_size]
+        )
+        stats['claimed'] = len(claimed)
+        if not claimed:
+            return stats
+
+        closed = closed_through()
+        by_period = defaultdict(dict)  # in claim order, i.e. oldest period first
+        for _, employee_id, period_year, period_month, queued_salary in claimed:
+            if closed is not None and (period_year, period_month) <= closed:
+                stats['closed'] += 1
+            else:
+                by_period[(period_year, period_month)][employee_id] = queued_salary
+
+        cumulative = uses_cumulative_withholding()
+        for (period_year, period_month), queued_salaries in by_period.items():
+            recalculated, changed, skipped = _recalculate_period(
+                queued_salaries, period_year, period_month, cumulative, claimed_at,
+            )
+            stats['recalculated'] += recalculated
+            stats['changed'] += changed
+            stats['skipped'] += skipped
+            if changed:
+                changed_periods.append((period_year, period_month))
+
+        StalePayroll.objects.filter(pk__in=[pk for pk, *_ in claimed], queued_at__lte=claimed_at).delete()
+
+    # bulk_update does not send post_save, so drop cached summaries here.
+    for period_year, period_month in changed_periods:
+        invalidate_payroll_summary(period_year, period_month)
+    return stats
@@ -0,0 +1,80 @@
+"""
+Payroll period summaries.
+
+Totals are computed in the database with a single aggregate (or one grouped
+annotate) over PayrollPeriodRollup, whose rows already hold per-period,
+per-department and per-employment-type sums, so a summary reads O(periods)
+rows instead of every PayrollCalculation. Results are also cached per period.
+signals.py drops a period's cached summaries whenever one of its rows is
+saved or deleted; bulk writes, which bypass signals, call
+invalidate_payroll_summary themselves. Writers include the payroll and stale
+workers, so with several processes the cache must be shared (CACHE_DIR).
+"""
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+
+from .models import PAYROLL_VALUE_FIELDS, PayrollPeriodRollup
+
+
+GROUP_BY_FIELDS = ['department', 'employment_type']
+
+
+def _cache_key(period_year, period_month, group_by):
+    return f"payroll-summary:{period_year}:{period_month or 'all'}:{group_by or 'none'}"
+
+
+def invalidate_payroll_summary(period_year, period_month):
+    """Drop cached summaries covering a period (the month and its whole year)."""
+    keys = [
+        _cache_key(period_year, month, group_by)
+        for month in (period_month, None)
+        for group_by in (None, *GROUP_BY_FIELDS)
+    ]
+    cache.delete_many(keys)
+
+
+def _totals(row):
+    totals = {
+        field: str((row[field] or Decimal('0')).quantize(Decimal('0.01')))
+        for field in PAYROLL_VALUE_FIELDS
+    }
+    totals['record_count'] = row['record_count'] or 0
+    return totals
+
+
+def payroll_summary(period_year, period_month=None, group_by=None) -> dict:
+    """
+    Return period totals, optionally broken down by department or employment type.
+
+    `period_month` None summarizes the whole year.
+    """
+    key = _cache_key(period_year, period_month, group_by)
+    summary = cache.get(key)
+    if summary is not None:
+        return summary
+
+    rollups = PayrollPeriodRollup.objects.filter(period_year=period_year, record_count__gt=0)
+    if period_month:
+        rollups = rollups.filter(period_month=period_month)
+
+    aggregates = {field: Sum(field) for field in [*PAYROLL_VALUE_FIELDS, 'record_count']}
+
+    summary = {
+        'period_year': period_year,
+        'period_month': period_month,
+        'group_by': group_by,
+        'totals': _totals(rollups.aggregate(**aggregates)),
+    }
+    if group_by:
+        rows = rollups.order_by().values(group_by).annotate(**aggregates).order_by(group_by)
+        summary['groups'] = [
+            {'group': row[group_by], **_totals(row)}
+            for row in rows
+        ]
+
+    cache.set(key, summary, settings.PAYROLL_SUMMARY_CACHE_TIMEOUT)
+    return summary
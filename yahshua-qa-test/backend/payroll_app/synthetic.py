@@ -0,0 +1,210 @@
+"""
+Reproducible synthetic payroll data for benchmarks and local load testing.
+
+Everything is drawn from a `random.Random(seed)`, so the same seed and sizes
+always produce the same employees (emails included) and therefore the same
+payroll history. `manage.py seed_payroll` loads a dataset into the configured
+database; benchmarks/suite.py builds its own.
+"""
+
+import math
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .calculations.batch import calculate_deductions_batch, from_centavos, to_centavos
+from .models import PAYROLL_VALUE_FIELDS, Employee, PayrollCalculation, YearToDateLedger
+from .rates import get_rate_table
+from .rollups import ROLLUP_KEY_FIELDS, RollupDelta, live_rollup_rows
+from .search import index_employees
+from .summaries import invalidate_payroll_summary
+from .ytd import live_ytd_rows
+
+# Department -> (share of headcount, median monthly salary, positions).
+DEPARTMENTS = {
+    'Engineering': (0.30, 55000, ['Junior Developer', 'Developer', 'Senior Developer', 'Engineering Manager']),
+    'Operations': (0.25, 28000, ['Operations Associate', 'Operations Specialist', 'Operations Supervisor']),
+    'Sales': (0.15, 35000, ['Sales Associate', 'Account Executive', 'Sales Manager']),
+    'Finance': (0.10, 45000, ['Accounting Clerk', 'Accountant', 'Finance Manager']),
+    'Human Resources': (0.08, 38000, ['HR Assistant', 'HR Specialist', 'HR Manager']),
+    'Customer Support': (0.10, 22000, ['Support Agent', 'Senior Support Agent', 'Support Lead']),
+    'Executive': (0.02, 250000, ['Director', 'Vice President', 'Chief Officer']),
+}
+
+# Employment type -> (share of headcount, salary multiplier).
+EMPLOYMENT_TYPES = {
+    'regular': (0.75, 1.0),
+    'probationary': (0.15, 0.85),
+    'contractual': (0.10, 0.9),
+}
+
+FIRST_NAMES = [
+    'Juan', 'Maria', 'Jose', 'Ana', 'Pedro', 'Rosa', 'Miguel', 'Carmen', 'Antonio', 'Elena',
+    'Ramon', 'Luz', 'Carlos', 'Teresa', 'Andres', 'Gloria', 'Manuel', 'Sofia', 'Rafael', 'Isabel',
+]
+LAST_NAMES = [
+    'Dela Cruz', 'Santos', 'Reyes', 'Garcia', 'Gonzales', 'Bautista', 'Ramos', 'Mendoza', 'Torres',
+    'Flores', 'Villanueva', 'Castillo', 'Aquino', 'Navarro', 'Rivera', 'Domingo', 'Salazar', 'Mercado',
+]
+
+MINIMUM_MONTHLY_SALARY = Decimal('12000.00')
+SALARY_SPREAD = 0.35  # sigma of the log-normal salary around each median
+ANNUAL_RAISE = 0.05  # applied backwards to build salary history
+EMAIL_DOMAIN = 'synthetic.invalid'
+
+
+def _weighted(rng, table):
+    names = list(table)
+    return rng.choices(names, weights=[table[name][0] for name in names])[0]
+
+
+def random_salary(rng, median) -> Decimal:
+    """Log-normal monthly salary around `median`, rounded to the peso."""
+    salary = Decimal(round(median * math.exp(rng.gauss(0, SALARY_SPREAD))))
+    return max(salary, MINIMUM_MONTHLY_SALARY).quantize(Decimal('0.01'))
+
+
+def generate_employees(count, seed=0, hired_before=date(2023, 1, 1)):
+    """Yield `count` unsaved Employees with realistic departments and salaries."""
+    rng = random.Random(seed)
+    for i in range(count):
+        department = _weighted(rng, DEPARTMENTS)
+        employment_type = _weighted(rng, EMPLOYMENT_TYPES)
+        _, median, positions = DEPARTMENTS[department]
+        level = min(int(rng.expovariate(1.2)), len(positions) - 1)
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield Employee(
+            first_name=first_name,
+            last_name=last_name,
+            email=f"{first_name}.{last_name}.{seed}-{i}@{EMAIL_DOMAIN}".lower().replace(' ', ''),
+            position=positions[level],
+            department=department,
+            employment_type=employment_type,
+            monthly_salary=random_salary(rng, median * (1 + 0.4 * level) * EMPLOYMENT_TYPES[employment_type][1]),
+            date_hired=hired_before - timedelta(days=rng.randrange(10 * 365)),
+            is_active=rng.random() < 0.97,
+        )
+
+
+def synthetic_employees():
+    """Employees created by this module."""
+    return Employee.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')
+
+
+def random_salaries(count, seed=0) -> list:
+    """`count` monthly salaries drawn from the same mix of departments as generate_employees."""
+    rng = random.Random(seed)
+    return [random_salary(rng, DEPARTMENTS[_weighted(rng, DEPARTMENTS)][1]) for _ in range(count)]
+
+
+def periods_ending(last_year, last_month, months):
+    """The `months` (year, month) periods up to and including the given one, oldest first."""
+    index = last_year * 12 + last_month - 1
+    return [(i // 12, i % 12 + 1) for i in range(index - months + 1, index + 1)]
+
+
+def batches(iterable, size):
+    """Yield lists of up to `size` items from `iterable`, holding one list at a time."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def historical_salaries(current, years_back) -> np.ndarray:
+    """Salaries in centavos `years_back` annual raises before `current`, rounded to the peso."""
+    return (np.round(current / (1 + ANNUAL_RAISE) ** years_back / 100) * 100).astype(np.int64)
+
+
+PAYROLL_INSERT_FIELDS = ['employee_id', 'period_month', 'period_year', *PAYROLL_VALUE_FIELDS, 'created_at', 'updated_at']
+
+
+def _insert_payroll_rows(rows):
+    """
+    INSERT prepared PayrollCalculation rows (values in PAYROLL_INSERT_FIELDS
+    order) with one `executemany`.
+
+    `bulk_create` spends most of its time preparing each value in Python; here
+    every value already has its database type.
+    """
+    qn = connection.ops.quote_name
+    columns = [PayrollCalculation._meta.get_field(name).column for name in PAYROLL_INSERT_FIELDS]
+    sql = (
+        f"INSERT INTO {qn(PayrollCalculation._meta.db_table)} ({', '.join(map(qn, columns))}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+@transaction.atomic
+def create_dataset(employees, years, seed=0, last_period=(2025, 12), batch_size=2000, progress=None) -> dict:
+    """
+    Insert `employees` synthetic employees and `years` of monthly payroll
+    ending at `last_period`, all in one transaction.
+
+    Payroll is computed per period with that period's rate table by the
+    vectorized calculators, from each employee's salary less one
+    ANNUAL_RAISE per year before `last_period`, and only for periods after
+    the hire date. Employees and their search terms go in with batched
+    `bulk_create`s and payroll rows with batched `executemany` INSERTs (the
+    new employees have no payroll to conflict with); the rollup and
+    year-to-date ledger are filled from aggregates over the new rows at the
+    end. Tax is always withheld by the annualized method here.
+
+    `progress(message)` is called after each period when given.
+
+    Returns:
+        dict with the number of employees and payroll records created
+    """
+    last_year, last_month = last_period
+    first_new_pk = (Employee.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+    hired_before = date(last_year, last_month, 1)
+    for batch in batches(generate_employees(employees, seed, hired_before), batch_size):
+        Employee.objects.bulk_create(batch)
+        index_employees(batch, created=True)
+
+    staff = list(
+        Employee.objects.filter(pk__gte=first_new_pk, is_active=True)
+        .order_by('pk').values_list('pk', 'monthly_salary', 'date_hired')
+    )
+    pks = np.array([pk for pk, _, _ in staff], dtype=np.int64)
+    current = to_centavos(salary for _, salary, _ in staff)
+    hired = np.array([hire.year * 12 + hire.month - 1 for _, _, hire in staff], dtype=np.int64)
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+    records = 0
+    periods = periods_ending(last_year, last_month, years * 12)
+    for year, month in periods:
+        on_payroll = hired <= year * 12 + month - 1
+        rates = get_rate_table(year, month)
+        period_pks = pks[on_payroll].tolist()
+        salaries = historical_salaries(current[on_payroll], last_year - year)
+        for start in range(0, len(period_pks), batch_size):
+            deductions = calculate_deductions_batch(salaries[start:start + batch_size], rates)
+            columns = [from_centavos(deductions[field]) for field in PAYROLL_VALUE_FIELDS]
+            _insert_payroll_rows([
+                (pk, month, year, *values, now, now)
+                for pk, *values in zip(period_pks[start:start + batch_size], *columns)
+            ])
+        records += len(period_pks)
+        if progress:
+            progress(f"{year}-{month:02d}: {len(period_pks)} payroll records")
+
+    delta = RollupDelta()
+    for row in live_rollup_rows().filter(employee_id__gte=first_new_pk):
+        delta.add([row[field] for field in ROLLUP_KEY_FIELDS], row, records=row['record_count'])
+    delta.apply()
+    ledger_rows = live_ytd_rows().filter(employee_id__gte=first_new_pk).iterator(chunk_size=batch_size)
+    for batch in batches(ledger_rows, batch_size):
+        YearToDateLedger.objects.bulk_create([YearToDateLedger(**row) for row in batch])
+    # Raw inserts send no post_save, so drop cached summaries here.
+    for year, month in periods:
+        invalidate_payroll_summary(year, month)
+
+    return {'employees': employees, 'payroll_records': records}
@@ -4,9 +4,20 @@ from . import views
 urlpatterns = [
     path('health/', views.health_check, name='health-check'),
     path('employees/', views.employee_list, name='employee-list'),
+    path('employees/import/', views.employee_import, name='employee-import'),
+    path('employees/export/', views.employee_export, name='employee-export'),
+    path('employees/search/', views.employee_search, name='employee-search'),
     path('employees/<int:pk>/', views.employee_detail, name='employee-detail'),
     path('calculate-payroll/', views.calculate_payroll, name='calculate-payroll'),
+    path('simulate/', views.simulate, name='simulate'),
+    path('payroll-runs/', views.payroll_run, name='payroll-run'),
+    path('payroll-runs/<int:pk>/', views.payroll_run_detail, name='payroll-run-detail'),
+    path('payroll-runs/<int:pk>/cancel/', views.payroll_run_cancel, name='payroll-run-cancel'),
     path('payroll-history/', views.payroll_history, name='payroll-history'),
     path('payroll-history/<int:pk>/', views.payroll_history_detail, name='payroll-history-detail'),
+    path('payroll-summary/', views.payroll_summary, name='payroll-summary'),
+    path('disbursements/bank-file/', views.disbursement_bank_file, name='disbursement-bank-file'),
+    path('disbursements/payslips/', views.disbursement_payslips, name='disbursement-payslips'),
     path('tax-brackets/', views.tax_brackets, name='tax-brackets'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
@@ -1,18 +1,52 @@
-from decimal import Decimal
+import csv
+import os
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, parser_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 
-from .models import Employee, PayrollCalculation
+from .models import Employee, PayrollCalculation, PayrollRun
 from .serializers import (
+    EmployeeSearchQuerySerializer,
     EmployeeSerializer,
     PayrollCalculationSerializer,
     PayrollCalculateRequestSerializer,
+    DisbursementQuerySerializer,
+    PayrollRunRequestSerializer,
+    PayrollRunSerializer,
+    PayrollSummaryQuerySerializer,
+    SimulationRequestSerializer,
+    PAYROLL_FIELDS,
+    payroll_rows,
+    serialize_payroll_row,
+    serialize_payroll_rows,
+)
+from .pagination import (
+    EMPLOYEE_SEARCH_KEYSET,
+    PAYROLL_HISTORY_KEYSET,
+    InvalidCursor,
+    decode_employee_search_cursor,
+    decode_payroll_history_cursor,
+    encode_cursor,
+    keyset_after_ascending,
+    keyset_after_descending,
 )
-from .calculations.tax_calculator import calculate_monthly_withholding_tax, get_tax_brackets
-from .calculations.sss_calculator import calculate_sss
-from .calculations.philhealth_calculator import calculate_philhealth, calculate_pagibig
+from .disbursements import bank_file, payslip_archive
+from .employee_io import ImportFormatError, export_employees_csv, export_employees_ndjson, import_employees
+from .http_cache import conditional_response, make_etag, table_version
+from .instrumentation import registry, span
+from .jobs import cancel_payroll_run, submit_payroll_run
+from .rates import get_rate_table
+from .search import search_employees
+from .services import delete_payroll, run_payroll_period, upsert_payroll
+from .simulation import SimulationError, simulate_payroll
+from .summaries import payroll_summary as summarize_payroll
+from .calculations.tax_calculator import get_tax_brackets
 
 
 @api_view(['GET'])
@@ -24,12 +58,18 @@ def health_check(request):
 # Employee endpoints
 # ---------------------------------------------------------------------------
 
+def _employee_list_etag(request):
+    return make_etag(request, table_version(Employee.objects.all()))
+
+
 @api_view(['GET', 'POST'])
+@conditional_response(_employee_list_etag)
 def employee_list(request):
     if request.method == 'GET':
         employees = Employee.objects.filter(is_active=True)
-        serializer = EmployeeSerializer(employees, many=True)
-        return Response(serializer.data)
+        with span('serialize'):
+            data = EmployeeSerializer(employees, many=True).data
+        return Response(data)
 
     elif request.method == 'POST':
         serializer = EmployeeSerializer(data=request.data)
@@ -63,6 +103,113 @@ def employee_detail(request, pk):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+SEARCH_DEFAULT_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+
+@api_view(['GET'])
+def employee_search(request):
+    """
+    Active employees matching `q` word by word as prefixes of their names or
+    email (see payroll_app.search), optionally narrowed to a department,
+    employment type and salary range, ordered by name and paginated with a
+    cursor.
+    """
+    query = EmployeeSearchQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    params = query.validated_data
+
+    employees = search_employees(Employee.objects.filter(is_active=True), params.get('q', ''))
+    if 'department' in params:
+        employees = employees.filter(department=params['department'])
+    if 'employment_type' in params:
+        employees = employees.filter(employment_type=params['employment_type'])
+    if 'salary_min' in params:
+        employees = employees.filter(monthly_salary__gte=params['salary_min'])
+    if 'salary_max' in params:
+        employees = employees.filter(monthly_salary__lte=params['salary_max'])
+    if 'cursor' in params:
+        try:
+            after = decode_employee_search_cursor(params['cursor'])
+        except InvalidCursor:
+            return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        employees = employees.filter(keyset_after_ascending(EMPLOYEE_SEARCH_KEYSET, after))
+
+    page_size = min(params.get('page_size', SEARCH_DEFAULT_PAGE_SIZE), SEARCH_MAX_PAGE_SIZE)
+    # Fetch one extra row to know whether there is a next page.
+    page = list(employees.order_by(*EMPLOYEE_SEARCH_KEYSET)[:page_size + 1])
+    next_cursor = None
+    if len(page) > page_size:
+        page = page[:page_size]
+        next_cursor = encode_cursor([getattr(page[-1], field) for field in EMPLOYEE_SEARCH_KEYSET])
+    with span('serialize'):
+        results = EmployeeSerializer(page, many=True).data
+    return Response({"results": results, "next_cursor": next_cursor})
+
+
+IMPORT_CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+IMPORT_FILE_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+
+@api_view(['POST'])
+@parser_classes([MultiPartParser])
+def employee_import(request):
+    """
+    Create employees in bulk from a CSV (with header row) or NDJSON upload.
+
+    Send the file as the raw body with Content-Type text/csv or
+    application/x-ndjson, or as the `file` field of a multipart form. The
+    body is read as a stream. Returns the number created plus per-line
+    errors for the rows that were skipped.
+    """
+    content_type = request.content_type.split(';')[0].strip()
+    if content_type == 'multipart/form-data':
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Upload the file in the 'file' field."}, status=status.HTTP_400_BAD_REQUEST)
+        file_format = IMPORT_FILE_EXTENSIONS.get(os.path.splitext(upload.name)[1].lower())
+        stream = upload
+    else:
+        file_format = IMPORT_CONTENT_TYPES.get(content_type)
+        stream = request.stream
+    if file_format is None:
+        return Response(
+            {"error": "Upload CSV (text/csv, .csv) or NDJSON (application/x-ndjson, .ndjson)."},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+    if stream is None:
+        return Response({"error": "Empty upload."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        result = import_employees(stream, file_format)
+    except (ImportFormatError, csv.Error) as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+def employee_export(request):
+    """
+    Stream every employee as CSV (default) or NDJSON (`?type=ndjson`).
+
+    `?active=true` limits the export to active employees.
+    """
+    employees = Employee.objects.all()
+    if request.query_params.get('active') == 'true':
+        employees = employees.filter(is_active=True)
+
+    if request.query_params.get('type') == 'ndjson':
+        return StreamingHttpResponse(export_employees_ndjson(employees), content_type='application/x-ndjson')
+    response = StreamingHttpResponse(export_employees_csv(employees), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="employees.csv"'
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Payroll calculation
 # ---------------------------------------------------------------------------
@@ -96,62 +243,241 @@ def calculate_payroll(request):
 
     basic_salary = data.get('override_salary') or employee.monthly_salary
 
-    # Perform calculations
-    sss = calculate_sss(basic_salary)
-    philhealth = calculate_philhealth(basic_salary)
-    pagibig = calculate_pagibig(basic_salary)
-    income_tax = calculate_monthly_withholding_tax(basic_salary)
-
-    total_deductions = (
-        sss['employee']
-        + philhealth['employee']
-        + pagibig['employee']
-        + income_tax
-    )
-    net_pay = Decimal(str(basic_salary)) - total_deductions
-
     # Upsert payroll record
-    payroll, created = PayrollCalculation.objects.update_or_create(
-        employee=employee,
-        period_month=period_month,
-        period_year=period_year,
-        defaults={
-            'basic_salary': basic_salary,
-            'sss_employee': sss['employee'],
-            'sss_employer': sss['employer'],
-            'philhealth_employee': philhealth['employee'],
-            'philhealth_employer': philhealth['employer'],
-            'pagibig_employee': pagibig['employee'],
-            'pagibig_employer': pagibig['employer'],
-            'income_tax': income_tax,
-            'total_deductions': total_deductions,
-            'net_pay': net_pay,
-        }
-    )
+    payroll, created = upsert_payroll(employee, period_month, period_year, basic_salary)
 
-    serializer = PayrollCalculationSerializer(payroll)
+    with span('serialize'):
+        data = PayrollCalculationSerializer(payroll).data
     status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
-    return Response(serializer.data, status=status_code)
+    return Response(data, status=status_code)
+
+
+@api_view(['POST'])
+def simulate(request):
+    """
+    What-if payroll for up to SIMULATION_MAX_ENTRIES entries, computed in
+    memory and never stored (see payroll_app.simulation).
+
+    Each entry gives `salary` or `employee_id` plus optional `raise_percent`
+    and `raise_amount`. Returns per-entry deductions, net pay and employer
+    cost in entry order, and their totals. Any invalid entry fails the whole
+    request with the list of errors by index.
+    """
+    req_serializer = SimulationRequestSerializer(data=request.data)
+    if not req_serializer.is_valid():
+        return Response(req_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = req_serializer.validated_data
+    try:
+        result = simulate_payroll(data['entries'], data['period_year'], data['period_month'])
+    except SimulationError as exc:
+        return Response({"errors": exc.errors}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result)
+
+
+@api_view(['POST'])
+def payroll_run(request):
+    """
+    Calculate payroll for every active employee in a period.
+
+    Optional `department` and `employment_type` narrow the run. Returns a run
+    summary rather than the individual payroll records.
+
+    With `background: true` the run is queued for `manage.py payroll_worker`
+    and the response is 202 with the PayrollRun to poll at
+    payroll-runs/<id>/.
+    """
+    req_serializer = PayrollRunRequestSerializer(data=request.data)
+    if not req_serializer.is_valid():
+        return Response(req_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = req_serializer.validated_data
+    if data['background']:
+        run = submit_payroll_run(
+            period_month=data['period_month'],
+            period_year=data['period_year'],
+            department=data.get('department', ''),
+            employment_type=data.get('employment_type', ''),
+        )
+        return Response(PayrollRunSerializer(run).data, status=status.HTTP_202_ACCEPTED)
+
+    summary = run_payroll_period(
+        period_month=data['period_month'],
+        period_year=data['period_year'],
+        department=data.get('department') or None,
+        employment_type=data.get('employment_type') or None,
+    )
+    return Response(summary, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+def payroll_run_detail(request, pk):
+    try:
+        run = PayrollRun.objects.get(pk=pk)
+    except PayrollRun.DoesNotExist:
+        return Response({"error": "Payroll run not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(PayrollRunSerializer(run).data)
+
+
+@api_view(['POST'])
+def payroll_run_cancel(request, pk):
+    try:
+        run = PayrollRun.objects.get(pk=pk)
+    except PayrollRun.DoesNotExist:
+        return Response({"error": "Payroll run not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    if run.status in PayrollRun.FINISHED_STATUSES:
+        return Response(
+            {"error": f"Payroll run already {run.status}."}, status=status.HTTP_409_CONFLICT
+        )
+    return Response(PayrollRunSerializer(cancel_payroll_run(run)).data)
 
 
 # ---------------------------------------------------------------------------
 # Payroll history
 # ---------------------------------------------------------------------------
 
-@api_view(['GET'])
-def payroll_history(request):
-    records = PayrollCalculation.objects.select_related('employee').all()
+HISTORY_DEFAULT_PAGE_SIZE = 100
+HISTORY_MAX_PAGE_SIZE = 1000
+HISTORY_STREAM_CHUNK_SIZE = 2000
+
 
-    employee_id = request.query_params.get('employee_id')
+def _filter_history(records, params):
+    employee_id = params.get('employee_id')
     if employee_id:
         records = records.filter(employee_id=employee_id)
 
-    year = request.query_params.get('year')
+    year = params.get('year')
     if year:
         records = records.filter(period_year=year)
+    return records
+
+
+def _history_records(params):
+    """Payroll records for the history query `params`, newest period first."""
+    return _filter_history(
+        PayrollCalculation.objects.select_related('employee').order_by(
+            *(f'-{field}' for field in PAYROLL_HISTORY_KEYSET)
+        ),
+        params,
+    )
+
+
+def _history_page_query(records, params):
+    """
+    Apply `page_size` and `cursor` to `records`.
+
+    Returns (records to fetch the page from, page size), or raises ValueError
+    with the message for a 400 response.
+    """
+    try:
+        page_size = min(int(params.get('page_size') or HISTORY_DEFAULT_PAGE_SIZE), HISTORY_MAX_PAGE_SIZE)
+        if page_size < 1:
+            raise ValueError(page_size)
+    except ValueError:
+        raise ValueError("page_size must be a positive integer.")
+
+    cursor = params.get('cursor')
+    if cursor:
+        try:
+            after = decode_payroll_history_cursor(cursor)
+        except InvalidCursor:
+            raise ValueError("Invalid cursor.")
+        records = records.filter(keyset_after_descending(PAYROLL_HISTORY_KEYSET, after))
+    return records, page_size
+
+
+def _history_page(page, page_size, fast):
+    """The paginated response body from up to `page_size` + 1 fetched rows."""
+    next_cursor = None
+    if len(page) > page_size:
+        page = page[:page_size]
+        if fast:
+            last = dict(zip(PAYROLL_FIELDS, page[-1]))
+            next_cursor = encode_cursor([last[field] for field in PAYROLL_HISTORY_KEYSET])
+        else:
+            next_cursor = encode_cursor([getattr(page[-1], field) for field in PAYROLL_HISTORY_KEYSET])
+
+    with span('serialize'):
+        if fast:
+            results = [serialize_payroll_row(values) for values in page]
+        else:
+            results = PayrollCalculationSerializer(page, many=True).data
+    return {"results": results, "next_cursor": next_cursor}
+
+
+def _payroll_history_etag(request):
+    if request.query_params.get('stream') == 'ndjson':
+        return None
+    # Rows embed the employee's name, so employee edits change the ETag too.
+    return make_etag(
+        request,
+        table_version(_filter_history(PayrollCalculation.objects.all(), request.query_params)),
+        table_version(Employee.objects.all()),
+    )
+
+
+@api_view(['GET'])
+@conditional_response(_payroll_history_etag)
+def payroll_history(request):
+    """
+    List payroll records, newest period first.
+
+    Optional `employee_id` and `year` filter the records. Without paging
+    parameters the full list is returned. `page_size` and/or `cursor` switch
+    to keyset pagination ({"results": [...], "next_cursor": ...}), and
+    `stream=ndjson` streams every record as newline-delimited JSON.
+
+    Records go through the fast `.values_list()` serializer unless
+    PAYROLL_FAST_SERIALIZERS is off or the request passes `serializer=drf`
+    (or `serializer=fast` to force it on).
+    """
+    params = request.query_params
+    records = _history_records(params)
+
+    fast = _use_fast_serializer(params)
+    if params.get('stream') == 'ndjson':
+        return _stream_ndjson(records, fast)
+
+    if params.get('cursor') is None and params.get('page_size') is None:
+        return Response(_serialize_history(records, fast))
+
+    try:
+        records, page_size = _history_page_query(records, params)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Fetch one extra row to know whether there is a next page.
+    page = list((payroll_rows(records) if fast else records)[:page_size + 1])
+    return Response(_history_page(page, page_size, fast))
+
+
+def _use_fast_serializer(params):
+    choice = params.get('serializer')
+    if choice in ('fast', 'drf'):
+        return choice == 'fast'
+    return settings.PAYROLL_FAST_SERIALIZERS
+
+
+def _serialize_history(records, fast):
+    with span('serialize'):
+        if fast:
+            return serialize_payroll_rows(records)
+        return PayrollCalculationSerializer(records, many=True).data
+
 
-    serializer = PayrollCalculationSerializer(records, many=True)
-    return Response(serializer.data)
+def _stream_ndjson(records, fast):
+    encoder = JSONEncoder(ensure_ascii=False)
+
+    def lines():
+        if fast:
+            for values in payroll_rows(records).iterator(chunk_size=HISTORY_STREAM_CHUNK_SIZE):
+                yield encoder.encode(serialize_payroll_row(values)) + '\n'
+        else:
+            for record in records.iterator(chunk_size=HISTORY_STREAM_CHUNK_SIZE):
+                yield encoder.encode(PayrollCalculationSerializer(record).data) + '\n'
+
+    return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
 
 
 @api_view(['GET', 'DELETE'])
@@ -166,15 +492,97 @@ def payroll_history_detail(request, pk):
         return Response(serializer.data)
 
     elif request.method == 'DELETE':
-        record.delete()
+        delete_payroll(record)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@api_view(['GET'])
+def payroll_summary(request):
+    """
+    Payroll totals for ?year= (and optional &month=), computed in the database.
+
+    `group_by=department|employment_type` adds per-group totals.
+    """
+    query = PayrollSummaryQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    params = query.validated_data
+    summary = summarize_payroll(params['year'], params.get('month'), params.get('group_by'))
+    return Response(summary)
+
+
+# ---------------------------------------------------------------------------
+# Disbursements
+# ---------------------------------------------------------------------------
+
+@api_view(['GET'])
+def disbursement_bank_file(request):
+    """Stream the bank disbursement file for ?year=&month= (`layout=csv|fixed`)."""
+    query = DisbursementQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    year, month, layout = (query.validated_data[key] for key in ('year', 'month', 'layout'))
+    extension = 'csv' if layout == 'csv' else 'txt'
+    response = StreamingHttpResponse(
+        bank_file(year, month, layout), content_type='text/csv' if layout == 'csv' else 'text/plain',
+    )
+    response['Content-Disposition'] = f'attachment; filename="bank-{year:04d}-{month:02d}.{extension}"'
+    return response
+
+
+@api_view(['GET'])
+def disbursement_payslips(request):
+    """Stream a ZIP of every payslip for ?year=&month=."""
+    query = DisbursementQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    year, month = query.validated_data['year'], query.validated_data['month']
+    response = StreamingHttpResponse(payslip_archive(year, month), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="payslips-{year:04d}-{month:02d}.zip"'
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Tax brackets
 # ---------------------------------------------------------------------------
 
+def _requested_period(params):
+    """The ?year=&month= period, defaulting to today's; ValueError when invalid."""
+    today = timezone.localdate()
+    return int(params.get('year', today.year)), int(params.get('month', today.month))
+
+
+def _tax_brackets_etag(request):
+    try:
+        rates = get_rate_table(*_requested_period(request.query_params))
+    except ValueError:
+        return None
+    return make_etag(request, rates.version)
+
+
 @api_view(['GET'])
+@conditional_response(_tax_brackets_etag, max_age=settings.PAYROLL_RATE_TABLE_CACHE_TIMEOUT, public=True)
 def tax_brackets(request):
-    brackets = get_tax_brackets()
+    """Return the tax brackets in force today, or for ?year=&month= when given."""
+    try:
+        rates = get_rate_table(*_requested_period(request.query_params))
+    except ValueError:
+        return Response({"error": "year and month must be a valid period."}, status=status.HTTP_400_BAD_REQUEST)
+
+    brackets = get_tax_brackets(rates.tax)
     return Response({"brackets": brackets})
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+@api_view(['GET'])
+def metrics(request):
+    """Request metrics in Prometheus text format (see payroll_app.instrumentation)."""
+    if not settings.PAYROLL_INSTRUMENTATION:
+        return Response({"error": "Instrumentation is disabled."}, status=status.HTTP_404_NOT_FOUND)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,175 @@
+"""
+Incremental maintenance of the YearToDateLedger and the cumulative
+withholding that reads it.
+
+Write paths collect their changes in a YearToDateDelta (subtract the old
+payroll row, add the new one) alongside their RollupDelta. Applying it locks
+the touched ledger rows and writes the new totals with one `bulk_update`, so
+the cost follows the number of employees written, not the length of their
+history.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+
+from .calculations.tax_calculator import calculate_cumulative_withholding_tax
+from .models import PayrollCalculation, YearToDateLedger
+
+YTD_FIELDS = ['gross', 'contributions', 'tax_withheld', 'month_mask']
+
+WITHHOLDING_METHODS = ('annualized', 'cumulative')
+
+
+def month_bit(period_month) -> int:
+    return 1 << (period_month - 1)
+
+
+def ledger_entry(values, period_month) -> dict:
+    """The ledger amounts contributed by one payroll row (a dict of PAYROLL_VALUE_FIELDS)."""
+    return {
+        'gross': Decimal(str(values['basic_salary'])),
+        'contributions': sum(
+            (Decimal(str(values[field])) for field in ('sss_employee', 'philhealth_employee', 'pagibig_employee')),
+            Decimal('0'),
+        ),
+        'tax_withheld': Decimal(str(values['income_tax'])),
+        'month_mask': month_bit(period_month),
+    }
+
+
+class YearToDateDelta:
+    """Signed per-(employee, year) changes to YearToDateLedger, accumulated in memory."""
+
+    def __init__(self):
+        self._deltas = defaultdict(lambda: defaultdict(Decimal))
+
+    def add(self, employee_id, period_year, period_month, values, sign=1):
+        delta = self._deltas[(employee_id, period_year)]
+        for field, amount in ledger_entry(values, period_month).items():
+            delta[field] += sign * amount
+
+    def remove(self, employee_id, period_year, period_month, values):
+        self.add(employee_id, period_year, period_month, values, sign=-1)
+
+    def apply(self):
+        """Write the accumulated deltas and reset. Call inside a transaction."""
+        changed = {key: delta for key, delta in self._deltas.items() if any(delta.values())}
+        self._deltas.clear()
+        if not changed:
+            return
+
+        employee_ids = {employee_id for employee_id, _ in changed}
+        years = {year for _, year in changed}
+        # Rows are created and locked in key order so that concurrent writers
+        # (parallel run shards) take their locks in the same order.
+        YearToDateLedger.objects.bulk_create(
+            [YearToDateLedger(employee_id=employee_id, year=year) for employee_id, year in sorted(changed)],
+            ignore_conflicts=True,
+        )
+        ledgers = (
+            YearToDateLedger.objects.select_for_update()
+            .filter(employee_id__in=employee_ids, year__in=years)
+            .order_by('employee_id', 'year')
+        )
+        updated = []
+        for ledger in ledgers:
+            delta = changed.get((ledger.employee_id, ledger.year))
+            if delta is None:
+                continue
+            for field, amount in delta.items():
+                setattr(ledger, field, getattr(ledger, field) + (int(amount) if field == 'month_mask' else amount))
+            updated.append(ledger)
+        YearToDateLedger.objects.bulk_update(updated, YTD_FIELDS, batch_size=500)
+
+
+class PriorMonths(NamedTuple):
+    """An employee's payroll months of a year before the one being computed."""
+    gross: Decimal
+    tax_withheld: Decimal
+
+
+NO_PRIOR_MONTHS = PriorMonths(Decimal('0'), Decimal('0'))
+
+
+def prior_months(employee_ids, period_year, period_month, replaced) -> dict:
+    """
+    Map each of `employee_ids` to its PriorMonths for a period, locking
+    their ledger rows.
+
+    `replaced` maps employee id to the PAYROLL_VALUE_FIELDS of the row being
+    recomputed, for those that have one. Normally the period is the latest of
+    its year, and the prior months are the ledger less that row. When later
+    months exist (a past period is recomputed), the earlier months are summed
+    from payroll history instead: at most eleven rows per employee.
+    """
+    ledgers = YearToDateLedger.objects.select_for_update().filter(employee_id__in=employee_ids, year=period_year)
+    prior = dict.fromkeys(employee_ids, NO_PRIOR_MONTHS)
+    retroactive = []
+    for ledger in ledgers:
+        if ledger.month_mask >> period_month:
+            retroactive.append(ledger.employee_id)
+            continue
+        gross, withheld = ledger.gross, ledger.tax_withheld
+        if ledger.employee_id in replaced:
+            entry = ledger_entry(replaced[ledger.employee_id], period_month)
+            gross -= entry['gross']
+            withheld -= entry['tax_withheld']
+        prior[ledger.employee_id] = PriorMonths(gross, withheld)
+
+    if retroactive:
+        earlier = (
+            PayrollCalculation.objects.filter(
+                employee_id__in=retroactive, period_year=period_year, period_month__lt=period_month,
+            )
+            .order_by().values('employee_id')
+            .annotate(gross=Sum('basic_salary'), tax_withheld=Sum('income_tax'))
+        )
+        for row in earlier:
+            prior[row['employee_id']] = PriorMonths(row['gross'], row['tax_withheld'])
+    return prior
+
+
+def uses_cumulative_withholding() -> bool:
+    method = settings.PAYROLL_WITHHOLDING_METHOD
+    if method not in WITHHOLDING_METHODS:
+        raise ImproperlyConfigured(
+            f"PAYROLL_WITHHOLDING_METHOD must be one of {', '.join(WITHHOLDING_METHODS)}, not {method!r}."
+        )
+    return method == 'cumulative'
+
+
+def with_cumulative_withholding(values, period_month, prior, rates) -> dict:
+    """`values` with income tax, total deductions and net pay redone by the cumulative method."""
+    income_tax = calculate_cumulative_withholding_tax(
+        values['basic_salary'], period_month, prior.gross, prior.tax_withheld, rates.tax,
+    )
+    total_deductions = values['total_deductions'] - values['income_tax'] + income_tax
+    return {
+        **values,
+        'income_tax': income_tax,
+        'total_deductions': total_deductions,
+        'net_pay': Decimal(str(values['basic_salary'])) - total_deductions,
+    }
+
+
+def live_ytd_rows():
+    """Aggregate PayrollCalculation into ledger-shaped dicts straight from the table."""
+    return (
+        PayrollCalculation.objects.order_by()
+        .values('employee_id', year=F('period_year'))
+        .annotate(
+            gross=Sum('basic_salary'),
+            contributions=Sum(F('sss_employee') + F('philhealth_employee') + F('pagibig_employee')),
+            tax_withheld=Sum('income_tax'),
+            month_mask=Sum(Case(
+                *(When(period_month=month, then=Value(month_bit(month))) for month in range(1, 13)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )),
+        )
+    )
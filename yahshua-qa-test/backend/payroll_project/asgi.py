@@ -0,0 +1,7 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'payroll_project.settings')
+# Serve the read-heavy views natively async (see payroll_app.async_views).
+os.environ.setdefault('PAYROLL_ASYNC_VIEWS', 'True')
+application = get_asgi_application()
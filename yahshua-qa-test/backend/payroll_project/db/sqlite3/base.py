@@ -0,0 +1,18 @@
+"""
+SQLite backend that opens write transactions up front.
+
+Django starts transactions with a plain (deferred) BEGIN. When two
+connections both read inside a transaction and then try to write, SQLite
+cannot upgrade either read lock and fails one of them with "database is
+locked" immediately, without waiting out the busy timeout. BEGIN IMMEDIATE
+takes the write lock at the start of the transaction, so concurrent writers
+queue on the busy timeout instead.
+"""
+
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute("BEGIN IMMEDIATE")
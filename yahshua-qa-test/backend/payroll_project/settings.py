@@ -20,6 +20,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'payroll_app.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -30,7 +31,12 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'payroll_project.urls'
+# Route the read-heavy API views to their native async versions
+# (payroll_app.async_views). asgi.py turns this on; leave it off under WSGI,
+# where async views would run through a per-request event loop.
+PAYROLL_ASYNC_VIEWS = os.environ.get('PAYROLL_ASYNC_VIEWS', 'False') == 'True'
+
+ROOT_URLCONF = 'payroll_project.urls_asgi' if PAYROLL_ASYNC_VIEWS else 'payroll_project.urls'
 
 TEMPLATES = [
     {
@@ -49,13 +55,39 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'payroll_project.wsgi.application'
+ASGI_APPLICATION = 'payroll_project.asgi.application'
+
+# DB_ENGINE=postgres reads the POSTGRES_* variables; anything else uses SQLite
+# at SQLITE_PATH. See "Database tuning" at the end of this file.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'payroll'),
+            'USER': os.environ.get('POSTGRES_USER', 'payroll'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # Keep connections open across requests and ping them before reuse.
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+            # Transaction-pooling proxies (PgBouncer) can't hold server-side
+            # cursors open between transactions.
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_POOLER', '') == 'pgbouncer',
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'payroll_project.db.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')) / 1000,
+            },
+        }
     }
-}
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -88,3 +120,85 @@ CORS_ALLOWED_ORIGINS = os.environ.get(
     'http://localhost:3000,http://127.0.0.1:3000'
 ).split(',')
 CORS_ALLOW_ALL_ORIGINS = DEBUG
+
+# Cache
+# Payroll summaries are cached here and dropped by whichever process writes
+# the period: a web worker, payroll_worker, refresh_stale_payroll or the
+# recalc/seed commands. Set CACHE_DIR to a directory all of them mount
+# (docker-compose uses the shared database volume) so they share one
+# file-based cache; left empty, each process keeps its own in-memory cache,
+# which only suits a single process such as runserver or the test runner.
+CACHE_DIR = os.environ.get('CACHE_DIR', '')
+if CACHE_DIR:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
+# Payroll
+# Seconds a worker keeps its compiled rate tables before re-checking for new
+# published versions (saves in the same process invalidate immediately).
+PAYROLL_RATE_TABLE_CACHE_TIMEOUT = int(os.environ.get('PAYROLL_RATE_TABLE_CACHE_TIMEOUT', '300'))
+
+# Deduction results memoized per (salary, rate table version). SIZE bounds the
+# per-process LRU (0 disables it); BACKEND names a CACHES alias shared between
+# worker processes, or leave it empty to keep the cache process-local.
+PAYROLL_DEDUCTION_CACHE_SIZE = int(os.environ.get('PAYROLL_DEDUCTION_CACHE_SIZE', '4096'))
+PAYROLL_DEDUCTION_CACHE_BACKEND = os.environ.get('PAYROLL_DEDUCTION_CACHE_BACKEND', '')
+
+# Serve payroll history through the `.values_list()` fast path instead of
+# PayrollCalculationSerializer (both produce identical output).
+PAYROLL_FAST_SERIALIZERS = os.environ.get('PAYROLL_FAST_SERIALIZERS', 'True') == 'True'
+
+# How monthly income tax is withheld: 'annualized' taxes each month's salary
+# x 12 on its own; 'cumulative' reads the employee's year-to-date ledger and
+# withholds the tax on the projected year less what was already withheld,
+# trueing up in December.
+PAYROLL_WITHHOLDING_METHOD = os.environ.get('PAYROLL_WITHHOLDING_METHOD', 'annualized')
+
+# Last closed payroll period, as YYYY-MM. Employee salary and employment
+# type changes queue their open periods (after this one) for recalculation by
+# `manage.py refresh_stale_payroll`; closed periods are never recomputed
+# automatically. The default, previous-month, closes every month before the
+# current one; empty leaves every period open.
+PAYROLL_CLOSED_THROUGH = os.environ.get('PAYROLL_CLOSED_THROUGH', 'previous-month')
+
+# Seconds a running background payroll run may go without progress before
+# payroll_worker treats its worker as dead and queues the run again; keep it
+# well above the time one chunk takes. After PAYROLL_RUN_MAX_ATTEMPTS claims
+# the run is marked failed instead.
+PAYROLL_RUN_LEASE_TIMEOUT = int(os.environ.get('PAYROLL_RUN_LEASE_TIMEOUT', '600'))
+PAYROLL_RUN_MAX_ATTEMPTS = int(os.environ.get('PAYROLL_RUN_MAX_ATTEMPTS', '3'))
+
+# Seconds a cached payroll-summary response may live; writes to a period drop
+# its entries immediately.
+PAYROLL_SUMMARY_CACHE_TIMEOUT = int(os.environ.get('PAYROLL_SUMMARY_CACHE_TIMEOUT', '3600'))
+
+# Seconds a cached response body for an ETag-validated endpoint (employee
+# list, payroll history, tax brackets) is kept. Entries are keyed by ETag,
+# so writes never make them stale; this only bounds memory.
+PAYROLL_RESPONSE_CACHE_TIMEOUT = int(os.environ.get('PAYROLL_RESPONSE_CACHE_TIMEOUT', '600'))
+
+# Per-request timing (Server-Timing headers and /api/metrics/). Off by
+# default: it adds a little overhead and the header exposes server timings
+# to clients.
+PAYROLL_INSTRUMENTATION = os.environ.get('PAYROLL_INSTRUMENTATION', 'False') == 'True'
+
+# Database tuning
+# PRAGMAs applied to every new SQLite connection (payroll_app.signals). WAL
+# lets readers proceed during a write; synchronous=NORMAL is durable in WAL
+# mode except for the last transactions before a power loss.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+}
@@ -1,7 +1,13 @@
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('payroll_app.urls')),
 ]
+
+if settings.DEBUG:
+    # runserver serves static files itself; gunicorn needs the explicit route.
+    urlpatterns += staticfiles_urlpatterns()
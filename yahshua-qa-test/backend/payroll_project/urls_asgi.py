@@ -0,0 +1,10 @@
+"""URLconf for ASGI deployments (PAYROLL_ASYNC_VIEWS): async read views under api/."""
+
+from django.urls import include, path
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/', include('payroll_app.async_urls')),
+    *(pattern for pattern in sync_urlpatterns if str(pattern.pattern) != 'api/'),
+]
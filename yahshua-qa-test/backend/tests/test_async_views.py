@@ -0,0 +1,124 @@
+"""
+Backend tests for the async (ASGI) read views.
+
+Run with: python manage.py test tests
+"""
+
+import json
+from decimal import Decimal
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import TestCase, AsyncClient, Client, override_settings
+from django.urls import resolve
+
+from payroll_app import async_views
+from payroll_app.models import Employee, PayrollCalculation
+from payroll_app.rates import invalidate_rate_tables
+from payroll_app.services import deduction_cache, run_payroll_period
+
+
+@override_settings(ROOT_URLCONF='payroll_project.urls_asgi')
+class AsyncReadViewTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        deduction_cache.clear()
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+        self.async_client = AsyncClient()
+        for i, (salary, department) in enumerate([('45000', 'Engineering'), ('20000', 'Finance')]):
+            Employee.objects.create(
+                first_name='Ana', last_name=f'Reyes {i}', email=f'ana{i}@example.com',
+                position='Developer', department=department, employment_type='regular',
+                monthly_salary=Decimal(salary), date_hired='2023-01-01',
+            )
+        for month in (1, 2, 3):
+            run_payroll_period(month, 2025)
+
+    async def sync_get(self, path):
+        """The same request through the sync view (payroll_project.urls)."""
+        with override_settings(ROOT_URLCONF='payroll_project.urls'):
+            return await sync_to_async(Client().get)(path)
+
+    async def test_routes_resolve_to_async_views(self):
+        self.assertIs(resolve('/api/employees/').func, async_views.employee_list)
+        self.assertEqual(resolve('/api/calculate-payroll/').url_name, 'calculate-payroll')
+
+    async def test_reads_match_sync_views(self):
+        record = await PayrollCalculation.objects.order_by('pk').afirst()
+        paths = [
+            '/api/health/',
+            '/api/employees/',
+            '/api/payroll-history/',
+            '/api/payroll-history/?serializer=drf',
+            '/api/payroll-history/?page_size=2',
+            '/api/payroll-history/?page_size=2&serializer=drf&year=2025',
+            '/api/payroll-history/?page_size=0',
+            '/api/payroll-history/?cursor=bogus',
+            f'/api/payroll-history/{record.pk}/',
+            '/api/payroll-history/999999/',
+            '/api/tax-brackets/',
+            '/api/tax-brackets/?year=2025&month=13',
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                await cache.aclear()
+                expected = await self.sync_get(path)
+                await cache.aclear()
+                response = await self.async_client.get(path)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response.get('ETag'), expected.get('ETag'))
+                self.assertEqual(response.get('Cache-Control'), expected.get('Cache-Control'))
+
+    async def test_cursor_pages_cover_history(self):
+        seen, path = [], '/api/payroll-history/?page_size=4'
+        while path:
+            page = (await self.async_client.get(path)).json()
+            seen += [row['id'] for row in page['results']]
+            path = page['next_cursor'] and f"/api/payroll-history/?page_size=4&cursor={page['next_cursor']}"
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(len(set(seen)), 6)
+
+    async def test_conditional_get_and_shared_body_cache(self):
+        expected = await self.sync_get('/api/employees/')  # fills the shared cache
+        response = await self.async_client.get('/api/employees/')
+        self.assertEqual(response.content, expected.content)
+        response = await self.async_client.get('/api/employees/', headers={'If-None-Match': expected['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+        employee = await Employee.objects.aget(department='Finance')
+        employee.position = 'Accountant'
+        await employee.asave()
+        response = await self.async_client.get('/api/employees/', headers={'If-None-Match': expected['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Accountant', response.content.decode())
+
+    async def test_ndjson_stream(self):
+        expected = await self.sync_get('/api/payroll-history/?stream=ndjson')
+        expected_lines = b''.join(await sync_to_async(list)(expected.streaming_content))
+        response = await self.async_client.get('/api/payroll-history/?stream=ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), expected_lines)
+        self.assertEqual(len(expected_lines.splitlines()), 6)
+
+    async def test_writes_and_other_methods_go_to_sync_views(self):
+        response = await self.async_client.post(
+            '/api/employees/',
+            data=json.dumps({
+                'first_name': 'Ben', 'last_name': 'Cruz', 'email': 'ben@example.com',
+                'position': 'Accountant', 'department': 'Finance', 'employment_type': 'contractual',
+                'monthly_salary': '30000.00', 'date_hired': '2024-01-01',
+            }),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+
+        record = await PayrollCalculation.objects.afirst()
+        response = await self.async_client.delete(f'/api/payroll-history/{record.pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(await PayrollCalculation.objects.filter(pk=record.pk).aexists())
+
+        response = await self.async_client.put('/api/tax-brackets/')
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response.json(), {'detail': 'Method "PUT" not allowed.'})
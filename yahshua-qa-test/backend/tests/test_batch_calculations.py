@@ -0,0 +1,66 @@
+"""
+Backend tests for the vectorized payroll calculators.
+
+The batch functions must agree exactly with the scalar calculators, so these
+tests compare both over random salaries and over every bracket boundary.
+
+Run with: python manage.py test tests
+"""
+
+import random
+from decimal import Decimal
+from django.test import SimpleTestCase
+
+from payroll_app.calculations.batch import (
+    calculate_deductions_batch,
+    from_centavos,
+    to_centavos,
+)
+from payroll_app.calculations.sss_calculator import SSS_CONTRIBUTION_TABLE
+from payroll_app.calculations.tax_calculator import TAX_BRACKETS
+from payroll_app.services import compute_payroll_values
+
+
+def _boundary_salaries():
+    """Salaries in centavos on and around every bracket edge."""
+    edges = {0, 1, 25, 75, 500000, 1000000, 10000000}
+    for bracket in SSS_CONTRIBUTION_TABLE:
+        edges.add(int(bracket["salary_range_min"]) * 100)
+        if bracket["salary_range_max"] is not None:
+            edges.add(int(Decimal(str(bracket["salary_range_max"])) * 100))
+    for bracket in TAX_BRACKETS:
+        # Monthly salaries whose annualized amount lands on the tax boundary.
+        edges.add(bracket["excess_over"] * 100 // 12)
+    centavos = set()
+    for edge in edges:
+        centavos.update({edge - 1, edge, edge + 1})
+    return sorted(value for value in centavos if value >= -1)
+
+
+class BatchCalculatorParityTests(SimpleTestCase):
+
+    def assert_matches_scalar(self, centavos):
+        batch = calculate_deductions_batch(centavos)
+        salaries = from_centavos(centavos)
+        batch_values = {field: from_centavos(values) for field, values in batch.items()}
+        for i, salary in enumerate(salaries):
+            expected = compute_payroll_values(salary)
+            for field, value in expected.items():
+                self.assertEqual(
+                    batch_values[field][i], value,
+                    f"{field} differs for salary {salary}",
+                )
+
+    def test_matches_scalar_on_bracket_boundaries(self):
+        self.assert_matches_scalar(_boundary_salaries())
+
+    def test_matches_scalar_on_random_salaries(self):
+        rng = random.Random(20230101)
+        centavos = [rng.randint(0, 50_000_000) for _ in range(3000)]
+        centavos += [rng.randint(0, 2_000_000_000) for _ in range(1000)]
+        self.assert_matches_scalar(centavos)
+
+    def test_to_centavos_rejects_fractional_centavos(self):
+        self.assertEqual(list(to_centavos([Decimal('25000.50'), '3249.99', 0])), [2500050, 324999, 0])
+        with self.assertRaises(ValueError):
+            to_centavos([Decimal('100.005')])
@@ -86,6 +86,17 @@ class SSSCalculatorTests(TestCase):
         result = calculate_sss(Decimal('25000'))
         self.assertEqual(result['employee'], Decimal('900.00'))
 
+    def test_bracket_upper_bound_is_inclusive(self):
+        """3,249.99 is still in the 3,000 MSC bracket; 3,250.00 moves to 3,500."""
+        self.assertEqual(calculate_sss(Decimal('3249.99'))['employee'], Decimal('135.00'))
+        self.assertEqual(calculate_sss(Decimal('3250.00'))['employee'], Decimal('157.50'))
+
+    def test_fraction_above_upper_bound_moves_to_next_bracket(self):
+        """Sub-centavo amounts past a .99 bound are compared exactly, not as floats."""
+        result = calculate_sss(Decimal('19749.995'))
+        self.assertEqual(result['employee'], Decimal('900.00'))
+        self.assertEqual(result['employer'], Decimal('1900.00'))
+
 
 class PhilHealthCalculatorTests(TestCase):
 
@@ -0,0 +1,32 @@
+"""
+Backend tests for the SQLite connection tuning.
+
+Run with: python manage.py test tests
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+
+class SQLiteTuningTests(TransactionTestCase):
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("SQLite only")
+
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        self.assertEqual(self._pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self._pragma('busy_timeout'), settings.SQLITE_PRAGMAS['busy_timeout'])
+
+    def test_transactions_take_the_write_lock_up_front(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                pass
+        self.assertEqual(queries.captured_queries[0]['sql'], 'BEGIN IMMEDIATE')
@@ -0,0 +1,60 @@
+"""
+Backend tests for the deduction result cache.
+
+Run with: python manage.py test tests
+"""
+
+from decimal import Decimal
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from payroll_app.calculations.cache import DeductionCache
+from payroll_app.calculations.rate_tables import BUILTIN_RATE_TABLE
+from payroll_app.services import compute_payroll_values, deduction_cache
+
+
+class DeductionCacheTests(SimpleTestCase):
+
+    def test_hits_and_misses_are_counted(self):
+        cache = DeductionCache(maxsize=10)
+        key = DeductionCache.make_key(Decimal('25000'), 'v1')
+        self.assertEqual(cache.get_or_compute(key, lambda: 'computed'), 'computed')
+        self.assertEqual(cache.get_or_compute(key, lambda: 'recomputed'), 'computed')
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_equal_salaries_share_an_entry(self):
+        cache = DeductionCache(maxsize=10)
+        cache.get_or_compute(DeductionCache.make_key('25000', 'v1'), lambda: 'a')
+        self.assertEqual(cache.get_or_compute(DeductionCache.make_key(Decimal('25000.00'), 'v1'), lambda: 'b'), 'a')
+        self.assertEqual(cache.get_or_compute(DeductionCache.make_key('25000', 'v2'), lambda: 'c'), 'c')
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = DeductionCache(maxsize=2)
+        keys = [DeductionCache.make_key(salary, 'v1') for salary in ('1', '2', '3')]
+        cache.get_or_compute(keys[0], lambda: 1)
+        cache.get_or_compute(keys[1], lambda: 2)
+        cache.get_or_compute(keys[0], lambda: 1)  # refresh keys[0]
+        cache.get_or_compute(keys[2], lambda: 3)  # evicts keys[1]
+
+        self.assertEqual(cache.stats()['size'], 2)
+        self.assertEqual(cache.get_or_compute(keys[1], lambda: 'evicted'), 'evicted')
+
+    def test_shared_backend_warms_other_processes(self):
+        shared = LocMemCache('deduction-cache-test', {})
+        first = DeductionCache(maxsize=10, shared=shared)
+        second = DeductionCache(maxsize=10, shared=shared)
+        key = DeductionCache.make_key('25000', 'v1')
+
+        first.get_or_compute(key, lambda: {'net_pay': Decimal('1')})
+        self.assertEqual(second.get_or_compute(key, lambda: None), {'net_pay': Decimal('1')})
+        self.assertEqual(second.stats()['shared_hits'], 1)
+        self.assertEqual(second.stats()['misses'], 0)
+
+    def test_compute_payroll_values_uses_cache(self):
+        deduction_cache.clear()
+        first = compute_payroll_values(Decimal('33333.33'), BUILTIN_RATE_TABLE)
+        second = compute_payroll_values(Decimal('33333.33'), BUILTIN_RATE_TABLE)
+        self.assertEqual(first, second)
+        self.assertEqual(deduction_cache.stats()['hits'], 1)
+        self.assertEqual(deduction_cache.stats()['misses'], 1)
@@ -0,0 +1,74 @@
+"""
+Backend tests for bank files and payslip archives.
+
+Run with: python manage.py test tests
+"""
+
+import csv
+import hashlib
+import io
+import zipfile
+from decimal import Decimal
+from django.test import TestCase, Client
+
+from payroll_app.models import Employee, PayrollCalculation
+from payroll_app.services import run_payroll_period
+
+
+class DisbursementTests(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        for first, last, salary in (('Ana', 'Reyes', '45000'), ('José', 'Peña', '20000')):
+            Employee.objects.create(
+                first_name=first, last_name=last, email=f'{last.lower()}@example.com',
+                position='Analyst', department='Finance', monthly_salary=Decimal(salary),
+                date_hired='2023-01-01',
+            )
+        run_payroll_period(1, 2025)
+        self.records = list(PayrollCalculation.objects.order_by('employee_id'))
+
+    def download(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_csv_bank_file_with_checksummed_trailer(self):
+        body = self.download('/api/disbursements/bank-file/?year=2025&month=1')
+        rows = list(csv.reader(io.StringIO(body.decode())))
+        self.assertEqual(rows[0], ['employee_id', 'employee_name', 'email', 'net_pay'])
+        self.assertEqual([row[3] for row in rows[1:-1]], [f'{r.net_pay:.2f}' for r in self.records])
+
+        trailer = rows[-1]
+        details = body.split(b'\r\n', 1)[1].rsplit(b'TRAILER', 1)[0]
+        self.assertEqual(trailer[:3], ['TRAILER', '2', f'{sum(r.net_pay for r in self.records):.2f}'])
+        self.assertEqual(trailer[3], hashlib.sha256(details).hexdigest())
+
+    def test_fixed_width_bank_file(self):
+        lines = self.download('/api/disbursements/bank-file/?year=2025&month=1&layout=fixed').split(b'\r\n')
+        self.assertEqual(lines[0], b'H202501')
+        detail = lines[2].decode()
+        self.assertEqual(len(detail), 1 + 10 + 40 + 15)
+        self.assertEqual(detail[11:51].rstrip(), 'JOSE PENA')
+        self.assertEqual(int(detail[51:]), int(self.records[1].net_pay * 100))
+        self.assertTrue(lines[3].startswith(b'T0000000002'))
+
+    def test_payslip_archive_is_reproducible_and_verifiable(self):
+        first = self.download('/api/disbursements/payslips/?year=2025&month=1')
+        self.assertEqual(first, self.download('/api/disbursements/payslips/?year=2025&month=1'))
+
+        archive = zipfile.ZipFile(io.BytesIO(first))
+        self.assertIsNone(archive.testzip())
+        names = archive.namelist()
+        self.assertEqual(len(names), 3)
+        self.assertEqual(names[-1], 'payslips-2025-01/SHA256SUMS')
+        for line in archive.read(names[-1]).decode().splitlines():
+            digest, name = line.split('  ')
+            self.assertEqual(hashlib.sha256(archive.read(f'payslips-2025-01/{name}')).hexdigest(), digest)
+        self.assertIn('NET PAY', archive.read(names[0]).decode())
+
+    def test_period_is_required(self):
+        self.assertEqual(self.client.get('/api/disbursements/bank-file/?year=2025').status_code, 400)
+        self.assertEqual(
+            self.client.get('/api/disbursements/bank-file/?year=2025&month=1&layout=xml').status_code, 400
+        )
@@ -0,0 +1,129 @@
+"""
+Backend tests for bulk employee import and streaming export.
+
+Run with: python manage.py test tests
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client
+
+from payroll_app.employee_io import import_employees
+from payroll_app.models import Employee
+
+CSV_HEADER = 'first_name,last_name,email,position,department,employment_type,monthly_salary,date_hired\n'
+
+
+class EmployeeImportTests(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com',
+            position='Developer', department='Engineering', monthly_salary=Decimal('45000'),
+            date_hired='2023-01-01',
+        )
+
+    def post_csv(self, body):
+        return self.client.post('/api/employees/import/', data=body, content_type='text/csv')
+
+    def test_csv_import_creates_rows_and_reports_bad_lines(self):
+        response = self.post_csv(
+            CSV_HEADER
+            + 'Ben,Cruz,ben@example.com,Accountant,Finance,contractual,20000,2024-02-01\n'
+            + 'Dup,Licate,ana@example.com,Clerk,Finance,regular,18000,2024-02-01\n'
+            + 'No,Salary,nosalary@example.com,Clerk,Finance,,,2024-02-01\n'
+            + 'Carl,Lim,carl@example.com,Analyst,Finance,,30000,2024-03-01\n'
+            + 'Carl,Again,carl@example.com,Analyst,Finance,,30000,2024-03-01\n'
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['created'], 2)
+        self.assertEqual([error['line'] for error in data['errors']], [3, 4, 6])
+        self.assertIn('email', data['errors'][0]['errors'])
+        self.assertIn('monthly_salary', data['errors'][1]['errors'])
+        self.assertEqual(Employee.objects.get(email='carl@example.com').employment_type, 'regular')
+
+    def test_duplicate_check_is_one_query_per_batch(self):
+        rows = ''.join(
+            f'W,{i},w{i}@example.com,Clerk,Ops,regular,{20000 + i},2024-01-01\n' for i in range(25)
+        )
+        # Per batch of 10: one email__in query, and bulk inserts of the employees
+        # and their search terms (in a savepoint).
+        with self.assertNumQueries(3 * 5):
+            result = import_employees(io.BytesIO((CSV_HEADER + rows).encode()), 'csv', batch_size=10)
+        self.assertEqual(result['created'], 25)
+
+    def test_ndjson_upload_as_multipart_file(self):
+        lines = [
+            json.dumps({'first_name': 'Dee', 'last_name': 'Tan', 'email': 'dee@example.com', 'position': 'HR',
+                        'department': 'People', 'monthly_salary': '25000', 'date_hired': '2024-01-15'}),
+            '{not json',
+        ]
+        upload = SimpleUploadedFile('staff.ndjson', '\n'.join(lines).encode())
+        data = self.client.post('/api/employees/import/', {'file': upload}).json()
+        self.assertEqual(data['created'], 1)
+        self.assertEqual(data['errors'][0]['line'], 2)
+
+    def test_unreadable_lines_are_reported_after_earlier_batches(self):
+        rows = ''.join(
+            f'W,{i},w{i}@example.com,Clerk,Ops,regular,{20000 + i},2024-01-01\n' for i in range(600)
+        )
+        self.addCleanup(csv.field_size_limit, csv.field_size_limit(1000))
+        body = (
+            (CSV_HEADER + rows).encode()
+            + b'\xff\xfe,Bad,bad@example.com,Clerk,Ops,regular,20000,2024-01-01\n'
+            + f'Long,{"x" * 2000},long@example.com,Clerk,Ops,regular,20000,2024-01-01\n'.encode()
+            + b'Last,Row,last@example.com,Clerk,Ops,regular,20000,2024-01-01\n'
+        )
+        response = self.post_csv(body)
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['created'], 601)
+        self.assertEqual([error['line'] for error in data['errors']], [602, 603])
+        self.assertEqual(data['errors'][0]['errors'], {'non_field_errors': ['Line is not valid UTF-8.']})
+        self.assertTrue(Employee.objects.filter(email='last@example.com').exists())
+
+        data = self.client.post(
+            '/api/employees/import/', data=b'{"first_name": "\xff"}\n', content_type='application/x-ndjson',
+        ).json()
+        self.assertEqual(data['errors'], [{'line': 1, 'errors': {'non_field_errors': ['Line is not valid UTF-8.']}}])
+
+    def test_unreadable_uploads_are_rejected(self):
+        self.assertEqual(self.post_csv('first_name,email\nA,a@example.com\n').status_code, 400)
+        response = self.client.post('/api/employees/import/', data='{}', content_type='application/json')
+        self.assertEqual(response.status_code, 415)
+
+
+class EmployeeExportTests(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        for i in range(3):
+            Employee.objects.create(
+                first_name='Worker', last_name=str(i), email=f'worker{i}@example.com',
+                position='Analyst', department='Finance', monthly_salary=Decimal('20000.50'),
+                date_hired='2023-01-01', is_active=i != 2,
+            )
+
+    def test_csv_export_round_trips_through_import(self):
+        response = self.client.get('/api/employees/export/')
+        body = b''.join(response.streaming_content)
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['monthly_salary'], '20000.50')
+
+        Employee.objects.all().delete()
+        result = import_employees(io.BytesIO(body), 'csv')
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(Employee.objects.filter(is_active=False).count(), 1)
+
+    def test_ndjson_export_of_active_employees(self):
+        response = self.client.get('/api/employees/export/?type=ndjson&active=true')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['last_name'] for row in rows], ['0', '1'])
+        self.assertEqual(rows[0]['monthly_salary'], '20000.50')
+        self.assertEqual(rows[0]['date_hired'], '2023-01-01')
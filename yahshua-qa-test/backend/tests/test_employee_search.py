@@ -0,0 +1,123 @@
+"""
+Backend tests for the indexed employee search endpoint.
+
+Run with: python manage.py test tests
+"""
+
+import io
+import json
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, Client
+
+from payroll_app.employee_io import import_employees
+from payroll_app.models import Employee, EmployeeSearchTerm
+from payroll_app.search import normalize_words
+
+PEOPLE = [
+    # first_name, last_name, email, department, employment_type, monthly_salary
+    ('Ana', 'Reyes', 'ana.reyes@example.com', 'Engineering', 'regular', '45000'),
+    ('José', 'Dela Cruz', 'jdc@example.com', 'Finance', 'contractual', '30000'),
+    ('Anabel', 'Santos', 'bel@example.com', 'Engineering', 'probationary', '25000'),
+    ('Mark', 'Anand', 'mark@example.com', 'Operations', 'regular', '60000'),
+    ('Maria', 'Reyes', 'maria@example.com', 'Finance', 'regular', '52000'),
+]
+
+
+class EmployeeSearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employees = {}
+        for first, last, email, department, employment_type, salary in PEOPLE:
+            self.employees[first] = Employee.objects.create(
+                first_name=first, last_name=last, email=email, position='Staff', department=department,
+                employment_type=employment_type, monthly_salary=Decimal(salary), date_hired='2023-01-01',
+            )
+
+    def search(self, **params):
+        response = self.client.get('/api/employees/search/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def names(self, **params):
+        return [employee['first_name'] for employee in self.search(**params)['results']]
+
+    def test_words_match_prefixes_of_names_and_email(self):
+        self.assertEqual(normalize_words('  José DELA-cruz '), ['jose', 'dela', 'cruz'])
+        # Ordered by last name, then first name.
+        self.assertEqual(self.names(q='an'), ['Mark', 'Ana', 'Anabel'])
+        self.assertEqual(self.names(q='ANA'), ['Mark', 'Ana', 'Anabel'])
+        self.assertEqual(self.names(q='jos'), ['José'])
+        self.assertEqual(self.names(q='crú'), ['José'])
+        self.assertEqual(self.names(q='reyes m'), ['Maria'])
+        self.assertEqual(self.names(q='ana.reyes@exa'), ['Ana'])
+        self.assertEqual(self.names(q='nab'), [])
+        self.assertEqual(len(self.names(q='  ')), len(PEOPLE))
+
+        self.employees['Ana'].is_active = False
+        self.employees['Ana'].save()
+        self.assertEqual(self.names(q='reyes'), ['Maria'])
+
+    def test_common_words_give_the_same_results(self):
+        with mock.patch('payroll_app.search.DENSE_WORD_TERMS', 0):
+            self.assertEqual(self.names(q='an'), ['Mark', 'Ana', 'Anabel'])
+            self.assertEqual(self.names(q='reyes m'), ['Maria'])
+            self.assertEqual(self.names(q='an', department='Engineering'), ['Ana', 'Anabel'])
+
+    def test_filters(self):
+        self.assertEqual(self.names(department='Finance'), ['José', 'Maria'])
+        self.assertEqual(self.names(q='a', employment_type='regular'), ['Mark', 'Ana'])
+        self.assertEqual(self.names(salary_min='30000', salary_max='52000'), ['José', 'Ana', 'Maria'])
+        self.assertEqual(self.names(q='reyes', salary_min='50000'), ['Maria'])
+
+        for params in ({'employment_type': 'intern'}, {'salary_min': 'x'}, {'salary_min': '2', 'salary_max': '1'},
+                       {'page_size': '0'}, {'cursor': 'not-a-cursor'}):
+            response = self.client.get('/api/employees/search/', params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_cursor_pages_through_every_match_in_order(self):
+        Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana2@example.com', position='Staff',
+            department='Finance', monthly_salary=Decimal('40000'), date_hired='2023-01-01',
+        )
+        seen, cursor = [], None
+        while True:
+            page = self.search(page_size=2, **({'cursor': cursor} if cursor else {}))
+            self.assertLessEqual(len(page['results']), 2)
+            seen += [employee['id'] for employee in page['results']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        expected = list(Employee.objects.order_by('last_name', 'first_name', 'id').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_terms_follow_employee_writes(self):
+        ana = self.employees['Ana']
+        response = self.client.put(
+            f'/api/employees/{ana.pk}/', content_type='application/json',
+            data=json.dumps({'last_name': 'Villanueva', 'email': 'ana.v@example.com'}),
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(q='villa'), ['Ana'])
+        self.assertEqual(self.names(q='reyes'), ['Maria'])
+
+        body = 'first_name,last_name,email,position,department,employment_type,monthly_salary,date_hired\n' \
+               'Paolo,Ñunez,paolo@example.com,Clerk,Ops,regular,20000,2024-01-01\n'
+        self.assertEqual(import_employees(io.BytesIO(body.encode()), 'csv')['created'], 1)
+        self.assertEqual(self.names(q='nun'), ['Paolo'])
+        call_command('rebuild_employee_search', check=True, stdout=StringIO(), stderr=StringIO())
+
+    def test_rebuild_command_restores_and_verifies_terms(self):
+        EmployeeSearchTerm.objects.filter(employee=self.employees['Mark']).delete()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_employee_search', check=True, stdout=StringIO(), stderr=StringIO())
+        out = StringIO()
+        call_command('rebuild_employee_search', stdout=out)
+        self.assertIn('match the employees', out.getvalue())
+        self.assertEqual(self.names(q='mark'), ['Mark'])
@@ -0,0 +1,94 @@
+"""
+Backend tests for ETag / conditional GET handling.
+
+Run with: python manage.py test tests
+"""
+
+import json
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase, Client
+
+from payroll_app.models import Employee, PayrollCalculation
+from payroll_app.rates import invalidate_rate_tables
+from payroll_app.services import run_payroll_period
+
+
+class HTTPCachingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+        self.client = Client()
+        self.employee = Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('45000'), date_hired='2023-01-01',
+        )
+        run_payroll_period(1, 2025)
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_resource_returns_304(self):
+        for url in ('/api/employees/', '/api/payroll-history/', '/api/tax-brackets/'):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertTrue(first['ETag'].startswith('"'))
+            second = self.revalidate(url, first['ETag'])
+            self.assertEqual(second.status_code, 304, url)
+            self.assertEqual(second['ETag'], first['ETag'])
+            self.assertEqual(second.content, b'')
+
+    def test_repeat_read_served_from_server_cache(self):
+        first = self.client.get('/api/payroll-history/')
+        # Only the two version queries behind the ETag.
+        with self.assertNumQueries(2):
+            second = self.client.get('/api/payroll-history/')
+        self.assertEqual(second.json(), first.json())
+
+    def test_cache_control_headers(self):
+        self.assertIn('no-cache', self.client.get('/api/employees/')['Cache-Control'])
+        self.assertIn('private', self.client.get('/api/payroll-history/')['Cache-Control'])
+        brackets = self.client.get('/api/tax-brackets/')['Cache-Control']
+        self.assertIn('public', brackets)
+        self.assertIn('max-age=300', brackets)
+
+    def test_writes_change_the_etag(self):
+        history = self.client.get('/api/payroll-history/')
+        employees = self.client.get('/api/employees/')
+
+        self.client.put(
+            f'/api/employees/{self.employee.pk}/', data=json.dumps({'last_name': 'Santos'}),
+            content_type='application/json',
+        )
+        # The employee name is embedded in history rows.
+        response = self.revalidate('/api/payroll-history/', history['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['employee_name'], 'Ana Santos')
+        self.assertEqual(self.revalidate('/api/employees/', employees['ETag']).status_code, 200)
+
+        history = self.client.get('/api/payroll-history/')
+        Employee.objects.filter(pk=self.employee.pk).update(monthly_salary=Decimal('50000'))
+        run_payroll_period(1, 2025)  # bulk upsert of an existing row
+        response = self.revalidate('/api/payroll-history/', history['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['basic_salary'], '50000.00')
+
+        record = PayrollCalculation.objects.get()
+        self.client.delete(f'/api/payroll-history/{record.pk}/')
+        self.assertEqual(self.client.get('/api/payroll-history/').json(), [])
+
+    def test_etag_depends_on_query(self):
+        all_years = self.client.get('/api/payroll-history/')
+        one_year = self.client.get('/api/payroll-history/?year=2024')
+        self.assertNotEqual(all_years['ETag'], one_year['ETag'])
+        self.assertEqual(self.revalidate('/api/payroll-history/?year=2024', all_years['ETag']).status_code, 200)
+
+    def test_streamed_history_is_not_cached(self):
+        response = self.client.get('/api/payroll-history/?stream=ndjson')
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_invalid_period_still_returns_400(self):
+        self.assertEqual(self.client.get('/api/tax-brackets/?year=abc').status_code, 400)
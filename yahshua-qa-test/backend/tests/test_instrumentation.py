@@ -0,0 +1,119 @@
+"""
+Backend tests for request instrumentation (Server-Timing and /api/metrics/).
+
+Run with: python manage.py test tests
+"""
+
+import json
+import re
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from payroll_app.instrumentation import Histogram, registry, span
+from payroll_app.models import Employee
+from payroll_app.rates import invalidate_rate_tables
+from payroll_app.services import deduction_cache
+
+
+def server_timing(response) -> dict:
+    """Parse a Server-Timing header into {name: {param: value}}."""
+    entries = {}
+    for entry in response['Server-Timing'].split(', '):
+        name, *params = entry.split(';')
+        entries[name] = dict(param.split('=', 1) for param in params)
+    return entries
+
+
+@override_settings(PAYROLL_INSTRUMENTATION=True)
+class InstrumentationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        deduction_cache.clear()
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.client = Client()
+        self.employee = Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('45000'), date_hired='2023-01-01',
+        )
+
+    def calculate(self):
+        return self.client.post(
+            '/api/calculate-payroll/',
+            data=json.dumps({'employee_id': self.employee.pk, 'period_month': 1, 'period_year': 2025}),
+            content_type='application/json',
+        )
+
+    def test_server_timing_reports_total_db_and_calculator_spans(self):
+        response = self.calculate()
+        self.assertEqual(response.status_code, 201)
+        timing = server_timing(response)
+        for name in ('total', 'db', 'serialize', 'calc.sss', 'calc.philhealth', 'calc.pagibig', 'calc.tax'):
+            self.assertIn(name, timing)
+            self.assertGreaterEqual(float(timing[name]['dur']), 0)
+        self.assertGreaterEqual(float(timing['total']['dur']), float(timing['db']['dur']))
+
+    def test_db_query_count_matches_queries_executed(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/payroll-history/')
+        self.assertEqual(server_timing(response)['db']['desc'], f'"{len(queries)} queries"')
+
+    def test_metrics_endpoint_exposes_histograms(self):
+        self.calculate()
+        self.client.get('/api/payroll-history/')
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+
+        self.assertIn('# TYPE payroll_http_request_duration_seconds histogram', body)
+        self.assertIn(
+            'payroll_http_requests_total{view="calculate-payroll",method="POST",status="201"} 1', body,
+        )
+        self.assertIn(
+            'payroll_http_request_duration_seconds_bucket{view="payroll-history",method="GET",le="+Inf"} 1',
+            body,
+        )
+        self.assertIn('payroll_span_duration_seconds_count{view="calculate-payroll",span="calc.sss"} 1', body)
+        queries = re.search(
+            r'payroll_http_request_db_queries_sum\{view="calculate-payroll",method="POST"\} (\d+)', body,
+        )
+        self.assertGreater(int(queries.group(1)), 0)
+
+    def test_unmatched_paths_are_grouped(self):
+        self.client.get('/api/no-such-endpoint/')
+        self.assertIn('view="unmatched"', registry.render())
+
+    @override_settings(PAYROLL_INSTRUMENTATION=False)
+    def test_disabled_instrumentation_adds_nothing(self):
+        client = Client()
+        response = client.get('/api/employees/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(client.get('/api/metrics/').status_code, 404)
+
+    def test_span_outside_a_request_is_a_no_op(self):
+        with span('anything'):
+            pass
+        self.assertNotIn('anything', registry.render())
+
+
+class HistogramTests(TestCase):
+
+    def test_buckets_are_cumulative_and_upper_bound_inclusive(self):
+        histogram = Histogram('latency', 'Latency.', ['view'], (1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(('list',), value)
+        self.assertEqual(list(histogram.samples()), [
+            'latency_bucket{view="list",le="1"} 2',
+            'latency_bucket{view="list",le="5"} 3',
+            'latency_bucket{view="list",le="+Inf"} 4',
+            'latency_sum{view="list"} 14.5',
+            'latency_count{view="list"} 4',
+        ])
@@ -0,0 +1,115 @@
+"""
+Backend tests for the payroll history endpoint.
+
+Run with: python manage.py test tests
+"""
+
+import json
+from decimal import Decimal
+from django.test import TestCase, Client
+
+from payroll_app.models import Employee, PayrollCalculation
+from payroll_app.services import compute_payroll_values
+
+
+class PayrollHistoryAPITests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employees = [
+            Employee.objects.create(
+                first_name=f'Emp{i}', last_name='Test', email=f'emp{i}@example.com',
+                position='Developer', department='Engineering', employment_type='regular',
+                monthly_salary=Decimal('30000') + i, date_hired='2023-01-01',
+            )
+            for i in range(3)
+        ]
+        for employee in cls.employees:
+            for year in (2024, 2025):
+                for month in (1, 2, 3):
+                    PayrollCalculation.objects.create(
+                        employee=employee, period_month=month, period_year=year,
+                        **compute_payroll_values(employee.monthly_salary),
+                    )
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_unpaginated_list_is_unchanged(self):
+        response = self.client.get('/api/payroll-history/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 18)
+
+    def test_cursor_pages_cover_every_record_in_order(self):
+        full = [r['id'] for r in self.client.get('/api/payroll-history/').json()]
+
+        seen = []
+        url = '/api/payroll-history/?page_size=4'
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data['results']), 4)
+            seen.extend(r['id'] for r in data['results'])
+            url = data['next_cursor'] and f"/api/payroll-history/?page_size=4&cursor={data['next_cursor']}"
+
+        self.assertEqual(seen, full)
+
+    def test_cursor_respects_filters(self):
+        employee = self.employees[1]
+        data = self.client.get(f'/api/payroll-history/?employee_id={employee.pk}&year=2025&page_size=2').json()
+        self.assertEqual([(r['period_year'], r['period_month']) for r in data['results']], [(2025, 3), (2025, 2)])
+        data = self.client.get(
+            f"/api/payroll-history/?employee_id={employee.pk}&year=2025&page_size=2&cursor={data['next_cursor']}"
+        ).json()
+        self.assertEqual([(r['period_year'], r['period_month']) for r in data['results']], [(2025, 1)])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_invalid_cursor_and_page_size_return_400(self):
+        self.assertEqual(self.client.get('/api/payroll-history/?cursor=not-a-cursor').status_code, 400)
+        self.assertEqual(self.client.get('/api/payroll-history/?page_size=0').status_code, 400)
+
+    def test_ndjson_stream_matches_list(self):
+        response = self.client.get('/api/payroll-history/?year=2024&stream=ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.client.get('/api/payroll-history/?year=2024').json())
+
+
+class FastSerializerTests(TestCase):
+    """The fast read path must be byte-for-byte identical to the DRF serializer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employee = Employee.objects.create(
+            first_name='José', last_name='Peña', email='jose@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('20833.33'), date_hired='2023-01-01',
+        )
+        for month in range(1, 6):
+            PayrollCalculation.objects.create(
+                employee=employee, period_month=month, period_year=2025,
+                **compute_payroll_values(Decimal('20833.33') * month),
+            )
+
+    def setUp(self):
+        self.client = Client()
+
+    def assert_identical(self, query):
+        fast = self.client.get(f'/api/payroll-history/?serializer=fast&{query}')
+        drf = self.client.get(f'/api/payroll-history/?serializer=drf&{query}')
+        self.assertEqual(fast.status_code, 200)
+        if fast.streaming:
+            self.assertEqual(b''.join(fast.streaming_content), b''.join(drf.streaming_content))
+        else:
+            self.assertEqual(fast.content, drf.content)
+
+    def test_full_list_identical(self):
+        self.assert_identical('')
+
+    def test_paginated_pages_identical(self):
+        self.assert_identical('page_size=2')
+        cursor = self.client.get('/api/payroll-history/?page_size=2').json()['next_cursor']
+        self.assert_identical(f'page_size=2&cursor={cursor}')
+
+    def test_ndjson_stream_identical(self):
+        self.assert_identical('stream=ndjson')
@@ -0,0 +1,149 @@
+"""
+Backend tests for background payroll runs and the payroll worker.
+
+Run with: python manage.py test tests
+"""
+
+import json
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+
+from payroll_app.jobs import claim_next_run, execute_payroll_run, shard_ranges
+from payroll_app.models import Employee, PayrollCalculation, PayrollRun
+
+
+class PayrollJobTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        Employee.objects.bulk_create([
+            Employee(
+                first_name='Worker', last_name=str(i), email=f'worker{i}@example.com',
+                position='Analyst', department='Finance' if i % 2 else 'Engineering',
+                monthly_salary=Decimal(20000 + 1000 * i), date_hired='2023-01-01',
+            )
+            for i in range(7)
+        ])
+
+    def submit(self, **payload):
+        response = self.client.post(
+            '/api/payroll-runs/',
+            data=json.dumps({'period_month': 3, 'period_year': 2025, 'background': True, **payload}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 202)
+        return response.json()
+
+    def work(self, **options):
+        call_command('payroll_worker', once=True, workers=1, chunk_size=3, stdout=StringIO(), **options)
+
+    def test_submit_queues_without_computing(self):
+        run = self.submit(department='Finance')
+        self.assertEqual(run['status'], 'queued')
+        self.assertEqual(run['total_employees'], 3)
+        self.assertEqual(run['progress'], 0.0)
+        self.assertFalse(PayrollCalculation.objects.exists())
+
+    def test_worker_completes_run(self):
+        run = self.submit()
+        self.work()
+
+        data = self.client.get(f"/api/payroll-runs/{run['id']}/").json()
+        self.assertEqual(data['status'], 'succeeded')
+        self.assertEqual(data['processed_employees'], 7)
+        self.assertEqual(data['created_records'], 7)
+        self.assertEqual(data['progress'], 1.0)
+        self.assertEqual(PayrollCalculation.objects.filter(period_month=3, period_year=2025).count(), 7)
+        call_command('rebuild_payroll_rollups', check=True, stdout=StringIO())
+
+    def test_worker_drops_summaries_cached_by_the_web_process(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+        }}):
+            summary = self.client.get('/api/payroll-summary/?year=2025&month=3').json()
+            self.assertEqual(summary['totals']['record_count'], 0)
+
+            self.submit()
+            # payroll_worker runs in its own process, with its own cache instance.
+            with mock.patch('payroll_app.summaries.cache', caches.create_connection('default')):
+                self.work()
+
+            summary = self.client.get('/api/payroll-summary/?year=2025&month=3').json()
+            self.assertEqual(summary['totals']['record_count'], 7)
+
+    def test_shards_cover_every_employee_once(self):
+        employees = Employee.objects.all()
+        pks = sorted(employees.values_list('pk', flat=True))
+        ranges = shard_ranges(employees, 3)
+        self.assertEqual(len(ranges), 3)
+        covered = [pk for pk in pks for first, last in ranges if first <= pk <= last]
+        self.assertEqual(covered, pks)
+        self.assertEqual(len(shard_ranges(employees, 50)), 7)
+
+    def test_cancel_queued_run(self):
+        run = self.submit()
+        response = self.client.post(f"/api/payroll-runs/{run['id']}/cancel/")
+        self.assertEqual(response.json()['status'], 'cancelled')
+        self.work()
+        self.assertFalse(PayrollCalculation.objects.exists())
+        self.assertEqual(self.client.post(f"/api/payroll-runs/{run['id']}/cancel/").status_code, 409)
+
+    def test_cancel_running_run_stops_between_chunks(self):
+        run = PayrollRun.objects.get(pk=self.submit()['id'])
+        PayrollRun.objects.filter(pk=run.pk).update(status=PayrollRun.STATUS_RUNNING)
+        self.client.post(f'/api/payroll-runs/{run.pk}/cancel/')
+
+        run = execute_payroll_run(run, chunk_size=3)
+        self.assertEqual(run.status, PayrollRun.STATUS_CANCELLED)
+        self.assertEqual(run.processed_employees, 0)
+
+    def expire_lease(self, run):
+        PayrollRun.objects.filter(pk=run.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+    @override_settings(PAYROLL_RUN_LEASE_TIMEOUT=60)
+    def test_run_of_a_dead_worker_is_claimed_again(self):
+        run_id = self.submit()['id']
+        dead = claim_next_run()  # its worker is killed before finishing
+        self.assertEqual((dead.pk, dead.attempts), (run_id, 1))
+        self.assertIsNone(claim_next_run())
+
+        self.expire_lease(dead)
+        run = claim_next_run()
+        self.assertEqual((run.pk, run.attempts, run.processed_employees), (run_id, 2, 0))
+
+        # The first worker was only slow: it stops and records nothing.
+        dead = execute_payroll_run(dead, chunk_size=3)
+        self.assertEqual((dead.status, dead.processed_employees), (PayrollRun.STATUS_RUNNING, 0))
+
+        run = execute_payroll_run(run, chunk_size=3)
+        self.assertEqual(run.status, PayrollRun.STATUS_SUCCEEDED)
+        self.assertEqual((run.processed_employees, run.created_records), (7, 7))
+
+    @override_settings(PAYROLL_RUN_LEASE_TIMEOUT=60, PAYROLL_RUN_MAX_ATTEMPTS=2)
+    def test_expired_runs_fail_after_max_attempts_or_cancel(self):
+        run_id = self.submit()['id']
+        for _ in range(2):
+            self.expire_lease(claim_next_run())
+        self.assertIsNone(claim_next_run())
+        run = PayrollRun.objects.get(pk=run_id)
+        self.assertEqual(run.status, PayrollRun.STATUS_FAILED)
+        self.assertTrue(run.error)
+
+        run_id = self.submit()['id']
+        run = claim_next_run()
+        self.client.post(f'/api/payroll-runs/{run_id}/cancel/')
+        self.expire_lease(run)
+        self.assertIsNone(claim_next_run())
+        self.assertEqual(PayrollRun.objects.get(pk=run_id).status, PayrollRun.STATUS_CANCELLED)
+
+    def test_unknown_run_returns_404(self):
+        self.assertEqual(self.client.get('/api/payroll-runs/999/').status_code, 404)
+        self.assertEqual(self.client.post('/api/payroll-runs/999/cancel/').status_code, 404)
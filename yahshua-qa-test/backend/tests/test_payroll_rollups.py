@@ -0,0 +1,143 @@
+"""
+Backend tests for the incrementally maintained payroll period rollup.
+
+Run with: python manage.py test tests
+"""
+
+import json
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.contrib import admin
+from django.core.management import CommandError, call_command
+from django.test import TestCase, Client, RequestFactory
+
+from payroll_app import services
+from payroll_app.models import Employee, PayrollCalculation, PayrollPeriodRollup, YearToDateLedger
+
+
+class PayrollRollupTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.engineer = Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('45000'), date_hired='2023-01-01',
+        )
+        self.accountant = Employee.objects.create(
+            first_name='Ben', last_name='Cruz', email='ben@example.com',
+            position='Accountant', department='Finance', employment_type='contractual',
+            monthly_salary=Decimal('20000'), date_hired='2023-01-01',
+        )
+
+    def _calculate(self, employee, month=1, **extra):
+        return self.client.post(
+            '/api/calculate-payroll/',
+            data=json.dumps({'employee_id': employee.pk, 'period_month': month, 'period_year': 2025, **extra}),
+            content_type='application/json',
+        )
+
+    def _rollup(self, department, month=1):
+        return PayrollPeriodRollup.objects.get(period_year=2025, period_month=month, department=department)
+
+    def _assert_rollups_match(self):
+        call_command('rebuild_payroll_rollups', check=True, stdout=StringIO(), stderr=StringIO())
+
+    def test_calculate_adds_and_recalculation_replaces(self):
+        self._calculate(self.engineer)
+        self.assertEqual(self._rollup('Engineering').record_count, 1)
+        self.assertEqual(self._rollup('Engineering').basic_salary, Decimal('45000.00'))
+
+        self._calculate(self.engineer, override_salary='50000')
+        rollup = self._rollup('Engineering')
+        self.assertEqual(rollup.record_count, 1)
+        self.assertEqual(rollup.basic_salary, Decimal('50000.00'))
+        self.assertEqual(rollup.net_pay, PayrollCalculation.objects.get(employee=self.engineer).net_pay)
+        self._assert_rollups_match()
+
+    def test_concurrent_first_calculation_is_replaced_not_rejected(self):
+        self._calculate(self.engineer)
+        real_lookup = services._locked_payroll
+        lookups = []
+
+        def lookup(*args):
+            # The first lookup misses the row, as if another request inserted it meanwhile.
+            lookups.append(args)
+            return None if len(lookups) == 1 else real_lookup(*args)
+
+        with mock.patch.object(services, '_locked_payroll', side_effect=lookup):
+            _, created = services.upsert_payroll(self.engineer, 1, 2025, Decimal('50000'))
+        self.assertEqual(len(lookups), 2)
+        self.assertFalse(created)
+        self.assertEqual(PayrollCalculation.objects.get(employee=self.engineer).basic_salary, Decimal('50000.00'))
+        self.assertEqual(self._rollup('Engineering').record_count, 1)
+        self._assert_rollups_match()
+
+    def test_delete_subtracts_from_rollup(self):
+        self._calculate(self.engineer)
+        record = PayrollCalculation.objects.get(employee=self.engineer)
+        self.client.delete(f'/api/payroll-history/{record.pk}/')
+        rollup = self._rollup('Engineering')
+        self.assertEqual(rollup.record_count, 0)
+        self.assertEqual(rollup.net_pay, Decimal('0'))
+        self._assert_rollups_match()
+
+    def test_admin_deletes_keep_aggregates_and_cannot_edit_them(self):
+        self._calculate(self.engineer)
+        self._calculate(self.accountant)
+        self._calculate(self.accountant, month=2)
+        request = RequestFactory().get('/admin/')
+        payroll_admin = admin.site._registry[PayrollCalculation]
+        payroll_admin.delete_queryset(request, PayrollCalculation.objects.filter(employee=self.accountant))
+        payroll_admin.delete_model(request, PayrollCalculation.objects.get(employee=self.engineer))
+
+        self.assertFalse(PayrollPeriodRollup.objects.filter(record_count__gt=0).exists())
+        self._assert_rollups_match()
+        call_command('rebuild_ytd_ledger', check=True, stdout=StringIO(), stderr=StringIO())
+
+        self.assertFalse(payroll_admin.has_change_permission(request))
+        for model in (PayrollPeriodRollup, YearToDateLedger):
+            model_admin = admin.site._registry[model]
+            self.assertFalse(model_admin.has_add_permission(request))
+            self.assertFalse(model_admin.has_change_permission(request))
+            self.assertFalse(model_admin.has_delete_permission(request))
+
+    def test_bulk_run_applies_deltas(self):
+        self._calculate(self.engineer, override_salary='10000')
+        for _ in range(2):
+            self.client.post(
+                '/api/payroll-runs/', data=json.dumps({'period_month': 1, 'period_year': 2025}),
+                content_type='application/json',
+            )
+        self.assertEqual(self._rollup('Engineering').record_count, 1)
+        self.assertEqual(self._rollup('Engineering').basic_salary, Decimal('45000.00'))
+        self.assertEqual(self._rollup('Finance').record_count, 1)
+        self._assert_rollups_match()
+
+    def test_department_change_moves_totals(self):
+        self._calculate(self.accountant, month=1)
+        self._calculate(self.accountant, month=2)
+        self.client.get('/api/payroll-summary/?year=2025&group_by=department')
+
+        self.client.put(
+            f'/api/employees/{self.accountant.pk}/', data=json.dumps({'department': 'Operations'}),
+            content_type='application/json',
+        )
+        self.assertEqual(self._rollup('Finance', month=2).record_count, 0)
+        self.assertEqual(self._rollup('Operations', month=2).record_count, 1)
+        data = self.client.get('/api/payroll-summary/?year=2025&group_by=department').json()
+        self.assertEqual([g['group'] for g in data['groups']], ['Operations'])
+        self._assert_rollups_match()
+
+    def test_rebuild_repairs_drift(self):
+        self._calculate(self.engineer)
+        PayrollPeriodRollup.objects.update(record_count=7)
+        with self.assertRaises(CommandError):
+            self._assert_rollups_match()
+
+        call_command('rebuild_payroll_rollups', stdout=StringIO())
+        self.assertEqual(self._rollup('Engineering').record_count, 1)
+        self._assert_rollups_match()
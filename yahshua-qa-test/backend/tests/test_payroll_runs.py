@@ -0,0 +1,79 @@
+"""
+Backend tests for the bulk payroll run endpoint.
+
+Run with: python manage.py test tests
+"""
+
+import json
+from decimal import Decimal
+from django.test import TestCase, Client
+
+from payroll_app.models import Employee, PayrollCalculation
+from payroll_app.services import compute_payroll_values
+
+
+class PayrollRunAPITests(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.engineer = Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('45000'), date_hired='2023-01-01',
+        )
+        self.accountant = Employee.objects.create(
+            first_name='Ben', last_name='Cruz', email='ben@example.com',
+            position='Accountant', department='Finance', employment_type='contractual',
+            monthly_salary=Decimal('20000'), date_hired='2023-01-01',
+        )
+        Employee.objects.create(
+            first_name='Carl', last_name='Lim', email='carl@example.com',
+            position='Analyst', department='Finance', employment_type='regular',
+            monthly_salary=Decimal('30000'), date_hired='2023-01-01', is_active=False,
+        )
+
+    def post_run(self, payload):
+        return self.client.post(
+            '/api/payroll-runs/', data=json.dumps(payload), content_type='application/json',
+        )
+
+    def test_run_computes_all_active_employees(self):
+        response = self.post_run({'period_month': 1, 'period_year': 2025})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['employee_count'], 2)
+        self.assertEqual(data['created'], 2)
+        self.assertEqual(PayrollCalculation.objects.count(), 2)
+
+        record = PayrollCalculation.objects.get(employee=self.engineer)
+        expected = compute_payroll_values(Decimal('45000'))
+        self.assertEqual(record.net_pay, expected['net_pay'])
+        self.assertEqual(record.income_tax, expected['income_tax'])
+
+    def test_rerun_updates_existing_rows(self):
+        self.post_run({'period_month': 2, 'period_year': 2025})
+        self.engineer.monthly_salary = Decimal('60000')
+        self.engineer.save()
+
+        response = self.post_run({'period_month': 2, 'period_year': 2025})
+        data = response.json()
+        self.assertEqual(data['created'], 0)
+        self.assertEqual(data['updated'], 2)
+        self.assertEqual(PayrollCalculation.objects.count(), 2)
+        record = PayrollCalculation.objects.get(employee=self.engineer)
+        self.assertEqual(record.basic_salary, Decimal('60000.00'))
+
+    def test_run_filters_by_department_and_employment_type(self):
+        response = self.post_run({
+            'period_month': 3, 'period_year': 2025,
+            'department': 'Finance', 'employment_type': 'contractual',
+        })
+        self.assertEqual(response.json()['employee_count'], 1)
+        self.assertEqual(
+            list(PayrollCalculation.objects.values_list('employee_id', flat=True)),
+            [self.accountant.pk],
+        )
+
+    def test_invalid_period_returns_400(self):
+        response = self.post_run({'period_month': 13, 'period_year': 2025})
+        self.assertEqual(response.status_code, 400)
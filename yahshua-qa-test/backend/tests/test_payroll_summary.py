@@ -0,0 +1,89 @@
+"""
+Backend tests for the payroll summary endpoint.
+
+Run with: python manage.py test tests
+"""
+
+import json
+import tempfile
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import cache, caches
+from django.test import TestCase, Client, override_settings
+
+from payroll_app.models import Employee, PayrollCalculation
+from payroll_app.services import upsert_payroll
+
+
+class PayrollSummaryAPITests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.engineer = Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('45000'), date_hired='2023-01-01',
+        )
+        self.accountant = Employee.objects.create(
+            first_name='Ben', last_name='Cruz', email='ben@example.com',
+            position='Accountant', department='Finance', employment_type='contractual',
+            monthly_salary=Decimal('20000'), date_hired='2023-01-01',
+        )
+        for month in (1, 2):
+            self.client.post(
+                '/api/payroll-runs/', data=json.dumps({'period_month': month, 'period_year': 2025}),
+                content_type='application/json',
+            )
+
+    def test_month_totals_match_records(self):
+        data = self.client.get('/api/payroll-summary/?year=2025&month=1').json()
+        records = PayrollCalculation.objects.filter(period_year=2025, period_month=1)
+        self.assertEqual(data['totals']['record_count'], 2)
+        self.assertEqual(Decimal(data['totals']['net_pay']), sum(r.net_pay for r in records))
+        self.assertEqual(Decimal(data['totals']['sss_employer']), sum(r.sss_employer for r in records))
+
+    def test_year_totals_and_grouping(self):
+        data = self.client.get('/api/payroll-summary/?year=2025&group_by=department').json()
+        self.assertEqual(data['totals']['record_count'], 4)
+        self.assertEqual([g['group'] for g in data['groups']], ['Engineering', 'Finance'])
+        self.assertEqual(data['groups'][0]['basic_salary'], '90000.00')
+
+    def test_empty_period_returns_zero_totals(self):
+        data = self.client.get('/api/payroll-summary/?year=2024').json()
+        self.assertEqual(data['totals']['record_count'], 0)
+        self.assertEqual(data['totals']['net_pay'], '0.00')
+
+    def test_cached_summary_invalidated_by_writes(self):
+        before = self.client.get('/api/payroll-summary/?year=2025&month=1').json()
+
+        record = PayrollCalculation.objects.get(employee=self.accountant, period_month=1)
+        self.client.delete(f'/api/payroll-history/{record.pk}/')
+        after_delete = self.client.get('/api/payroll-summary/?year=2025&month=1').json()
+        self.assertEqual(after_delete['totals']['record_count'], before['totals']['record_count'] - 1)
+
+        self.client.post(
+            '/api/payroll-runs/', data=json.dumps({'period_month': 1, 'period_year': 2025}),
+            content_type='application/json',
+        )
+        after_run = self.client.get('/api/payroll-summary/?year=2025&month=1').json()
+        self.assertEqual(after_run, before)
+
+    def test_invalidation_from_another_process_reaches_the_web_cache(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+        }}):
+            before = self.client.get('/api/payroll-summary/?year=2025&month=1').json()
+
+            # A worker process has its own cache instance over the same directory.
+            worker_cache = caches.create_connection('default')
+            with mock.patch('payroll_app.summaries.cache', worker_cache):
+                upsert_payroll(self.accountant, 1, 2025, Decimal('25000'))
+
+            after = self.client.get('/api/payroll-summary/?year=2025&month=1').json()
+            self.assertEqual(Decimal(after['totals']['basic_salary']),
+                             Decimal(before['totals']['basic_salary']) + Decimal('5000'))
+
+    def test_invalid_query_returns_400(self):
+        self.assertEqual(self.client.get('/api/payroll-summary/').status_code, 400)
+        self.assertEqual(self.client.get('/api/payroll-summary/?year=2025&group_by=position').status_code, 400)
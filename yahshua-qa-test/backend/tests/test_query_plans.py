@@ -0,0 +1,67 @@
+"""
+Query plan tests for the payroll history, employee list and employee search
+access paths.
+
+Each hot query must be answered from its index without a separate sort step.
+PostgreSQL is told to avoid sequential scans because the test tables are too
+small for the planner to prefer an index on its own.
+
+Run with: python manage.py test tests
+"""
+
+from unittest import mock, skipUnless
+from django.db import connection
+from django.test import TestCase
+
+from payroll_app.models import Employee, PayrollCalculation
+from payroll_app.pagination import EMPLOYEE_SEARCH_KEYSET, PAYROLL_HISTORY_KEYSET
+from payroll_app.search import search_employees
+
+
+class QueryPlanTests(TestCase):
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def history(self):
+        return PayrollCalculation.objects.select_related('employee').order_by(
+            *(f'-{field}' for field in PAYROLL_HISTORY_KEYSET)
+        )
+
+    def assert_uses_index(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        if connection.vendor == 'sqlite':
+            self.assertNotIn('TEMP B-TREE', plan)
+        elif connection.vendor == 'postgresql':
+            self.assertNotIn('Sort', plan)
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Plan format is backend specific.')
+    def test_active_employee_list_uses_partial_name_index(self):
+        self.assert_uses_index(Employee.objects.filter(is_active=True), 'employee_active_name_idx')
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Plan format is backend specific.')
+    def test_history_uses_period_index(self):
+        self.assert_uses_index(self.history(), 'payroll_period_idx')
+        self.assert_uses_index(self.history().filter(period_year=2025), 'payroll_period_idx')
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Plan format is backend specific.')
+    def test_employee_history_uses_employee_period_index(self):
+        self.assert_uses_index(self.history().filter(employee_id=1), 'payroll_employee_period_idx')
+        self.assert_uses_index(
+            self.history().filter(employee_id=1, period_year=2025), 'payroll_employee_period_idx'
+        )
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Plan format is backend specific.')
+    def test_common_search_words_walk_the_name_index(self):
+        Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com', position='Developer',
+            department='Engineering', monthly_salary=45000, date_hired='2023-01-01',
+        )
+        with mock.patch('payroll_app.search.DENSE_WORD_TERMS', 0):
+            employees = search_employees(Employee.objects.filter(is_active=True), 'ana r')
+        employees = employees.order_by(*EMPLOYEE_SEARCH_KEYSET)[:21]
+        self.assert_uses_index(employees, 'employee_active_name_idx')
+        self.assertIn('search_term_employee_idx', employees.explain())
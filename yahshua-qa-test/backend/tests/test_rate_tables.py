@@ -0,0 +1,104 @@
+"""
+Backend tests for effective-dated rate tables.
+
+Run with: python manage.py test tests
+"""
+
+import json
+from datetime import date
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.test import TestCase, Client
+
+from payroll_app.calculations.batch import calculate_deductions_batch, from_centavos
+from payroll_app.calculations.rate_tables import BUILTIN_RATE_TABLE
+from payroll_app.models import Employee, RateTableVersion
+from payroll_app.rates import get_rate_table, invalidate_rate_tables
+from payroll_app.services import compute_payroll_values
+
+
+PHILHEALTH_2024 = {"rate": "0.05", "floor": "10000", "ceiling": "100000"}
+PHILHEALTH_2025 = {"rate": "0.06", "floor": "10000", "ceiling": "100000"}
+
+
+class RateTableRegistryTests(TestCase):
+
+    def setUp(self):
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+
+    def test_builtin_table_used_without_versions(self):
+        self.assertIs(get_rate_table(2025, 6), BUILTIN_RATE_TABLE)
+
+    def test_picks_version_by_period(self):
+        RateTableVersion.objects.create(effective_from=date(2025, 1, 1), data={"philhealth": PHILHEALTH_2025})
+
+        self.assertIs(get_rate_table(2024, 12), BUILTIN_RATE_TABLE)
+        rates = get_rate_table(2025, 1)
+        self.assertEqual(rates.philhealth.rate, Decimal('0.06'))
+        # Sections the version leaves out are inherited.
+        self.assertEqual(rates.sss, BUILTIN_RATE_TABLE.sss)
+        self.assertIs(get_rate_table(2026, 3), rates)
+
+    def test_registry_invalidated_when_version_published(self):
+        self.assertIs(get_rate_table(2025, 6), BUILTIN_RATE_TABLE)
+        version = RateTableVersion.objects.create(effective_from=date(2025, 1, 1), data={"philhealth": PHILHEALTH_2025})
+        self.assertEqual(get_rate_table(2025, 6).philhealth.rate, Decimal('0.06'))
+
+        version.delete()
+        self.assertIs(get_rate_table(2025, 6), BUILTIN_RATE_TABLE)
+
+    def test_version_digest_tracks_data(self):
+        RateTableVersion.objects.create(effective_from=date(2024, 1, 1), data={"philhealth": PHILHEALTH_2024})
+        rates = get_rate_table(2024, 1)
+        self.assertNotEqual(rates.version, BUILTIN_RATE_TABLE.version)
+        self.assertTrue(rates.version.startswith('2024-01-01:'))
+
+    def test_clean_rejects_malformed_data(self):
+        version = RateTableVersion(effective_from=date(2025, 1, 1), data={"philhealth": {"rate": "0.06"}})
+        with self.assertRaises(ValidationError):
+            version.clean()
+        version = RateTableVersion(effective_from=date(2025, 1, 1), data={"bonus": {}})
+        with self.assertRaises(ValidationError):
+            version.clean()
+
+    def test_batch_engine_matches_scalar_for_version(self):
+        RateTableVersion.objects.create(effective_from=date(2025, 1, 1), data={"philhealth": PHILHEALTH_2025})
+        rates = get_rate_table(2025, 1)
+        centavos = [0, 999999, 1000001, 4500050, 12000000]
+        batch = calculate_deductions_batch(centavos, rates)
+        for i, salary in enumerate(from_centavos(centavos)):
+            expected = compute_payroll_values(salary, rates)
+            for field, value in expected.items():
+                self.assertEqual(from_centavos(batch[field])[i], value)
+
+
+class RateTableAPITests(TestCase):
+
+    def setUp(self):
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+        self.client = Client()
+        self.employee = Employee.objects.create(
+            first_name='Test', last_name='User', email='test@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('45000'), date_hired='2023-01-01',
+        )
+        RateTableVersion.objects.create(effective_from=date(2025, 1, 1), data={"philhealth": PHILHEALTH_2025})
+
+    def calculate(self, year):
+        return self.client.post(
+            '/api/calculate-payroll/',
+            data=json.dumps({'employee_id': self.employee.pk, 'period_month': 6, 'period_year': year}),
+            content_type='application/json',
+        ).json()
+
+    def test_calculate_payroll_uses_period_rates(self):
+        self.assertEqual(self.calculate(2024)['philhealth_employee'], '1125.00')
+        self.assertEqual(self.calculate(2025)['philhealth_employee'], '1350.00')
+
+    def test_tax_brackets_for_period(self):
+        response = self.client.get('/api/tax-brackets/?year=2024&month=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['brackets']), 6)
+        self.assertEqual(self.client.get('/api/tax-brackets/?year=x').status_code, 400)
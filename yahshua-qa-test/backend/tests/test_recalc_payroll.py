@@ -0,0 +1,92 @@
+"""
+Backend tests for the recalc_payroll management command.
+
+Run with: python manage.py test tests
+"""
+
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from payroll_app.calculations.batch import calculate_deductions_batch
+from payroll_app.models import Employee, PayrollCalculation
+from payroll_app.recalc import recalculate_period
+from payroll_app.services import compute_payroll_values, run_payroll_period
+
+
+class RecalcPayrollTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for i, salary in enumerate(('18000', '45000', '90000')):
+            Employee.objects.create(
+                first_name='Worker', last_name=str(i), email=f'worker{i}@example.com',
+                position='Analyst', department='Finance', monthly_salary=Decimal(salary),
+                date_hired='2023-01-01',
+            )
+        run_payroll_period(12, 2024)
+        run_payroll_period(1, 2025)
+        self.stale = PayrollCalculation.objects.get(period_year=2024, basic_salary=Decimal('45000'))
+        # Simulate a record computed with wrong rates (and a rollup that agrees with it).
+        PayrollCalculation.objects.filter(pk=self.stale.pk).update(income_tax=0, net_pay=Decimal('1.00'))
+        call_command('rebuild_payroll_rollups', stdout=StringIO())
+
+    def recalc(self, *args):
+        out = StringIO()
+        call_command('recalc_payroll', '--from', '2024-01', '--to', '2025-12', '--workers', '1', *args, stdout=out)
+        return out.getvalue()
+
+    def test_only_changed_rows_are_rewritten(self):
+        output = self.recalc()
+        self.assertIn('2024-12: 1/3 changed', output)
+        self.assertIn('2025-01: 0/3 changed', output)
+        self.assertIn('6 record(s) examined, 1 changed', output)
+
+        self.stale.refresh_from_db()
+        expected = compute_payroll_values(Decimal('45000.00'))
+        self.assertEqual(self.stale.income_tax, expected['income_tax'])
+        self.assertEqual(self.stale.net_pay, expected['net_pay'])
+        call_command('rebuild_payroll_rollups', check=True, stdout=StringIO())
+
+    def test_dry_run_writes_nothing(self):
+        output = self.recalc('--dry-run')
+        self.assertIn('1 would change', output)
+        self.stale.refresh_from_db()
+        self.assertEqual(self.stale.net_pay, Decimal('1.00'))
+
+    def test_chunks_are_committed_as_they_finish(self):
+        PayrollCalculation.objects.filter(period_year=2024).update(income_tax=0, net_pay=Decimal('1.00'))
+        call_command('rebuild_payroll_rollups', stdout=StringIO())
+        calls = []
+
+        def fail_third_chunk(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise RuntimeError('worker killed')
+            return calculate_deductions_batch(*args)
+
+        with mock.patch('payroll_app.recalc.calculate_deductions_batch', side_effect=fail_third_chunk):
+            with self.assertRaises(RuntimeError):
+                recalculate_period(2024, 12, chunk_size=1)
+
+        net_pays = PayrollCalculation.objects.filter(period_year=2024).order_by('pk').values_list('net_pay', flat=True)
+        self.assertNotEqual(net_pays[0], Decimal('1.00'))
+        self.assertNotEqual(net_pays[1], Decimal('1.00'))
+        self.assertEqual(net_pays[2], Decimal('1.00'))
+        call_command('rebuild_payroll_rollups', check=True, stdout=StringIO())
+
+        self.assertEqual(recalculate_period(2024, 12, chunk_size=1)['changed'], 1)
+
+    def test_range_limits_periods(self):
+        out = StringIO()
+        call_command('recalc_payroll', '--from', '2025-01', '--to', '2025-01', '--workers', '1', stdout=out)
+        self.assertIn('1 period(s), 3 record(s) examined, 0 changed', out.getvalue())
+
+    def test_invalid_range_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command('recalc_payroll', '--from', '2025-13', '--to', '2025-12')
+        with self.assertRaises(CommandError):
+            call_command('recalc_payroll', '--from', '2025-06', '--to', '2025-01')
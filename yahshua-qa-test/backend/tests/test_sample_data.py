@@ -0,0 +1,49 @@
+"""
+Backend tests for the shipped sample data fixture.
+
+Run with: python manage.py test tests
+"""
+
+from decimal import Decimal
+from io import StringIO
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase, Client
+
+from payroll_app.models import Employee, PayrollCalculation, YearToDateLedger
+
+SAMPLE_DATA = settings.BASE_DIR / 'fixtures' / 'sample_data.json'
+
+
+class SampleDataTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def load(self):
+        """Load the fixture the way the compose `migrate` service does."""
+        call_command('loaddata', SAMPLE_DATA, verbosity=0)
+        call_command('rebuild_payroll_rollups', stdout=StringIO())
+        call_command('rebuild_ytd_ledger', stdout=StringIO())
+
+    def test_fixture_loads(self):
+        self.load()
+        self.assertEqual(Employee.objects.count(), 5)
+        self.assertEqual(PayrollCalculation.objects.count(), 10)
+        self.assertFalse(PayrollCalculation.objects.filter(updated_at__lt='2024-01-01').exists())
+        response = self.client.get('/api/payroll-history/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 10)
+
+    def test_aggregates_are_rebuilt_after_loading(self):
+        self.load()
+        for command in ('rebuild_payroll_rollups', 'rebuild_ytd_ledger'):
+            call_command(command, check=True, stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(YearToDateLedger.objects.filter(year=2025).count(), 4)
+        summary = self.client.get('/api/payroll-summary/', {'year': 2025}).json()
+        expected = PayrollCalculation.objects.filter(period_year=2025).aggregate(net_pay=Sum('net_pay'))
+        self.assertEqual(summary['totals']['record_count'], 8)
+        self.assertEqual(Decimal(summary['totals']['net_pay']), expected['net_pay'])
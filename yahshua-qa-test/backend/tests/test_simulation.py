@@ -0,0 +1,123 @@
+"""
+Backend tests for the what-if payroll simulation endpoint.
+
+Run with: python manage.py test tests
+"""
+
+import json
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+
+from payroll_app.models import Employee, PayrollCalculation
+from payroll_app.rates import invalidate_rate_tables
+from payroll_app.services import deduction_cache
+from payroll_app.simulation import SIMULATION_MAX_ENTRIES
+
+
+class SimulationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        deduction_cache.clear()
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+        self.client = Client()
+        self.employee = Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('45000'), date_hired='2023-01-01',
+        )
+
+    def simulate(self, entries, **extra):
+        return self.client.post(
+            '/api/simulate/',
+            data=json.dumps({'period_month': 6, 'period_year': 2025, 'entries': entries, **extra}),
+            content_type='application/json',
+        )
+
+    def test_matches_calculate_payroll_and_writes_nothing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.simulate([
+                {'employee_id': self.employee.pk, 'raise_percent': '10'},
+                {'salary': '30000.00', 'raise_amount': '2500.50'},
+                {'salary': 0},
+            ])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(query['sql'].startswith('SELECT') for query in queries))
+        self.assertFalse(PayrollCalculation.objects.exists())
+
+        results = response.json()['results']
+        self.assertEqual(results[0]['employee_id'], self.employee.pk)
+        self.assertEqual(results[0]['base_salary'], '45000.00')
+        self.assertEqual([result['basic_salary'] for result in results], ['49500.00', '32500.50', '0.00'])
+        self.assertIsNone(results[1]['employee_id'])
+
+        for result in results[:2]:
+            stored = self.client.post(
+                '/api/calculate-payroll/',
+                data=json.dumps({
+                    'employee_id': self.employee.pk, 'period_month': 6, 'period_year': 2025,
+                    'override_salary': result['basic_salary'],
+                }),
+                content_type='application/json',
+            ).json()
+            for field in ('sss_employee', 'sss_employer', 'philhealth_employee', 'philhealth_employer',
+                          'pagibig_employee', 'pagibig_employer', 'income_tax', 'total_deductions', 'net_pay'):
+                self.assertEqual(result[field], stored[field], field)
+            employer_cost = sum(
+                Decimal(stored[field]) for field in ('basic_salary', 'sss_employer', 'philhealth_employer', 'pagibig_employer')
+            )
+            self.assertEqual(Decimal(result['employer_cost']), employer_cost)
+
+    def test_totals_sum_the_entries(self):
+        data = self.simulate([{'salary': f'{20000 + i * 1000}.25'} for i in range(50)]).json()
+        totals = data['totals']
+        self.assertEqual(totals['entries'], 50)
+        for field in ('basic_salary', 'income_tax', 'net_pay', 'employer_cost'):
+            self.assertEqual(Decimal(totals[field]), sum(Decimal(result[field]) for result in data['results']))
+
+    def test_invalid_entries_are_reported_by_index(self):
+        self.employee.is_active = False
+        self.employee.save()
+        response = self.simulate([
+            {'salary': '30000'},
+            {'employee_id': self.employee.pk},
+            {'salary': '1.001'},
+            {'salary': '100', 'employee_id': 1},
+            {'salary': '100', 'raise_percent': '-100'},
+            {'salary': '100', 'raise_amount': '-200'},
+            'not an object',
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [(error['index'], sorted(error['errors'])) for error in response.json()['errors']],
+            [
+                (1, ['employee_id']),
+                (2, ['salary']),
+                (3, ['non_field_errors']),
+                (4, ['raise_percent']),
+                (5, ['non_field_errors']),
+                (6, ['non_field_errors']),
+            ],
+        )
+
+    def test_out_of_range_raises_are_entry_errors(self):
+        response = self.simulate([
+            {'salary': '1000', 'raise_amount': '1e30'},
+            {'salary': '1000', 'raise_percent': '1e40'},
+            {'salary': '1000', 'raise_amount': '-1e30'},
+            {'salary': '9999999999', 'raise_percent': '9999999999'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [(error['index'], sorted(error['errors'])) for error in response.json()['errors']],
+            [(0, ['raise_amount']), (1, ['raise_percent']), (2, ['raise_amount']), (3, ['non_field_errors'])],
+        )
+
+    def test_request_shape_is_validated(self):
+        self.assertEqual(self.simulate([]).status_code, 400)
+        self.assertEqual(self.simulate([{'salary': 1}], period_month=13).status_code, 400)
+        self.assertEqual(self.simulate([{'salary': 1}] * (SIMULATION_MAX_ENTRIES + 1)).status_code, 400)
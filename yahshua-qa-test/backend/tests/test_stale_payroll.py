@@ -0,0 +1,165 @@
+"""
+Backend tests for dirty tracking and incremental recalculation of payroll.
+
+Run with: python manage.py test tests
+"""
+
+import json
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
+
+from payroll_app.calculations.tax_calculator import calculate_annual_income_tax
+from payroll_app.models import Employee, PayrollCalculation, StalePayroll
+from payroll_app.rates import invalidate_rate_tables
+from payroll_app.services import deduction_cache, run_payroll_period
+from payroll_app.stale import refresh_stale_payroll
+
+
+@override_settings(PAYROLL_CLOSED_THROUGH='2025-02')
+class StalePayrollTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        deduction_cache.clear()
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+        self.client = Client()
+        self.employee = Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('45000'), date_hired='2023-01-01',
+        )
+        self.other = Employee.objects.create(
+            first_name='Ben', last_name='Cruz', email='ben@example.com',
+            position='Accountant', department='Finance', employment_type='contractual',
+            monthly_salary=Decimal('20000'), date_hired='2023-01-01',
+        )
+        for month in range(1, 5):
+            run_payroll_period(month, 2025)
+
+    def update_employee(self, **fields):
+        response = self.client.put(
+            f'/api/employees/{self.employee.pk}/', data=json.dumps(fields), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def queued(self):
+        return sorted(StalePayroll.objects.values_list('employee_id', 'period_year', 'period_month'))
+
+    def salaries(self, employee=None):
+        return dict(
+            PayrollCalculation.objects.filter(employee=employee or self.employee)
+            .values_list('period_month', 'basic_salary')
+        )
+
+    def assert_aggregates_match_history(self):
+        for command in ('rebuild_payroll_rollups', 'rebuild_ytd_ledger'):
+            call_command(command, check=True, stdout=StringIO(), stderr=StringIO())
+
+    def test_salary_change_queues_only_open_periods_of_that_employee(self):
+        self.update_employee(position='Senior Developer')
+        self.assertEqual(self.queued(), [])
+
+        self.update_employee(monthly_salary='50000.00')
+        self.update_employee(monthly_salary='52000.00')  # coalesces with the first change
+        self.assertEqual(self.queued(), [(self.employee.pk, 2025, 3), (self.employee.pk, 2025, 4)])
+
+        self.update_employee(employment_type='probationary')
+        self.assertEqual(len(self.queued()), 2)
+
+    def test_worker_recomputes_open_periods_and_leaves_closed_ones(self):
+        self.update_employee(monthly_salary='52000.00')
+        stats = refresh_stale_payroll()
+        self.assertEqual(stats, {'claimed': 2, 'closed': 0, 'recalculated': 2, 'changed': 2, 'skipped': 0})
+        self.assertEqual(self.queued(), [])
+
+        self.assertEqual(self.salaries(), {
+            1: Decimal('45000.00'), 2: Decimal('45000.00'), 3: Decimal('52000.00'), 4: Decimal('52000.00'),
+        })
+        self.assertEqual(set(self.salaries(self.other).values()), {Decimal('20000.00')})
+        april = PayrollCalculation.objects.get(employee=self.employee, period_month=4)
+        expected = self.client.post(
+            '/api/calculate-payroll/',
+            data=json.dumps({'employee_id': self.employee.pk, 'period_month': 5, 'period_year': 2025}),
+            content_type='application/json',
+        ).json()
+        for field in ('sss_employee', 'philhealth_employee', 'income_tax', 'net_pay'):
+            self.assertEqual(str(getattr(april, field)), expected[field])
+        self.assert_aggregates_match_history()
+
+    def test_unchanged_results_are_not_rewritten(self):
+        self.update_employee(employment_type='probationary')
+        before = dict(PayrollCalculation.objects.filter(employee=self.employee).values_list('pk', 'updated_at'))
+        stats = refresh_stale_payroll()
+        self.assertEqual((stats['recalculated'], stats['changed']), (2, 0))
+        after = dict(PayrollCalculation.objects.filter(employee=self.employee).values_list('pk', 'updated_at'))
+        self.assertEqual(after, before)
+        self.assert_aggregates_match_history()
+
+    def test_periods_closed_after_queueing_are_dropped(self):
+        self.update_employee(monthly_salary='52000.00')
+        with self.settings(PAYROLL_CLOSED_THROUGH='2025-03'):
+            stats = refresh_stale_payroll(batch_size=1)
+            self.assertEqual(stats, {'claimed': 1, 'closed': 1, 'recalculated': 0, 'changed': 0, 'skipped': 0})
+            call_command('refresh_stale_payroll', once=True, stdout=StringIO())
+        self.assertEqual(self.queued(), [])
+        self.assertEqual(self.salaries()[3], Decimal('45000.00'))
+        self.assertEqual(self.salaries()[4], Decimal('52000.00'))
+
+    def test_override_rows_are_not_rederived(self):
+        def calculate(month, salary):
+            response = self.client.post('/api/calculate-payroll/', data=json.dumps({
+                'employee_id': self.employee.pk, 'period_month': month, 'period_year': 2025,
+                'override_salary': salary,
+            }), content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+
+        calculate(3, '99999')
+        self.update_employee(monthly_salary='52000.00')
+        self.assertEqual(self.queued(), [(self.employee.pk, 2025, 4)])
+
+        # An override after queueing is kept too.
+        calculate(4, '88888')
+        stats = refresh_stale_payroll()
+        self.assertEqual((stats['recalculated'], stats['skipped']), (0, 1))
+        self.assertEqual(self.salaries(), {
+            1: Decimal('45000.00'), 2: Decimal('45000.00'), 3: Decimal('99999.00'), 4: Decimal('88888.00'),
+        })
+
+    @override_settings(PAYROLL_CLOSED_THROUGH='previous-month')
+    def test_past_months_are_closed_by_default(self):
+        today = timezone.localdate()
+        run_payroll_period(today.month, today.year)
+        self.update_employee(monthly_salary='52000.00')
+        self.assertEqual(self.queued(), [(self.employee.pk, today.year, today.month)])
+
+        refresh_stale_payroll()
+        records = PayrollCalculation.objects.filter(employee=self.employee)
+        current = records.get(period_year=today.year, period_month=today.month)
+        self.assertEqual(current.basic_salary, Decimal('52000.00'))
+        past = records.exclude(pk=current.pk).values_list('basic_salary', flat=True)
+        self.assertEqual(set(past), {Decimal('45000.00')})
+
+    @override_settings(PAYROLL_WITHHOLDING_METHOD='cumulative', PAYROLL_CLOSED_THROUGH='')
+    def test_cumulative_recalculation_keeps_the_year_consistent(self):
+        PayrollCalculation.objects.all().delete()
+        call_command('rebuild_ytd_ledger', stdout=StringIO())
+        call_command('rebuild_payroll_rollups', stdout=StringIO())
+        for month in range(1, 13):
+            run_payroll_period(month, 2025)
+
+        self.update_employee(monthly_salary='90000.00')
+        call_command('refresh_stale_payroll', once=True, batch_size=5, stdout=StringIO())
+        records = PayrollCalculation.objects.filter(employee=self.employee)
+        self.assertEqual(sum(record.income_tax for record in records), calculate_annual_income_tax(Decimal('1080000')))
+        self.assert_aggregates_match_history()
+
+    @override_settings(PAYROLL_CLOSED_THROUGH='2025-13')
+    def test_invalid_lock_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.update_employee(monthly_salary='52000.00')
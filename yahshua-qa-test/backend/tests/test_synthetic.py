@@ -0,0 +1,119 @@
+"""
+Backend tests for the synthetic benchmark dataset generator.
+
+Run with: python manage.py test tests
+"""
+
+from datetime import date
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from payroll_app.models import PAYROLL_VALUE_FIELDS, Employee, PayrollCalculation
+from payroll_app.rates import get_rate_table, invalidate_rate_tables
+from payroll_app.services import compute_payroll_values
+from payroll_app.synthetic import (
+    ANNUAL_RAISE,
+    DEPARTMENTS,
+    MINIMUM_MONTHLY_SALARY,
+    create_dataset,
+    generate_employees,
+    periods_ending,
+    random_salaries,
+)
+
+
+def employee_fields(employees):
+    return [
+        (e.first_name, e.last_name, e.email, e.department, e.employment_type, e.monthly_salary, e.date_hired)
+        for e in employees
+    ]
+
+
+class SyntheticDataTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+
+    def test_same_seed_generates_same_employees(self):
+        self.assertEqual(
+            employee_fields(generate_employees(200, seed=7)),
+            employee_fields(generate_employees(200, seed=7)),
+        )
+        self.assertNotEqual(
+            employee_fields(generate_employees(200, seed=7)),
+            employee_fields(generate_employees(200, seed=8)),
+        )
+        self.assertEqual(random_salaries(100, seed=3), random_salaries(100, seed=3))
+
+    def test_employees_are_valid_and_spread_across_groups(self):
+        employees = list(generate_employees(2000, seed=1))
+        self.assertEqual(len({e.email for e in employees}), 2000)
+        self.assertEqual({e.department for e in employees}, set(DEPARTMENTS))
+        self.assertEqual({e.employment_type for e in employees}, {'regular', 'probationary', 'contractual'})
+        self.assertTrue(all(e.monthly_salary >= MINIMUM_MONTHLY_SALARY for e in employees))
+
+    def test_periods_ending_crosses_year_boundary(self):
+        self.assertEqual(periods_ending(2025, 2, 3), [(2024, 12), (2025, 1), (2025, 2)])
+        self.assertEqual(len(periods_ending(2025, 12, 36)), 36)
+
+    def test_create_dataset_builds_history_and_rollups(self):
+        result = create_dataset(50, 1, seed=4, last_period=(2025, 6))
+        self.assertEqual(Employee.objects.count(), 50)
+        self.assertEqual(result['payroll_records'], PayrollCalculation.objects.count())
+        self.assertEqual(
+            PayrollCalculation.objects.order_by('period_year', 'period_month').values_list(
+                'period_year', 'period_month').first(),
+            (2024, 7),
+        )
+        self.assertFalse(PayrollCalculation.objects.filter(employee__is_active=False).exists())
+        call_command('rebuild_payroll_rollups', check=True, stdout=StringIO(), stderr=StringIO())
+        call_command('rebuild_employee_search', check=True, stdout=StringIO(), stderr=StringIO())
+
+    def test_history_matches_real_calculators_and_hire_dates(self):
+        create_dataset(100, 2, seed=5, last_period=(2025, 12))
+        for record in PayrollCalculation.objects.select_related('employee')[:200]:
+            employee = record.employee
+            self.assertGreaterEqual(
+                (record.period_year, record.period_month), (employee.date_hired.year, employee.date_hired.month),
+            )
+            expected = compute_payroll_values(record.basic_salary, get_rate_table(record.period_year, record.period_month))
+            self.assertEqual({field: getattr(record, field) for field in PAYROLL_VALUE_FIELDS}, expected)
+
+        employee = Employee.objects.filter(is_active=True, date_hired__lt=date(2024, 1, 1)).first()
+        salaries = dict(employee.payroll_calculations.values_list('period_year', 'basic_salary').distinct())
+        self.assertEqual(salaries[2025], employee.monthly_salary)
+        self.assertAlmostEqual(float(salaries[2024]), float(employee.monthly_salary) / (1 + ANNUAL_RAISE), delta=1)
+
+
+class SeedPayrollCommandTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+
+    def seed(self, *args):
+        out = StringIO()
+        call_command('seed_payroll', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_seeds_and_replaces_with_clear(self):
+        output = self.seed('--employees', '30', '--until', '2025-03')
+        self.assertIn('Seeded 30 employee(s)', output)
+        self.assertEqual(Employee.objects.count(), 30)
+
+        with self.assertRaisesMessage(CommandError, '--clear'):
+            self.seed('--employees', '10')
+
+        self.seed('--employees', '10', '--until', '2025-03', '--clear')
+        self.assertEqual(Employee.objects.count(), 10)
+        self.assertFalse(PayrollCalculation.objects.exclude(employee__in=Employee.objects.all()).exists())
+        call_command('rebuild_payroll_rollups', check=True, stdout=StringIO(), stderr=StringIO())
+
+    def test_rejects_invalid_period(self):
+        with self.assertRaises(CommandError):
+            self.seed('--until', '2025-13')
@@ -0,0 +1,185 @@
+"""
+Backend tests for the year-to-date ledger and cumulative withholding.
+
+Run with: python manage.py test tests
+"""
+
+import json
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import TestCase, Client, override_settings
+
+from payroll_app.calculations.tax_calculator import (
+    calculate_annual_income_tax,
+    calculate_cumulative_withholding_tax,
+    calculate_monthly_withholding_tax,
+)
+from payroll_app.models import Employee, PayrollCalculation, YearToDateLedger
+from payroll_app.rates import invalidate_rate_tables
+from payroll_app.recalc import recalculate_period
+from payroll_app.services import deduction_cache, run_payroll_period
+
+
+class CumulativeWithholdingTaxTests(TestCase):
+
+    def withhold_year(self, salaries):
+        """Withhold month by month, feeding each result back as the prior months."""
+        gross = withheld = Decimal('0')
+        taxes = []
+        for month, salary in enumerate(salaries, start=1):
+            tax = calculate_cumulative_withholding_tax(salary, month, gross, withheld)
+            taxes.append(tax)
+            gross += salary
+            withheld += tax
+        return taxes
+
+    def test_constant_salary_matches_annualized_method(self):
+        salary = Decimal('45000.00')
+        taxes = self.withhold_year([salary] * 12)
+        monthly = calculate_monthly_withholding_tax(salary)
+        for tax in taxes:
+            self.assertAlmostEqual(tax, monthly, delta=Decimal('0.01'))
+        self.assertEqual(sum(taxes), calculate_annual_income_tax(salary * 12))
+
+    def test_december_trues_up_to_the_annual_tax(self):
+        salaries = [Decimal('40000')] * 6 + [Decimal('90000')] * 6
+        taxes = self.withhold_year(salaries)
+        self.assertEqual(sum(taxes), calculate_annual_income_tax(sum(salaries)))
+
+    def test_never_negative_after_a_pay_cut(self):
+        salaries = [Decimal('150000')] * 3 + [Decimal('15000')] * 9
+        taxes = self.withhold_year(salaries)
+        self.assertTrue(all(tax >= 0 for tax in taxes))
+        self.assertEqual(taxes[-1], Decimal('0.00'))
+
+    def test_first_month_without_history_is_projected_over_the_year(self):
+        self.assertEqual(
+            calculate_cumulative_withholding_tax(Decimal('50000'), 1),
+            calculate_monthly_withholding_tax(Decimal('50000')),
+        )
+
+
+class YearToDateLedgerTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        deduction_cache.clear()
+        invalidate_rate_tables()
+        self.addCleanup(invalidate_rate_tables)
+        self.client = Client()
+        self.employee = Employee.objects.create(
+            first_name='Ana', last_name='Reyes', email='ana@example.com',
+            position='Developer', department='Engineering', employment_type='regular',
+            monthly_salary=Decimal('45000'), date_hired='2023-01-01',
+        )
+        self.other = Employee.objects.create(
+            first_name='Ben', last_name='Cruz', email='ben@example.com',
+            position='Accountant', department='Finance', employment_type='contractual',
+            monthly_salary=Decimal('20000'), date_hired='2023-01-01',
+        )
+
+    def calculate(self, month, **extra):
+        return self.client.post(
+            '/api/calculate-payroll/',
+            data=json.dumps({'employee_id': self.employee.pk, 'period_month': month, 'period_year': 2025, **extra}),
+            content_type='application/json',
+        )
+
+    def ledger(self, employee=None, year=2025):
+        return YearToDateLedger.objects.get(employee=employee or self.employee, year=year)
+
+    def assert_ledger_matches_history(self):
+        call_command('rebuild_ytd_ledger', check=True, stdout=StringIO(), stderr=StringIO())
+
+    def test_ledger_follows_calculate_replace_and_delete(self):
+        self.calculate(1)
+        self.calculate(2)
+        self.calculate(2, override_salary='60000.00')
+        ledger = self.ledger()
+        records = PayrollCalculation.objects.filter(employee=self.employee)
+        self.assertEqual(ledger.gross, Decimal('105000.00'))
+        self.assertEqual(ledger.tax_withheld, sum(record.income_tax for record in records))
+        self.assertEqual(
+            ledger.contributions,
+            sum(r.sss_employee + r.philhealth_employee + r.pagibig_employee for r in records),
+        )
+        self.assertEqual(ledger.month_mask, 0b11)
+
+        february = records.get(period_month=2)
+        self.assertEqual(self.client.delete(f'/api/payroll-history/{february.pk}/').status_code, 204)
+        self.assertEqual(self.ledger().month_mask, 0b1)
+        self.assert_ledger_matches_history()
+
+    def test_bulk_runs_and_recalc_keep_ledger_in_step(self):
+        for month in range(1, 4):
+            run_payroll_period(month, 2025)
+        run_payroll_period(3, 2025)  # re-run replaces rather than adds
+        self.assertEqual(self.ledger(self.other).gross, Decimal('60000.00'))
+        self.assertEqual(self.ledger(self.other).month_mask, 0b111)
+
+        PayrollCalculation.objects.filter(period_month=2).update(income_tax=Decimal('1.00'))
+        call_command('rebuild_ytd_ledger', stdout=StringIO())
+        recalculate_period(2025, 2)
+        self.assert_ledger_matches_history()
+
+    def test_check_reports_drift_and_rebuild_repairs_it(self):
+        run_payroll_period(1, 2025)
+        YearToDateLedger.objects.filter(employee=self.employee).update(gross=Decimal('1.00'))
+        with self.assertRaises(CommandError):
+            self.assert_ledger_matches_history()
+        call_command('rebuild_ytd_ledger', stdout=StringIO())
+        self.assert_ledger_matches_history()
+        self.assertEqual(self.ledger().gross, Decimal('45000.00'))
+
+    @override_settings(PAYROLL_WITHHOLDING_METHOD='cumulative')
+    def test_cumulative_method_withholds_the_annual_tax_over_the_year(self):
+        for month in range(1, 13):
+            if month == 7:
+                self.employee.monthly_salary = Decimal('90000')
+                self.employee.save()
+            if month % 2:
+                run_payroll_period(month, 2025)  # batch path
+            else:
+                self.calculate(month)  # single-employee path
+
+        records = PayrollCalculation.objects.filter(employee=self.employee, period_year=2025)
+        gross = sum(record.basic_salary for record in records)
+        self.assertEqual(gross, Decimal('810000.00'))
+        self.assertEqual(sum(record.income_tax for record in records), calculate_annual_income_tax(gross))
+        for record in records:
+            self.assertEqual(
+                record.net_pay,
+                record.basic_salary - record.sss_employee - record.philhealth_employee
+                - record.pagibig_employee - record.income_tax,
+            )
+        self.assertEqual(self.ledger().tax_withheld, calculate_annual_income_tax(gross))
+        self.assert_ledger_matches_history()
+
+    @override_settings(PAYROLL_WITHHOLDING_METHOD='cumulative')
+    def test_cumulative_recalc_replays_months_in_order(self):
+        for month in range(1, 13):
+            run_payroll_period(month, 2025)
+        expected = list(
+            PayrollCalculation.objects.filter(employee=self.employee).order_by('period_month')
+            .values_list('income_tax', flat=True)
+        )
+        PayrollCalculation.objects.filter(employee=self.employee, period_month=3).update(income_tax=Decimal('0.00'))
+        call_command('rebuild_ytd_ledger', stdout=StringIO())
+        call_command('rebuild_payroll_rollups', stdout=StringIO())
+
+        call_command('recalc_payroll', '--from', '2025-01', '--to', '2025-12', '--workers', '2',
+                     stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(
+            list(PayrollCalculation.objects.filter(employee=self.employee).order_by('period_month')
+                 .values_list('income_tax', flat=True)),
+            expected,
+        )
+        self.assert_ledger_matches_history()
+
+    @override_settings(PAYROLL_WITHHOLDING_METHOD='monthly')
+    def test_unknown_method_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            run_payroll_period(1, 2025)